@@ -20,6 +20,7 @@ from ._exceptions import (
     APITimeoutError,
     AssignmentTimeoutError,
 )
+from .ipc.proc_autoscaler import IdleProcessAutoscaling
 from .job import (
     AutoSubscribe,
     JobContext,
@@ -52,6 +53,7 @@ from .voice import (
     AgentEvent,
     AgentSession,
     AgentStateChangedEvent,
+    AudioInputGate,
     CloseEvent,
     ConversationItemAddedEvent,
     ErrorEvent,
@@ -65,7 +67,13 @@ from .voice import (
 )
 from .voice.background_audio import AudioConfig, BackgroundAudioPlayer, BuiltinAudioClip
 from .voice.room_io import RoomInputOptions, RoomIO, RoomOutputOptions
-from .worker import SimulateJobInfo, Worker, WorkerOptions, WorkerPermissions, WorkerType
+from .worker import (
+    SimulateJobInfo,
+    Worker,
+    WorkerOptions,
+    WorkerPermissions,
+    WorkerType,
+)
 
 __all__ = [
     "__version__",
@@ -73,6 +81,7 @@ __all__ = [
     "WorkerOptions",
     "WorkerType",
     "WorkerPermissions",
+    "IdleProcessAutoscaling",
     "JobProcess",
     "JobContext",
     "JobRequest",
@@ -93,6 +102,7 @@ __all__ = [
     "CloseEvent",
     "ConversationItemAddedEvent",
     "AgentStateChangedEvent",
+    "AudioInputGate",
     "UserInputTranscribedEvent",
     "UserStateChangedEvent",
     "SpeechCreatedEvent",
@@ -16,6 +16,10 @@ _RunnersDict = dict[str, type["_InferenceRunner"]]
 class _InferenceRunner(ABC, _RunnerMeta):
     registered_runners: _RunnersDict = {}
 
+    intra_op_threads: int = 0
+    """Number of threads a single inference may use (e.g. intra_op_num_threads of an ONNX
+    session), set by the inference process before `initialize`. 0 lets the runtime decide."""
+
     @classmethod
     def register_runner(cls, runner_class: type[_InferenceRunner]) -> None:
         if threading.current_thread() != threading.main_thread():
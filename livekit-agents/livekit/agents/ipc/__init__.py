@@ -1,9 +1,11 @@
 from . import (
     channel,
+    inference_pool,
     inference_proc_executor,
     job_executor,
     job_proc_executor,
     job_thread_executor,
+    proc_autoscaler,
     proc_pool,
     proto,
 )
@@ -12,8 +14,10 @@ __all__ = [
     "proto",
     "channel",
     "proc_pool",
+    "proc_autoscaler",
     "job_proc_executor",
     "job_thread_executor",
     "inference_proc_executor",
+    "inference_pool",
     "job_executor",
 ]
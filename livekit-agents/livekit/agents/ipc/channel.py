@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import io
 import struct
-from typing import ClassVar, Protocol, runtime_checkable
+from typing import ClassVar, Protocol, Union, runtime_checkable
 
 from .. import utils
 
@@ -11,44 +11,66 @@ class Message(Protocol):
     MSG_ID: ClassVar[int]
 
 
+class Writer(Protocol):
+    """io.BytesIO, or the free space of a shared memory ring"""
+
+    def write(self, data: bytes, /) -> int: ...
+
+
+class Reader(Protocol):
+    """io.BytesIO, or a payload inside a shared memory ring"""
+
+    def read(self, size: int, /) -> bytes: ...
+
+
 @runtime_checkable
 class DataMessage(Message, Protocol):
-    def write(self, b: io.BytesIO) -> None: ...
+    def write(self, b: Writer) -> None: ...
 
-    def read(self, b: io.BytesIO) -> None: ...
+    def read(self, b: Reader) -> None: ...
 
 
 MessagesDict = dict[int, type[Message]]
 
+AsyncDuplex = Union[
+    utils.aio.duplex_unix._AsyncDuplex,
+    utils.aio.duplex_shm._AsyncShmDuplex,
+]
+
 
 def _read_message(data: bytes, messages: MessagesDict) -> Message:
-    bio = io.BytesIO(data)
-    msg_id = read_int(bio)
+    return _deserialize(io.BytesIO(data), messages)
+
+
+def _write_message(msg: Message) -> bytes:
+    bio = io.BytesIO()
+    _serialize(bio, msg)
+    return bio.getvalue()
+
+
+def _deserialize(b: Reader, messages: MessagesDict) -> Message:
+    msg_id = read_int(b)
     msg = messages[msg_id]()
     if isinstance(msg, DataMessage):
-        msg.read(bio)
+        msg.read(b)
 
     return msg
 
 
-def _write_message(msg: Message) -> bytes:
-    bio = io.BytesIO()
-    write_int(bio, msg.MSG_ID)
+def _serialize(b: Writer, msg: Message) -> None:
+    write_int(b, msg.MSG_ID)
 
     if isinstance(msg, DataMessage):
-        msg.write(bio)
-
-    return bio.getvalue()
+        msg.write(b)
 
 
-async def arecv_message(
-    dplx: utils.aio.duplex_unix._AsyncDuplex, messages: MessagesDict
-) -> Message:
-    return _read_message(await dplx.recv_bytes(), messages)
+async def arecv_message(dplx: AsyncDuplex, messages: MessagesDict) -> Message:
+    # the shared memory duplex deserializes the message in place
+    return await dplx.recv_with(lambda b: _deserialize(b, messages))
 
 
-async def asend_message(dplx: utils.aio.duplex_unix._AsyncDuplex, msg: Message) -> None:
-    await dplx.send_bytes(_write_message(msg))
+async def asend_message(dplx: AsyncDuplex, msg: Message) -> None:
+    await dplx.send_with(lambda b: _serialize(b, msg))
 
 
 def recv_message(dplx: utils.aio.duplex_unix._Duplex, messages: MessagesDict) -> Message:
@@ -59,62 +81,62 @@ def send_message(dplx: utils.aio.duplex_unix._Duplex, msg: Message) -> None:
     dplx.send_bytes(_write_message(msg))
 
 
-def write_bytes(b: io.BytesIO, buf: bytes) -> None:
+def write_bytes(b: Writer, buf: bytes) -> None:
     b.write(len(buf).to_bytes(4, "big"))
     b.write(buf)
 
 
-def read_bytes(b: io.BytesIO) -> bytes:
+def read_bytes(b: Reader) -> bytes:
     length = int.from_bytes(b.read(4), "big")
     return b.read(length)
 
 
-def write_string(b: io.BytesIO, s: str) -> None:
+def write_string(b: Writer, s: str) -> None:
     encoded = s.encode("utf-8")
     b.write(len(encoded).to_bytes(4, "big"))
     b.write(encoded)
 
 
-def read_string(b: io.BytesIO) -> str:
+def read_string(b: Reader) -> str:
     length = int.from_bytes(b.read(4), "big")
     return b.read(length).decode("utf-8")
 
 
-def write_int(b: io.BytesIO, i: int) -> None:
+def write_int(b: Writer, i: int) -> None:
     b.write(i.to_bytes(4, "big"))
 
 
-def read_int(b: io.BytesIO) -> int:
+def read_int(b: Reader) -> int:
     return int.from_bytes(b.read(4), "big")
 
 
-def write_bool(b: io.BytesIO, bi: bool) -> None:
+def write_bool(b: Writer, bi: bool) -> None:
     b.write(bi.to_bytes(1, "big"))
 
 
-def read_bool(b: io.BytesIO) -> bool:
+def read_bool(b: Reader) -> bool:
     return bool.from_bytes(b.read(1), "big")
 
 
-def write_float(b: io.BytesIO, f: float) -> None:
+def write_float(b: Writer, f: float) -> None:
     b.write(struct.pack("f", f))
 
 
-def read_float(b: io.BytesIO) -> float:
+def read_float(b: Reader) -> float:
     return struct.unpack("f", b.read(4))[0]
 
 
-def write_double(b: io.BytesIO, d: float) -> None:
+def write_double(b: Writer, d: float) -> None:
     b.write(struct.pack("d", d))
 
 
-def read_double(b: io.BytesIO) -> float:
+def read_double(b: Reader) -> float:
     return struct.unpack("d", b.read(8))[0]
 
 
-def write_long(b: io.BytesIO, long: int) -> None:
+def write_long(b: Writer, long: int) -> None:
     b.write(long.to_bytes(8, "big"))
 
 
-def read_long(b: io.BytesIO) -> int:
+def read_long(b: Reader) -> int:
     return int.from_bytes(b.read(8), "big")
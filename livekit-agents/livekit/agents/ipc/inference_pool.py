@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from multiprocessing.context import BaseContext
+
+from ..debug import tracing
+from ..inference_runner import _RunnersDict
+from ..log import logger
+from ..utils import log_exceptions
+from .inference_proc_executor import InferenceProcExecutor
+
+# delay before respawning an inference process that exited, doubled after each failed attempt
+MIN_RESPAWN_DELAY = 0.5
+MAX_RESPAWN_DELAY = 30.0
+
+
+class InferencePool:
+    """Runs the inference runners inside multiple processes.
+
+    Each request is routed to the ready process with the fewest outstanding requests. The
+    processes are health checked by SupervisedProc (ping/pong and memory limits) and are
+    respawned when they exit."""
+
+    def __init__(
+        self,
+        *,
+        num_processes: int,
+        runners: _RunnersDict,
+        initialize_timeout: float,
+        close_timeout: float,
+        memory_warn_mb: float,
+        memory_limit_mb: float,
+        ping_interval: float,
+        ping_timeout: float,
+        high_ping_threshold: float,
+        mp_ctx: BaseContext,
+        loop: asyncio.AbstractEventLoop,
+        http_proxy: str | None,
+        shm_ring_size: int = 0,
+        num_threads: int = 0,
+        intra_op_threads: int = 0,
+    ) -> None:
+        if num_processes < 1:
+            raise ValueError("num_processes must be at least 1")
+
+        self._num_processes = num_processes
+        self._runners = runners
+        self._initialize_timeout = initialize_timeout
+        self._close_timeout = close_timeout
+        self._memory_warn_mb = memory_warn_mb
+        self._memory_limit_mb = memory_limit_mb
+        self._ping_interval = ping_interval
+        self._ping_timeout = ping_timeout
+        self._high_ping_threshold = high_ping_threshold
+        self._mp_ctx = mp_ctx
+        self._loop = loop
+        self._http_proxy = http_proxy
+        self._shm_ring_size = shm_ring_size
+        self._num_threads = num_threads
+        self._intra_op_threads = intra_op_threads
+
+        self._started = False
+        self._closing = False
+        self._close_ev = asyncio.Event()
+        # every process that may still be running, and the initialized ones accepting requests
+        self._executors: set[InferenceProcExecutor] = set()
+        self._ready: list[InferenceProcExecutor] = []
+        self._ready_ev = asyncio.Event()
+        self._monitor_tasks: list[asyncio.Task[None]] = []
+
+        # shared by all the processes, including the respawned ones
+        self._latency_graph = tracing.Tracing.add_graph(
+            title="inference_latency",
+            x_label="time",
+            y_label="latency (ms)",
+            x_type="time",
+        )
+        self._queue_depth_graph = tracing.Tracing.add_graph(
+            title="inference_queue_depth",
+            x_label="time",
+            y_label="pending requests",
+            x_type="time",
+        )
+
+    @property
+    def processes(self) -> list[InferenceProcExecutor]:
+        """the processes currently accepting requests"""
+        return list(self._ready)
+
+    @property
+    def pending_requests(self) -> int:
+        """number of inference requests waiting for a response"""
+        return sum(proc.pending_requests for proc in self._ready)
+
+    def _create_executor(self) -> InferenceProcExecutor:
+        proc = InferenceProcExecutor(
+            runners=self._runners,
+            initialize_timeout=self._initialize_timeout,
+            close_timeout=self._close_timeout,
+            memory_warn_mb=self._memory_warn_mb,
+            memory_limit_mb=self._memory_limit_mb,
+            ping_interval=self._ping_interval,
+            ping_timeout=self._ping_timeout,
+            high_ping_threshold=self._high_ping_threshold,
+            mp_ctx=self._mp_ctx,
+            loop=self._loop,
+            http_proxy=self._http_proxy,
+            shm_ring_size=self._shm_ring_size,
+            num_threads=self._num_threads,
+            intra_op_threads=self._intra_op_threads,
+        )
+        self._executors.add(proc)
+        return proc
+
+    async def _start_executor(self, proc: InferenceProcExecutor) -> None:
+        await proc.start()
+        await proc.initialize()
+
+    async def start(self) -> None:
+        """start and initialize all the inference processes"""
+        if self._started:
+            raise RuntimeError("inference pool already started")
+
+        self._started = True
+        procs = [self._create_executor() for _ in range(self._num_processes)]
+        try:
+            await asyncio.gather(*(self._start_executor(proc) for proc in procs))
+        except BaseException:
+            await self.aclose()
+            raise
+
+        for proc in procs:
+            self._set_ready(proc, True)
+            self._monitor_tasks.append(
+                asyncio.create_task(self._monitor_task(proc), name="inference_pool_monitor")
+            )
+
+    async def aclose(self) -> None:
+        if not self._started:
+            return
+
+        self._closing = True
+        self._close_ev.set()
+        self._ready_ev.set()  # wake up the requests waiting for a process
+        await asyncio.gather(*(proc.aclose() for proc in list(self._executors)))
+        # a process being respawned is closed by its monitor task once initialized
+        await asyncio.gather(*self._monitor_tasks)
+
+    async def do_inference(self, method: str, data: bytes) -> bytes | None:
+        if not self._started:
+            raise RuntimeError("inference pool not started")
+
+        while not self._ready:
+            if self._closing:
+                raise RuntimeError("inference pool is closed")
+
+            # every process is being respawned
+            await self._ready_ev.wait()
+
+        proc = min(self._ready, key=lambda proc: proc.pending_requests)
+        self._queue_depth_graph.plot(time.time(), self.pending_requests + 1)
+
+        started_at = time.perf_counter()
+        result = await proc.do_inference(method, data)
+        self._latency_graph.plot(time.time(), (time.perf_counter() - started_at) * 1000)
+        return result
+
+    def _set_ready(self, proc: InferenceProcExecutor, ready: bool) -> None:
+        if ready:
+            self._ready.append(proc)
+        elif proc in self._ready:
+            self._ready.remove(proc)
+
+        if self._ready or self._closing:
+            self._ready_ev.set()
+        else:
+            self._ready_ev.clear()
+
+    @log_exceptions(logger=logger)
+    async def _monitor_task(self, proc: InferenceProcExecutor) -> None:
+        while True:
+            await proc.join()
+            self._set_ready(proc, False)
+            self._executors.discard(proc)
+            if self._closing:
+                return
+
+            logger.warning(
+                "inference process exited, respawning",
+                extra={"exitcode": proc.exitcode, **proc.logging_extra()},
+            )
+
+            delay = MIN_RESPAWN_DELAY
+            while True:
+                try:
+                    await asyncio.wait_for(self._close_ev.wait(), delay)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+
+                proc = self._create_executor()
+                try:
+                    await self._start_executor(proc)
+                    break
+                except Exception:
+                    logger.exception("failed to respawn the inference process")
+                    await proc.aclose()
+                    self._executors.discard(proc)
+                    delay = min(delay * 2, MAX_RESPAWN_DELAY)
+
+            if self._closing:
+                await proc.aclose()
+                self._executors.discard(proc)
+                return
+
+            self._set_ready(proc, True)
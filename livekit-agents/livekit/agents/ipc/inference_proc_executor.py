@@ -5,11 +5,12 @@ import contextlib
 import multiprocessing as mp
 import socket
 from multiprocessing.context import BaseContext
+from typing import Any
 
 from ..inference_runner import _RunnersDict
 from ..log import logger
 from ..utils import aio, log_exceptions, shortuuid
-from . import channel, proto
+from . import channel, log_queue, proto
 from .inference_proc_lazy_main import ProcStartArgs, proc_main
 from .supervised_proc import SupervisedProc
 
@@ -29,6 +30,9 @@ class InferenceProcExecutor(SupervisedProc):
         mp_ctx: BaseContext,
         loop: asyncio.AbstractEventLoop,
         http_proxy: str | None,
+        shm_ring_size: int = 0,
+        num_threads: int = 0,
+        intra_op_threads: int = 0,
     ) -> None:
         super().__init__(
             initialize_timeout=initialize_timeout,
@@ -41,16 +45,27 @@ class InferenceProcExecutor(SupervisedProc):
             mp_ctx=mp_ctx,
             loop=loop,
             http_proxy=http_proxy,
+            shm_ring_size=shm_ring_size,
         )
 
         self._runners = runners
+        self._num_threads = num_threads
+        self._intra_op_threads = intra_op_threads
         self._active_requests: dict[str, asyncio.Future[proto.InferenceResponse]] = {}
 
+    @property
+    def pending_requests(self) -> int:
+        """number of inference requests waiting for a response"""
+        return len(self._active_requests)
+
     def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> mp.Process:
         proc_args = ProcStartArgs(
             log_cch=log_cch,
             mp_cch=cch,
             runners=self._runners,
+            num_threads=self._num_threads,
+            intra_op_threads=self._intra_op_threads,
+            log_levels=log_queue.logger_levels(),
         )
 
         return self._mp_ctx.Process(  # type: ignore
@@ -61,18 +76,24 @@ class InferenceProcExecutor(SupervisedProc):
 
     @log_exceptions(logger=logger)
     async def _main_task(self, ipc_ch: aio.ChanReceiver[channel.Message]) -> None:
-        async for msg in ipc_ch:
-            if isinstance(msg, proto.InferenceResponse):
-                fut = self._active_requests.pop(msg.request_id, None)
-                if fut is None:
-                    logger.warning(
-                        "received unexpected inference response",
-                        extra={"request_id": msg.request_id},
-                    )
-                    return
-
-                with contextlib.suppress(asyncio.InvalidStateError):
-                    fut.set_result(msg)
+        try:
+            async for msg in ipc_ch:
+                if isinstance(msg, proto.InferenceResponse):
+                    fut = self._active_requests.pop(msg.request_id, None)
+                    if fut is None:
+                        logger.warning(
+                            "received unexpected inference response",
+                            extra={"request_id": msg.request_id},
+                        )
+                        continue
+
+                    with contextlib.suppress(asyncio.InvalidStateError):
+                        fut.set_result(msg)
+        finally:
+            # the process exited, the pending requests will never get a response
+            for fut in self._active_requests.values():
+                if not fut.done():
+                    fut.set_exception(RuntimeError("inference process exited"))
 
     async def do_inference(self, method: str, data: bytes) -> bytes | None:
         if not self.started:
@@ -81,20 +102,24 @@ class InferenceProcExecutor(SupervisedProc):
         request_id = shortuuid("inference_req_")
         fut = asyncio.Future[proto.InferenceResponse]()
 
-        await channel.asend_message(
-            self._pch,
-            proto.InferenceRequest(request_id=request_id, method=method, data=data),
-        )
-
+        # register the request before sending it, the response can arrive while the
+        # send is still draining
         self._active_requests[request_id] = fut
+        try:
+            await channel.asend_message(
+                self._pch,
+                proto.InferenceRequest(request_id=request_id, method=method, data=data),
+            )
+            inf_resp = await fut
+        finally:
+            self._active_requests.pop(request_id, None)
 
-        inf_resp = await fut
         if inf_resp.error:
             raise RuntimeError(f"inference of {method} failed: {inf_resp.error}")
 
         return inf_resp.data
 
-    def logging_extra(self):
+    def logging_extra(self) -> dict[str, Any]:
         extra = super().logging_extra()
         extra["inference"] = True
         return extra
@@ -18,6 +18,7 @@ if current_process().name == "inference_proc":
 
 import asyncio
 import socket
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from ..inference_runner import _RunnersDict
@@ -33,12 +34,28 @@ class ProcStartArgs:
     log_cch: socket.socket
     mp_cch: socket.socket
     runners: _RunnersDict
+    num_threads: int = 0
+    """size of the thread pool of each runner, 0 uses the default of ThreadPoolExecutor"""
+    intra_op_threads: int = 0
+    """threads used by a single inference, see _InferenceRunner.intra_op_threads"""
+    log_levels: dict[str, int] | None = None
+    """levels of the loggers of the parent process, used to filter the forwarded records"""
 
 
 def proc_main(args: ProcStartArgs) -> None:
+    import signal
+
     from .proc_client import _ProcClient
 
-    inf_proc = _InferenceProc(args.runners)
+    # this module is already imported when the process is forked from a forkserver
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    inf_proc = _InferenceProc(
+        args.runners,
+        num_threads=args.num_threads,
+        intra_op_threads=args.intra_op_threads,
+    )
 
     client = _ProcClient(
         args.mp_cch,
@@ -47,7 +64,7 @@ def proc_main(args: ProcStartArgs) -> None:
         inf_proc.entrypoint,
     )
 
-    client.initialize_logger()
+    client.initialize_logger(args.log_levels)
 
     pid = current_process().pid
     logger.info("initializing inference process", extra={"pid": pid})
@@ -58,9 +75,27 @@ def proc_main(args: ProcStartArgs) -> None:
 
 
 class _InferenceProc:
-    def __init__(self, runners: _RunnersDict) -> None:
+    def __init__(
+        self,
+        runners: _RunnersDict,
+        *,
+        num_threads: int = 0,
+        intra_op_threads: int = 0,
+    ) -> None:
         # create an instance of each runner (the ctor must not requires any argument)
         self._runners = {name: runner() for name, runner in runners.items()}
+        # each runner gets its own threads, a slow runner can't starve the others
+        self._executors = {
+            name: ThreadPoolExecutor(
+                max_workers=num_threads or None, thread_name_prefix=f"inference_{name}"
+            )
+            for name in self._runners
+        }
+        if intra_op_threads > 0:
+            for runner in self._runners.values():
+                runner.intra_op_threads = intra_op_threads
+
+        self._request_tasks: set[asyncio.Task[None]] = set()
 
     def initialize(self, init_req: proto.InitializeRequest, client: _ProcClient) -> None:
         self._client = client
@@ -74,13 +109,23 @@ class _InferenceProc:
 
     @log_exceptions(logger=logger)
     async def entrypoint(self, cch: aio.ChanReceiver[Message]) -> None:
-        async for msg in cch:
-            if isinstance(msg, proto.InferenceRequest):
-                await self._handle_inference_request(msg)
-
-            if isinstance(msg, proto.ShutdownRequest):
-                await self._client.send(proto.Exiting(reason=msg.reason))
-                break
+        try:
+            async for msg in cch:
+                if isinstance(msg, proto.InferenceRequest):
+                    # requests run concurrently, up to the threads of their runner
+                    task = asyncio.create_task(
+                        self._handle_inference_request(msg), name="inference_request"
+                    )
+                    self._request_tasks.add(task)
+                    task.add_done_callback(self._request_tasks.discard)
+
+                if isinstance(msg, proto.ShutdownRequest):
+                    await self._client.send(proto.Exiting(reason=msg.reason))
+                    break
+        finally:
+            await aio.cancel_and_wait(*self._request_tasks)
+            for executor in self._executors.values():
+                executor.shutdown(wait=False)
 
     async def _handle_inference_request(self, msg: proto.InferenceRequest) -> None:
         loop = asyncio.get_running_loop()
@@ -89,7 +134,9 @@ class _InferenceProc:
             logger.warning("unknown inference method", extra={"method": msg.method})
 
         try:
-            data = await loop.run_in_executor(None, self._runners[msg.method].run, msg.data)
+            data = await loop.run_in_executor(
+                self._executors[msg.method], self._runners[msg.method].run, msg.data
+            )
             await self._client.send(
                 proto.InferenceResponse(
                     request_id=msg.request_id,
@@ -11,7 +11,7 @@ from typing import Any, Callable
 from ..job import JobContext, JobProcess, RunningJobInfo
 from ..log import logger
 from ..utils import aio, log_exceptions, shortuuid
-from . import channel, proto
+from . import channel, log_queue, proto
 from .inference_executor import InferenceExecutor
 from .job_executor import JobStatus
 from .job_proc_lazy_main import ProcStartArgs, proc_main
@@ -35,6 +35,7 @@ class ProcJobExecutor(SupervisedProc):
         http_proxy: str | None,
         mp_ctx: BaseContext,
         loop: asyncio.AbstractEventLoop,
+        shm_ring_size: int = 0,
     ) -> None:
         super().__init__(
             initialize_timeout=initialize_timeout,
@@ -47,6 +48,7 @@ class ProcJobExecutor(SupervisedProc):
             mp_ctx=mp_ctx,
             loop=loop,
             http_proxy=http_proxy,
+            shm_ring_size=shm_ring_size,
         )
 
         self._user_args: Any | None = None
@@ -101,6 +103,7 @@ class ProcJobExecutor(SupervisedProc):
             log_cch=log_cch,
             mp_cch=cch,
             user_arguments=self._user_args,
+            log_levels=log_queue.logger_levels(),
         )
 
         return self._mp_ctx.Process(  # type: ignore
@@ -167,7 +170,7 @@ class ProcJobExecutor(SupervisedProc):
         start_req.running_job = info
         await channel.asend_message(self._pch, start_req)
 
-    def logging_extra(self):
+    def logging_extra(self) -> dict[str, Any]:
         extra = super().logging_extra()
 
         if self._running_job:
@@ -54,11 +54,19 @@ class ProcStartArgs:
     mp_cch: socket.socket
     log_cch: socket.socket
     user_arguments: Any | None = None
+    log_levels: dict[str, int] | None = None
+    """levels of the loggers of the parent process, used to filter the forwarded records"""
 
 
 def proc_main(args: ProcStartArgs) -> None:
+    import signal
+
     from .proc_client import _ProcClient
 
+    # this module is already imported when the process is forked from a forkserver
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
     job_proc = _JobProc(
         args.initialize_process_fnc,
         args.job_entrypoint_fnc,
@@ -73,7 +81,7 @@ def proc_main(args: ProcStartArgs) -> None:
         job_proc.entrypoint,
     )
 
-    client.initialize_logger()
+    client.initialize_logger(args.log_levels)
 
     pid = current_process().pid
     logger.info("initializing job process", extra={"pid": pid})
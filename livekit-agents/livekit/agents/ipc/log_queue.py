@@ -1,16 +1,57 @@
 from __future__ import annotations
 
-import copy
+import contextlib
 import logging
 import pickle
 import queue
 import sys
 import threading
-from typing import Callable, Optional
+import time
+from typing import Any, Callable, Optional
 
 from .. import utils
+from ..log import logger
 from ..utils.aio import duplex_unix
 
+# the records are sent by batches, at most LOG_BATCH_WINDOW seconds after the first one
+LOG_BATCH_WINDOW = 0.1
+MAX_LOG_BATCH_SIZE = 256
+# records emitted while the queue is full are dropped, logging never blocks the job
+MAX_QUEUED_LOGS = 10_000
+
+# attributes of a LogRecord that aren't part of the extra fields
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+# compact representation of a record sent to the parent process:
+# (name, levelno, created, pathname, lineno, funcName, thread, threadName, process, processName,
+#  message, extra)
+_LogTuple = tuple[
+    str,
+    int,
+    float,
+    str,
+    int,
+    str,
+    Optional[int],
+    Optional[str],
+    Optional[int],
+    Optional[str],
+    str,
+    Optional[dict[str, Any]],
+]
+
+
+def logger_levels() -> dict[str, int]:
+    """Levels of the loggers configured in the current process (the root logger is "").
+
+    They're passed to the child processes, so the records that would be ignored by the parent
+    process are filtered before being serialized."""
+    levels = {"": logging.root.level}
+    for name, lger in logging.root.manager.loggerDict.items():
+        if isinstance(lger, logging.Logger) and lger.level != logging.NOTSET:
+            levels[name] = lger.level
+    return levels
+
 
 class LogQueueListener:
     def __init__(
@@ -21,6 +62,12 @@ class LogQueueListener:
         self._thread: threading.Thread | None = None
         self._duplex = duplex
         self._prepare_fnc = prepare_fnc
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped by the child process because the channel was congested"""
+        return self._dropped
 
     def start(self) -> None:
         self._thread = threading.Thread(target=self._monitor, name="ipc_log_listener")
@@ -43,66 +90,212 @@ class LogQueueListener:
 
         lger.callHandlers(record)
 
-    def _monitor(self):
+    def _monitor(self) -> None:
         while True:
             try:
                 data = self._duplex.recv_bytes()
             except utils.aio.duplex_unix.DuplexClosed:
                 break
 
-            record = pickle.loads(data)
-            self.handle(record)
+            dropped, batch = pickle.loads(data)
+            for log in batch:
+                # check the level before creating the record
+                if logging.getLogger(log[0]).isEnabledFor(log[1]):
+                    self.handle(_make_record(log))
+
+            if dropped:
+                self._dropped += dropped
+                record = logger.makeRecord(
+                    logger.name,
+                    logging.WARNING,
+                    __file__,
+                    0,
+                    "dropped logs of the process, the log channel is congested",
+                    (),
+                    None,
+                    extra={"dropped": dropped, "total_dropped": self._dropped},
+                )
+                self.handle(record)
 
 
 class LogQueueHandler(logging.Handler):
     _sentinal = None
 
-    def __init__(self, duplex: utils.aio.duplex_unix._Duplex) -> None:
+    def __init__(
+        self,
+        duplex: utils.aio.duplex_unix._Duplex,
+        *,
+        levels: dict[str, int] | None = None,
+    ) -> None:
         super().__init__()
         self._duplex = duplex
-        self._send_q = queue.SimpleQueue[Optional[bytes]]()
+        self._levels = levels
+        self._effective_levels: dict[str, int] = {}
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._send_q = queue.Queue[Optional[_LogTuple]](MAX_QUEUED_LOGS)
         self._send_thread = threading.Thread(target=self._forward_logs, name="ipc_log_forwarder")
         self._send_thread.start()
 
-    def _forward_logs(self):
-        while True:
-            serialized_record = self._send_q.get()
-            if serialized_record is None:
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def _forward_logs(self) -> None:
+        closing = False
+        while not closing:
+            first = self._send_q.get()
+            if first is None:
                 break
 
+            batch = [first]
+            deadline = time.monotonic() + LOG_BATCH_WINDOW
+            while len(batch) < MAX_LOG_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    log = self._send_q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if log is None:
+                    closing = True
+                    break
+
+                batch.append(log)
+
+            with self._dropped_lock:
+                dropped, self._dropped = self._dropped, 0
             try:
-                self._duplex.send_bytes(serialized_record)
+                self._duplex.send_bytes(_dumps_batch(dropped, batch))
             except duplex_unix.DuplexClosed:
                 break
 
         self._duplex.close()
 
+    def _is_enabled(self, name: str, levelno: int) -> bool:
+        if self._levels is None:
+            return True
+
+        level = self._effective_levels.get(name)
+        if level is None:
+            # same lookup as Logger.getEffectiveLevel, using the levels of the parent process
+            parent = name
+            while parent not in self._levels and parent:
+                parent = parent.rpartition(".")[0]
+
+            level = self._levels.get(parent, logging.WARNING)
+            self._effective_levels[name] = level
+
+        return levelno >= level
+
     def emit(self, record: logging.LogRecord) -> None:
         try:
             # Check if Python is shutting down
             if sys.is_finalizing():
                 return
 
-            # from https://github.com/python/cpython/blob/91b7f2e7f6593acefda4fa860250dd87d6f849bf/Lib/logging/handlers.py#L1453
-            msg = self.format(record)
-            record = copy.copy(record)
-            record.message = msg
-            record.msg = msg
-            record.args = None
-            record.exc_info = None
-            record.exc_text = None
-            record.stack_info = None
+            if not self._is_enabled(record.name, record.levelno):
+                return
 
-            # https://websockets.readthedocs.io/en/stable/topics/logging.html#logging-to-json
-            # webosckets library add "websocket" attribute to log records, which is not pickleable
-            if hasattr(record, "websocket"):
-                record.websocket = None
+            # the message includes the formatted exception and stack, like QueueHandler.prepare
+            msg = self.format(record)
 
-            self._send_q.put_nowait(pickle.dumps(record))
+            extra: dict[str, Any] | None = None
+            for key, value in record.__dict__.items():
+                if key not in _RECORD_ATTRS:
+                    if extra is None:
+                        extra = {}
+                    extra[key] = value
 
+            log: _LogTuple = (
+                record.name,
+                record.levelno,
+                record.created,
+                record.pathname,
+                record.lineno,
+                record.funcName,
+                record.thread,
+                record.threadName,
+                record.process,
+                record.processName,
+                msg,
+                extra,
+            )
+            self._send_q.put_nowait(log)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
         except Exception:
             self.handleError(record)
 
     def close(self) -> None:
         super().close()
-        self._send_q.put_nowait(self._sentinal)
+        while True:
+            try:
+                self._send_q.put_nowait(self._sentinal)
+                break
+            except queue.Full:
+                # make room for the sentinel, the forwarder must always stop
+                with contextlib.suppress(queue.Empty), self._dropped_lock:
+                    self._send_q.get_nowait()
+                    self._dropped += 1
+
+
+def _dumps_batch(dropped: int, batch: list[_LogTuple]) -> bytes:
+    try:
+        return pickle.dumps((dropped, batch), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # an extra field isn't pickleable (e.g. the "websocket" attribute added by the
+        # websockets library), send its str() instead, like the JSON formatter does
+        batch = [(*log[:-1], _pickleable_extra(log[-1])) for log in batch]
+        return pickle.dumps((dropped, batch), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _pickleable_extra(extra: dict[str, Any] | None) -> dict[str, Any] | None:
+    if not extra:
+        return extra
+
+    pickleable = {}
+    for key, value in extra.items():
+        try:
+            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            pickleable[key] = value
+        except Exception:
+            try:
+                pickleable[key] = str(value)
+            except Exception:
+                pickleable[key] = "<unprintable>"
+    return pickleable
+
+
+def _make_record(log: _LogTuple) -> logging.LogRecord:
+    (
+        name,
+        levelno,
+        created,
+        pathname,
+        lineno,
+        func_name,
+        thread,
+        thread_name,
+        process,
+        process_name,
+        msg,
+        extra,
+    ) = log
+
+    record = logging.LogRecord(name, levelno, pathname, lineno, msg, None, None, func_name)
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    # time since the logging module was loaded, in the parent process
+    record.relativeCreated = (created - getattr(logging, "_startTime", created)) * 1000
+    record.thread = thread
+    record.threadName = thread_name
+    record.process = process
+    record.processName = process_name
+    if extra:
+        record.__dict__.update(extra)
+    return record
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from ..utils import MovingAverage
+
+# a job waiting longer than this for a process is counted as a cold start
+COLD_START_WAIT = 0.1
+# idle processes kept per job expected to arrive while a new process warms up
+DEMAND_SAFETY_FACTOR = 1.5
+
+
+@dataclass
+class IdleProcessAutoscaling:
+    """Adjusts the number of idle processes kept warm by the worker from the demand"""
+
+    min_idle_processes: int = 1
+    """Minimum number of idle processes, even when no job is arriving"""
+    max_idle_processes: int | None = None
+    """Maximum number of idle processes, defaults to WorkerOptions.num_idle_processes"""
+    memory_headroom_mb: float = 1024
+    """Memory left available on the machine, no idle process is added beyond it and surplus
+    idle processes are closed when the available memory drops below it"""
+    window: float = 60.0
+    """Duration in seconds over which the job arrival rate and the cold starts are measured"""
+    scale_down_delay: float = 30.0
+    """Minimum time in seconds between two decreases of the target (by one process each)"""
+
+
+@dataclass
+class AutoscalerDecision:
+    target: int
+    reason: str
+    """what bounded the target: demand, min, max, memory or scale_down_delay"""
+    job_rate: float
+    """jobs per second launched during the window"""
+    warmup_time: float
+    """average time in seconds taken by a process to start and initialize"""
+    cold_starts: int
+    """jobs of the window that had to wait for a process"""
+    max_wait: float
+    """longest time in seconds a job of the window waited for a process"""
+    memory_cap: int | None
+    """maximum number of idle processes fitting in memory, None if unknown"""
+
+
+class ProcAutoscaler:
+    def __init__(self, opts: IdleProcessAutoscaling, *, max_idle_processes: int) -> None:
+        self._opts = opts
+        self._max = max(opts.max_idle_processes or max_idle_processes, 0)
+        self._min = min(max(opts.min_idle_processes, 0), self._max)
+        self._launches: deque[tuple[float, float]] = deque()
+        self._warmup_time = MovingAverage(16)
+
+        # start warm, the target decreases if the jobs don't come
+        self._target = self._max  # without the memory bound
+        self._bounded_target = self._max
+        self._last_scale_down: float | None = None
+        self._decision: AutoscalerDecision | None = None
+
+    @property
+    def target(self) -> int:
+        return self._bounded_target
+
+    @property
+    def decision(self) -> AutoscalerDecision | None:
+        return self._decision
+
+    def on_job_launched(self, wait: float, *, now: float | None = None) -> None:
+        """a job got a process after waiting `wait` seconds"""
+        self._launches.append((time.monotonic() if now is None else now, wait))
+
+    def on_process_ready(self, warmup_time: float) -> None:
+        self._warmup_time.add_sample(warmup_time)
+
+    def update(
+        self,
+        *,
+        idle_processes: int,
+        process_memory_mb: float | None = None,
+        available_memory_mb: float | None = None,
+        now: float | None = None,
+    ) -> int:
+        """compute the new target number of idle processes.
+
+        process_memory_mb is the memory used by an idle process, available_memory_mb the memory
+        available on the machine, the memory bound is ignored when they're unknown."""
+        now = time.monotonic() if now is None else now
+        if self._last_scale_down is None:
+            self._last_scale_down = now
+        while self._launches and self._launches[0][0] < now - self._opts.window:
+            self._launches.popleft()
+
+        job_rate = len(self._launches) / self._opts.window
+        waits = [wait for _, wait in self._launches]
+        cold_starts = sum(1 for wait in waits if wait > COLD_START_WAIT)
+        warmup_time = self._warmup_time.get_avg()
+
+        # enough idle processes for the jobs arriving while the used ones are replaced
+        demand = math.ceil(job_rate * warmup_time * DEMAND_SAFETY_FACTOR)
+        if cold_starts > 0:
+            demand += 1
+
+        if demand > self._max:
+            target, reason = self._max, "max"
+        elif demand < self._min:
+            target, reason = self._min, "min"
+        else:
+            target, reason = demand, "demand"
+
+        if target >= self._target:
+            self._last_scale_down = now
+        elif now - self._last_scale_down < self._opts.scale_down_delay:
+            target, reason = self._target, "scale_down_delay"
+        else:
+            # scale down progressively, the traffic may come back
+            target = self._target - 1
+            self._last_scale_down = now
+
+        self._target = target
+
+        memory_cap: int | None = None
+        if process_memory_mb and available_memory_mb is not None:
+            free_mb = available_memory_mb - self._opts.memory_headroom_mb
+            memory_cap = max(idle_processes + math.floor(free_mb / process_memory_mb), 0)
+            if memory_cap < target:
+                target, reason = memory_cap, "memory"
+
+        self._bounded_target = target
+        self._decision = AutoscalerDecision(
+            target=target,
+            reason=reason,
+            job_rate=job_rate,
+            warmup_time=warmup_time,
+            cold_starts=cold_starts,
+            max_wait=max(waits, default=0.0),
+            memory_cap=memory_cap,
+        )
+        return target
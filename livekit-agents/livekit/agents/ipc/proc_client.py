@@ -10,7 +10,7 @@ from typing import Callable
 
 from ..log import logger
 from ..utils import aio, log_exceptions, time_ms
-from .channel import Message, arecv_message, asend_message, recv_message, send_message
+from .channel import AsyncDuplex, Message, arecv_message, asend_message, recv_message, send_message
 from .log_queue import LogQueueHandler
 from .proto import (
     IPC_MESSAGES,
@@ -36,7 +36,9 @@ class _ProcClient:
         self._initialized = False
         self._log_handler: LogQueueHandler | None = None
 
-    def initialize_logger(self) -> None:
+    def initialize_logger(self, levels: dict[str, int] | None = None) -> None:
+        """levels are the levels of the loggers of the parent process (see
+        log_queue.logger_levels), the records ignored by the parent aren't forwarded"""
         if self._log_cch is None:
             raise RuntimeError("cannot initialize logger without log channel")
 
@@ -44,7 +46,7 @@ class _ProcClient:
         root_logger.setLevel(logging.NOTSET)
 
         log_cch = aio.duplex_unix._Duplex.open(self._log_cch)
-        self._log_handler = LogQueueHandler(log_cch)
+        self._log_handler = LogQueueHandler(log_cch, levels=levels)
         root_logger.addHandler(self._log_handler)
 
     def initialize(self) -> None:
@@ -100,7 +102,14 @@ class _ProcClient:
         await asend_message(self._acch, msg)
 
     async def _monitor_task(self) -> None:
-        self._acch = await aio.duplex_unix._AsyncDuplex.open(self._mp_cch)
+        self._acch: AsyncDuplex = await aio.duplex_unix._AsyncDuplex.open(self._mp_cch)
+        if self._init_req.shm_down_ring and self._init_req.shm_up_ring:
+            self._acch = aio.duplex_shm._AsyncShmDuplex(
+                self._acch,
+                tx=aio.duplex_shm._ShmRing.attach(self._init_req.shm_up_ring),
+                rx=aio.duplex_shm._ShmRing.attach(self._init_req.shm_down_ring),
+            )
+
         try:
             exit_flag = asyncio.Event()
             ping_timeout = aio.sleep(self._init_req.ping_timeout)
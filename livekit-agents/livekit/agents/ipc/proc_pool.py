@@ -2,17 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import math
+import time
 from collections.abc import Awaitable
 from multiprocessing.context import BaseContext
 from typing import Any, Callable, Literal
 
+import psutil
+
 from .. import utils
 from ..job import JobContext, JobExecutorType, JobProcess, RunningJobInfo
 from ..log import logger
 from ..utils import aio
-from ..utils.hw.cpu import get_cpu_monitor
+from ..utils.hw import get_cpu_monitor, get_memory_monitor, get_process_memory
 from . import inference_executor, job_proc_executor, job_thread_executor
 from .job_executor import JobExecutor
+from .proc_autoscaler import IdleProcessAutoscaling, ProcAutoscaler
 
 EventTypes = Literal[
     "process_created",
@@ -24,6 +28,10 @@ EventTypes = Literal[
 
 MAX_CONCURRENT_INITIALIZATIONS = math.ceil(get_cpu_monitor().cpu_count())
 
+# bounds (in seconds) of the buckets of the spawn latency histograms
+SPAWN_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+AUTOSCALE_INTERVAL = 1.0
+
 
 class ProcPool(utils.EventEmitter[EventTypes]):
     def __init__(
@@ -41,6 +49,8 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         memory_limit_mb: float,
         http_proxy: str | None,
         loop: asyncio.AbstractEventLoop,
+        shm_ring_size: int = 0,
+        autoscaling: IdleProcessAutoscaling | None = None,
     ) -> None:
         super().__init__()
         self._job_executor_type = job_executor_type
@@ -55,12 +65,14 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         self._memory_warn_mb = memory_warn_mb
         self._default_num_idle_processes = num_idle_processes
         self._http_proxy = http_proxy
+        self._shm_ring_size = shm_ring_size
         self._target_idle_processes = num_idle_processes
 
         self._init_sem = asyncio.Semaphore(MAX_CONCURRENT_INITIALIZATIONS)
         self._warmed_proc_queue = asyncio.Queue[JobExecutor]()
         self._executors: list[JobExecutor] = []
         self._spawn_tasks: set[asyncio.Task] = set()
+        self._close_tasks: set[asyncio.Task[None]] = set()
         self._monitor_tasks: set[asyncio.Task] = set()
         self._started = False
         self._closed = False
@@ -68,10 +80,38 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         self._idle_ready = asyncio.Event()
         self._jobs_waiting_for_process = 0
 
+        self._start_latency = utils.Histogram(SPAWN_LATENCY_BUCKETS)
+        self._ready_latency = utils.Histogram(SPAWN_LATENCY_BUCKETS)
+
+        self._autoscaler: ProcAutoscaler | None = None
+        if autoscaling is not None:
+            self._autoscaler = ProcAutoscaler(autoscaling, max_idle_processes=num_idle_processes)
+            # cgroup aware, the headroom is the one of the container
+            self._memory_monitor = get_memory_monitor()
+
     @property
     def processes(self) -> list[JobExecutor]:
         return self._executors
 
+    @property
+    def start_latency(self) -> utils.Histogram:
+        """Time taken to start the processes (until the interpreter of the process is running)"""
+        return self._start_latency
+
+    @property
+    def ready_latency(self) -> utils.Histogram:
+        """Time taken by the processes to become ready to run a job, from the moment they are
+        requested (including the wait for an initialization slot and the prewarm)"""
+        return self._ready_latency
+
+    @property
+    def autoscaler(self) -> ProcAutoscaler | None:
+        return self._autoscaler
+
+    @property
+    def num_idle_processes(self) -> int:
+        return self._warmed_proc_queue.qsize()
+
     def get_by_job_id(self, job_id: str) -> JobExecutor | None:
         return next(
             (x for x in self._executors if x.running_job and x.running_job.job.id == job_id),
@@ -107,8 +147,11 @@ class ProcPool(utils.EventEmitter[EventTypes]):
             self._spawn_tasks.add(task)
             task.add_done_callback(self._spawn_tasks.discard)
 
+        requested_at = time.perf_counter()
         proc = await self._warmed_proc_queue.get()
         self._jobs_waiting_for_process -= 1
+        if self._autoscaler is not None:
+            self._autoscaler.on_job_launched(time.perf_counter() - requested_at)
 
         await proc.launch_job(info)
         self.emit("process_job_launched", proc)
@@ -122,6 +165,7 @@ class ProcPool(utils.EventEmitter[EventTypes]):
 
     @utils.log_exceptions(logger=logger)
     async def _proc_spawn_task(self) -> None:
+        requested_at = time.perf_counter()
         proc: JobExecutor
         if self._job_executor_type == JobExecutorType.THREAD:
             proc = job_thread_executor.ThreadJobExecutor(
@@ -150,6 +194,7 @@ class ProcPool(utils.EventEmitter[EventTypes]):
                 memory_warn_mb=self._memory_warn_mb,
                 memory_limit_mb=self._memory_limit_mb,
                 http_proxy=self._http_proxy,
+                shm_ring_size=self._shm_ring_size,
             )
         else:
             raise ValueError(f"unsupported job executor: {self._job_executor_type}")
@@ -161,16 +206,29 @@ class ProcPool(utils.EventEmitter[EventTypes]):
                 return
 
             self.emit("process_created", proc)
+            started_at = time.perf_counter()
             await proc.start()
+            self._start_latency.add_sample(time.perf_counter() - started_at)
             self.emit("process_started", proc)
             try:
                 await proc.initialize()
                 # process where initialization times out will never fire "process_ready"
                 # neither be used to launch jobs
 
+                ready_latency = time.perf_counter() - requested_at
+                self._ready_latency.add_sample(ready_latency)
+                if self._autoscaler is not None:
+                    self._autoscaler.on_process_ready(time.perf_counter() - started_at)
+                logger.debug(
+                    "process ready",
+                    extra={
+                        "ready_latency": round(ready_latency, 3),
+                        "ready_latency_p90": self._ready_latency.quantile(0.9),
+                    },
+                )
                 self.emit("process_ready", proc)
                 self._warmed_proc_queue.put_nowait(proc)
-                if self._warmed_proc_queue.qsize() >= self._default_num_idle_processes:
+                if self._warmed_proc_queue.qsize() >= self._ready_target():
                     self._idle_ready.set()
             except Exception:
                 pass
@@ -187,15 +245,72 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         finally:
             self._executors.remove(proc)
 
+    def _ready_target(self) -> int:
+        # number of idle processes start() waits for
+        if self._autoscaler is not None:
+            return min(self._default_num_idle_processes, self._autoscaler.target)
+        return self._default_num_idle_processes
+
+    def _sample_memory(self, idle_pids: list[int]) -> tuple[float | None, float]:
+        """Average memory of the idle processes and memory left before the limit, in MB.
+
+        Reads smaps and the cgroup files, runs in the default executor."""
+        memory = []
+        for pid in idle_pids:
+            try:
+                memory.append(get_process_memory(pid) / (1024 * 1024))
+            except psutil.Error:
+                pass
+
+        process_memory_mb = sum(memory) / len(memory) if memory else None
+        monitor = self._memory_monitor
+        available = max(monitor.memory_limit() - monitor.memory_usage(), 0)
+        return process_memory_mb, available / (1024 * 1024)
+
+    async def _autoscale(self) -> None:
+        assert self._autoscaler is not None
+
+        idle_pids = [
+            proc.pid
+            for proc in self._executors
+            if isinstance(proc, job_proc_executor.ProcJobExecutor)
+            and proc.pid is not None
+            and proc.running_job is None
+        ]
+
+        loop = asyncio.get_running_loop()
+        process_memory_mb, available_memory_mb = await loop.run_in_executor(
+            None, self._sample_memory, idle_pids
+        )
+
+        target = self._autoscaler.update(
+            idle_processes=self._warmed_proc_queue.qsize(),
+            process_memory_mb=process_memory_mb,
+            available_memory_mb=available_memory_mb,
+        )
+
+        # close the surplus idle processes, the ones idle for the longest time first
+        while self._warmed_proc_queue.qsize() > target:
+            proc = self._warmed_proc_queue.get_nowait()
+            logger.debug("closing surplus idle process", extra={"target_idle_processes": target})
+            task = asyncio.create_task(proc.aclose())
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+
+        if self._warmed_proc_queue.qsize() >= self._ready_target():
+            self._idle_ready.set()
+
     @utils.log_exceptions(logger=logger)
     async def _main_task(self) -> None:
+        next_autoscale = 0.0
         try:
             while not self._closed:
+                if self._autoscaler is not None and time.monotonic() >= next_autoscale:
+                    next_autoscale = time.monotonic() + AUTOSCALE_INTERVAL
+                    await self._autoscale()
+
                 current_pending = self._warmed_proc_queue.qsize() + len(self._spawn_tasks)
-                to_spawn = (
-                    min(self._target_idle_processes, self._default_num_idle_processes)
-                    - current_pending
-                )
+                to_spawn = min(self._target_idle_processes, self._ready_target()) - current_pending
 
                 for _ in range(to_spawn):
                     task = asyncio.create_task(self._proc_spawn_task())
@@ -206,4 +321,5 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         except asyncio.CancelledError:
             await asyncio.gather(*[proc.aclose() for proc in self._executors])
             await asyncio.gather(*self._spawn_tasks)
+            await asyncio.gather(*self._close_tasks)
             await asyncio.gather(*self._monitor_tasks)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import io
 import pickle
 from dataclasses import dataclass, field
 from typing import Any, ClassVar
@@ -23,20 +22,27 @@ class InitializeRequest:
     # if ping is higher than this, process is considered unresponsive
     high_ping_threshold: float = 0
     http_proxy: str = ""  # empty = None
+    # names of the shared memory rings used after the initialization, empty = disabled
+    shm_down_ring: str = ""  # main process -> subprocess
+    shm_up_ring: str = ""  # subprocess -> main process
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_bool(b, self.asyncio_debug)
         channel.write_float(b, self.ping_interval)
         channel.write_float(b, self.ping_timeout)
         channel.write_float(b, self.high_ping_threshold)
         channel.write_string(b, self.http_proxy)
+        channel.write_string(b, self.shm_down_ring)
+        channel.write_string(b, self.shm_up_ring)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.asyncio_debug = channel.read_bool(b)
         self.ping_interval = channel.read_float(b)
         self.ping_timeout = channel.read_float(b)
         self.high_ping_threshold = channel.read_float(b)
         self.http_proxy = channel.read_string(b)
+        self.shm_down_ring = channel.read_string(b)
+        self.shm_up_ring = channel.read_string(b)
 
 
 @dataclass
@@ -46,10 +52,10 @@ class InitializeResponse:
     MSG_ID: ClassVar[int] = 1
     error: str = ""
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_string(b, self.error)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.error = channel.read_string(b)
 
 
@@ -60,10 +66,10 @@ class PingRequest:
     MSG_ID: ClassVar[int] = 2
     timestamp: int = 0
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_long(b, self.timestamp)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.timestamp = channel.read_long(b)
 
 
@@ -75,11 +81,11 @@ class PongResponse:
     last_timestamp: int = 0
     timestamp: int = 0
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_long(b, self.last_timestamp)
         channel.write_long(b, self.timestamp)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.last_timestamp = channel.read_long(b)
         self.timestamp = channel.read_long(b)
 
@@ -92,7 +98,7 @@ class StartJobRequest:
     MSG_ID: ClassVar[int] = 4
     running_job: RunningJobInfo = field(init=False)
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         accept_args = self.running_job.accept_arguments
         channel.write_bytes(b, self.running_job.job.SerializeToString())
         channel.write_string(b, accept_args.name)
@@ -102,7 +108,7 @@ class StartJobRequest:
         channel.write_string(b, self.running_job.token)
         channel.write_string(b, self.running_job.worker_id)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         job = agent.Job()
         job.ParseFromString(channel.read_bytes(b))
         self.running_job = RunningJobInfo(
@@ -126,10 +132,10 @@ class ShutdownRequest:
     MSG_ID: ClassVar[int] = 5
     reason: str = ""
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_string(b, self.reason)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.reason = channel.read_string(b)
 
 
@@ -140,10 +146,10 @@ class Exiting:
     MSG_ID: ClassVar[int] = 6
     reason: str = ""
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_string(b, self.reason)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.reason = channel.read_string(b)
 
 
@@ -156,12 +162,12 @@ class InferenceRequest:
     request_id: str = ""
     data: bytes = b""
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_string(b, self.method)
         channel.write_string(b, self.request_id)
         channel.write_bytes(b, self.data)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.method = channel.read_string(b)
         self.request_id = channel.read_string(b)
         self.data = channel.read_bytes(b)
@@ -176,14 +182,14 @@ class InferenceResponse:
     data: bytes | None = None
     error: str = ""
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_string(b, self.request_id)
         channel.write_bool(b, self.data is not None)
         if self.data is not None:
             channel.write_bytes(b, self.data)
         channel.write_string(b, self.error)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.request_id = channel.read_string(b)
         has_data = channel.read_bool(b)
         if has_data:
@@ -196,10 +202,10 @@ class TracingRequest:
     MSG_ID: ClassVar[int] = 9
     request_id: str = ""
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_string(b, self.request_id)
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.request_id = channel.read_string(b)
 
 
@@ -209,11 +215,11 @@ class TracingResponse:
     request_id: str = ""
     info: dict[str, Any] = field(default_factory=dict)
 
-    def write(self, b: io.BytesIO) -> None:
+    def write(self, b: channel.Writer) -> None:
         channel.write_string(b, self.request_id)
         channel.write_bytes(b, pickle.dumps(self.info))
 
-    def read(self, b: io.BytesIO) -> None:
+    def read(self, b: channel.Reader) -> None:
         self.request_id = channel.read_string(b)
         self.info = pickle.loads(channel.read_bytes(b))
 
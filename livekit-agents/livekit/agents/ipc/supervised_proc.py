@@ -16,7 +16,7 @@ import psutil
 
 from ..log import logger
 from ..utils import aio, log_exceptions, time_ms
-from ..utils.aio import duplex_unix
+from ..utils.aio import duplex_shm, duplex_unix
 from . import channel, proto
 from .log_queue import LogQueueListener
 
@@ -31,6 +31,7 @@ class _ProcOpts:
     ping_timeout: float
     high_ping_threshold: float
     http_proxy: str | None
+    shm_ring_size: int
 
 
 class SupervisedProc(ABC):
@@ -47,6 +48,7 @@ class SupervisedProc(ABC):
         http_proxy: str | None,
         mp_ctx: BaseContext,
         loop: asyncio.AbstractEventLoop,
+        shm_ring_size: int = 0,
     ) -> None:
         self._loop = loop
         self._mp_ctx = mp_ctx
@@ -59,6 +61,7 @@ class SupervisedProc(ABC):
             ping_timeout=ping_timeout,
             high_ping_threshold=high_ping_threshold,
             http_proxy=http_proxy,
+            shm_ring_size=shm_ring_size,
         )
 
         self._exitcode: int | None = None
@@ -69,6 +72,7 @@ class SupervisedProc(ABC):
         self._kill_sent = False
         self._initialize_fut = asyncio.Future[None]()
         self._lock = asyncio.Lock()
+        self._pch: channel.AsyncDuplex
 
     @abstractmethod
     def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> mp.Process: ...
@@ -149,16 +153,33 @@ class SupervisedProc(ABC):
     async def initialize(self) -> None:
         """initialize the process, this is sending a InitializeRequest message and waiting for a
         InitializeResponse with a timeout"""
-        await channel.asend_message(
-            self._pch,
-            proto.InitializeRequest(
-                asyncio_debug=self._loop.get_debug(),
-                ping_interval=self._opts.ping_interval,
-                ping_timeout=self._opts.ping_timeout,
-                high_ping_threshold=self._opts.high_ping_threshold,
-                http_proxy=self._opts.http_proxy or "",
-            ),
-        )
+        down_ring: duplex_shm._ShmRing | None = None
+        up_ring: duplex_shm._ShmRing | None = None
+        if self._opts.shm_ring_size > 0:
+            down_ring = duplex_shm._ShmRing.create(self._opts.shm_ring_size)
+            up_ring = duplex_shm._ShmRing.create(self._opts.shm_ring_size)
+
+        def _close_rings() -> None:
+            if down_ring is not None and up_ring is not None:
+                down_ring.close()
+                up_ring.close()
+
+        try:
+            await channel.asend_message(
+                self._pch,
+                proto.InitializeRequest(
+                    asyncio_debug=self._loop.get_debug(),
+                    ping_interval=self._opts.ping_interval,
+                    ping_timeout=self._opts.ping_timeout,
+                    high_ping_threshold=self._opts.high_ping_threshold,
+                    http_proxy=self._opts.http_proxy or "",
+                    shm_down_ring=down_ring.name if down_ring else "",
+                    shm_up_ring=up_ring.name if up_ring else "",
+                ),
+            )
+        except Exception:
+            _close_rings()
+            raise
 
         # wait for the process to become ready
         try:
@@ -177,9 +198,17 @@ class SupervisedProc(ABC):
                 )
                 raise RuntimeError(f"process initialization failed: {init_res.error}")
             else:
+                if down_ring is not None and up_ring is not None:
+                    # the subprocess switches to the shared memory transport right after
+                    # sending the InitializeResponse
+                    assert isinstance(self._pch, duplex_unix._AsyncDuplex)
+                    self._pch = duplex_shm._AsyncShmDuplex(self._pch, tx=down_ring, rx=up_ring)
+                    down_ring = up_ring = None
+
                 self._initialize_fut.set_result(None)
 
         except asyncio.TimeoutError:
+            _close_rings()
             self._initialize_fut.set_exception(
                 asyncio.TimeoutError("process initialization timed out")
             )
@@ -187,6 +216,7 @@ class SupervisedProc(ABC):
             self._send_kill_signal()
             raise
         except Exception as e:
+            _close_rings()
             # should be channel.ChannelClosed most of the time (or init_res error)
             self._initialize_fut.set_exception(e)
             raise
@@ -397,7 +427,7 @@ class SupervisedProc(ABC):
 
             await asyncio.sleep(5)  # check every 5 seconds
 
-    def logging_extra(self):
+    def logging_extra(self) -> dict[str, Any]:
         extra: dict[str, Any] = {
             "pid": self.pid,
         }
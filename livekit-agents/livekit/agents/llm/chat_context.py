@@ -14,8 +14,10 @@
 
 from __future__ import annotations
 
+import bisect
 import time
-from typing import TYPE_CHECKING, Annotated, Any, Literal, Union
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Annotated, Any, Literal, SupportsIndex, Union
 
 from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 from typing_extensions import TypeAlias
@@ -150,13 +152,148 @@ ChatItem = Annotated[
 ]
 
 
+class _IndexedItems(list[ChatItem]):
+    """The items of a ChatContext with an id -> index map and a created_at index of the messages.
+
+    Both indexes are built lazily. Appending items updates them in place, any other mutation of
+    the list drops them until the next lookup. Mutating the id or the created_at of an item
+    already inside the list isn't tracked.
+    """
+
+    def __init__(self, items: Iterable[ChatItem] = ()) -> None:
+        super().__init__(items)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._id_to_index: dict[str, int] | None = None
+        # created_at and position of the messages, only kept while sorted by created_at
+        self._msg_created_at: list[float] | None = None
+        self._msg_positions: list[int] | None = None
+        self._msg_sorted = True
+
+    def _index_appended(self, start: int) -> None:
+        for i in range(start, len(self)):
+            item = self[i]
+            if self._id_to_index is not None:
+                self._id_to_index.setdefault(item.id, i)
+
+            if self._msg_created_at is not None and item.type == "message":
+                assert self._msg_positions is not None
+                if self._msg_created_at and item.created_at < self._msg_created_at[-1]:
+                    self._msg_created_at = self._msg_positions = None
+                    self._msg_sorted = False
+                else:
+                    self._msg_created_at.append(item.created_at)
+                    self._msg_positions.append(i)
+
+    def id_to_index(self) -> dict[str, int]:
+        if self._id_to_index is None:
+            index: dict[str, int] = {}
+            for i, item in enumerate(self):
+                index.setdefault(item.id, i)  # the first item wins, like a linear scan
+
+            self._id_to_index = index
+
+        return self._id_to_index
+
+    def created_at_index(self) -> tuple[list[float], list[int]] | None:
+        """Returns None when the messages aren't sorted by created_at"""
+        if self._msg_created_at is None and self._msg_sorted:
+            created_at: list[float] = []
+            positions: list[int] = []
+            for i, item in enumerate(self):
+                if item.type != "message":
+                    continue
+
+                if created_at and item.created_at < created_at[-1]:
+                    self._msg_sorted = False
+                    return None
+
+                created_at.append(item.created_at)
+                positions.append(i)
+
+            self._msg_created_at, self._msg_positions = created_at, positions
+
+        if self._msg_created_at is None or self._msg_positions is None:
+            return None
+
+        return self._msg_created_at, self._msg_positions
+
+    def copy(self) -> _IndexedItems:
+        items = _IndexedItems(self)
+        if self._id_to_index is not None:
+            items._id_to_index = self._id_to_index.copy()
+        if self._msg_created_at is not None and self._msg_positions is not None:
+            items._msg_created_at = self._msg_created_at.copy()
+            items._msg_positions = self._msg_positions.copy()
+        items._msg_sorted = self._msg_sorted
+        return items
+
+    def append(self, item: ChatItem) -> None:
+        super().append(item)
+        self._index_appended(len(self) - 1)
+
+    def extend(self, items: Iterable[ChatItem]) -> None:
+        start = len(self)
+        super().extend(items)
+        self._index_appended(start)
+
+    def __iadd__(self, items: Iterable[ChatItem]) -> _IndexedItems:  # type: ignore[override,misc]
+        self.extend(items)
+        return self
+
+    def insert(self, index: SupportsIndex, item: ChatItem) -> None:
+        if index >= len(self):  # type: ignore[operator]
+            self.append(item)
+            return
+
+        super().insert(index, item)
+        self._invalidate()
+
+    # any other mutation drops the indexes, they're rebuilt on the next lookup
+    def pop(self, index: SupportsIndex = -1) -> ChatItem:
+        item: ChatItem = super().pop(index)
+        self._invalidate()
+        return item
+
+    def remove(self, item: ChatItem) -> None:
+        super().remove(item)
+        self._invalidate()
+
+    def clear(self) -> None:
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._invalidate()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._invalidate()
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._invalidate()
+
+    def __imul__(self, n: SupportsIndex) -> _IndexedItems:
+        super().__imul__(n)
+        self._invalidate()
+        return self
+
+
 class ChatContext:
     def __init__(self, items: NotGivenOr[list[ChatItem]] = NOT_GIVEN):
-        self._items: list[ChatItem] = items if is_given(items) else []
+        # a plain list passed by the caller is used as-is (and is not indexed)
+        self._items: list[ChatItem] = items if is_given(items) else _IndexedItems()
 
     @classmethod
     def empty(cls) -> ChatContext:
-        return cls([])
+        return cls(_IndexedItems())
 
     @property
     def items(self) -> list[ChatItem]:
@@ -192,9 +329,13 @@ class ChatContext:
         return message
 
     def get_by_id(self, item_id: str) -> ChatItem | None:
-        return next((item for item in self.items if item.id == item_id), None)
+        idx = self.index_by_id(item_id)
+        return self._items[idx] if idx is not None else None
 
     def index_by_id(self, item_id: str) -> int | None:
+        if isinstance(self._items, _IndexedItems):
+            return self._items.id_to_index().get(item_id)
+
         return next((i for i, item in enumerate(self.items) if item.id == item_id), None)
 
     def copy(
@@ -204,7 +345,14 @@ class ChatContext:
         exclude_instructions: bool = False,
         tools: NotGivenOr[list[FunctionTool | RawFunctionTool | str | Any]] = NOT_GIVEN,
     ) -> ChatContext:
-        items = []
+        if not exclude_function_call and not exclude_instructions and not is_given(tools):
+            # nothing to filter, the indexes are copied along with the items
+            if isinstance(self._items, _IndexedItems):
+                return ChatContext(self._items.copy())
+
+            return ChatContext(_IndexedItems(self._items))
+
+        items = _IndexedItems()
 
         from .tool_context import (
             get_function_info,
@@ -319,9 +467,16 @@ class ChatContext:
         """
         Returns the index to insert an item by creation time.
 
-        Iterates in reverse, assuming items are sorted by `created_at`.
+        Assumes items are sorted by `created_at`.
         Finds the position after the last item with `created_at <=` the given timestamp.
         """
+        if isinstance(self._items, _IndexedItems):
+            index = self._items.created_at_index()
+            if index is not None:
+                msg_created_at, msg_positions = index
+                k = bisect.bisect_right(msg_created_at, created_at)
+                return msg_positions[k - 1] + 1 if k > 0 else 0
+
         for i in reversed(range(len(self._items))):
             item = self._items[i]
             if item.type == "message" and item.created_at <= created_at:
@@ -333,7 +488,7 @@ class ChatContext:
     def from_dict(cls, data: dict) -> ChatContext:
         item_adapter = TypeAdapter(list[ChatItem])
         items = item_adapter.validate_python(data["items"])
-        return cls(items)
+        return cls(_IndexedItems(items))
 
     @property
     def readonly(self) -> bool:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-from .chat_context import ChatContext, ChatItem
+from .chat_context import ChatContext, ChatItem, _IndexedItems
 
 __all__ = ["RemoteChatContext"]
 
@@ -21,7 +21,7 @@ class RemoteChatContext:
         self._id_to_item: dict[str, _RemoteChatItem] = {}
 
     def to_chat_ctx(self) -> ChatContext:
-        items: list[ChatItem] = []
+        items = _IndexedItems()
         current_node = self._head
         while current_node is not None:
             items.append(current_node.item)
@@ -16,8 +16,9 @@ from __future__ import annotations
 
 import inspect
 from collections.abc import Awaitable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     Literal,
@@ -31,6 +32,9 @@ from typing import (
 
 from typing_extensions import NotRequired, Required, TypedDict, TypeGuard
 
+if TYPE_CHECKING:
+    from .utils import _CompiledFunctionTool
+
 
 # Used by ToolChoice
 class Function(TypedDict, total=False):
@@ -79,6 +83,8 @@ class StopResponse(Exception):
 class _FunctionToolInfo:
     name: str
     description: str | None
+    _compiled: _CompiledFunctionTool | None = field(default=None, repr=False, compare=False)
+    """built on first use by llm.utils, the tool is never inspected again"""
 
 
 @runtime_checkable
@@ -108,6 +114,7 @@ class RawFunctionDescription(TypedDict):
 class _RawFunctionToolInfo:
     name: str
     raw_schema: dict
+    _compiled: _CompiledFunctionTool | None = field(default=None, repr=False, compare=False)
 
 
 @runtime_checkable
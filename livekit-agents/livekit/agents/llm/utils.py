@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import base64
+import bisect
+import dataclasses
 import inspect
+import weakref
 from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
     Annotated,
     Any,
     Callable,
+    Generic,
     Union,
     get_args,
     get_origin,
@@ -16,7 +20,7 @@ from typing import (
 
 from pydantic import BaseModel, TypeAdapter, create_model
 from pydantic.fields import Field, FieldInfo
-from pydantic_core import PydanticUndefined, from_json
+from pydantic_core import PydanticUndefined, from_json, to_json
 from typing_extensions import TypeVar
 
 from livekit import rtc
@@ -28,7 +32,10 @@ from .chat_context import ChatContext
 from .tool_context import (
     FunctionTool,
     RawFunctionTool,
+    _FunctionToolInfo,
+    _RawFunctionToolInfo,
     get_function_info,
+    get_raw_function_info,
     is_function_tool,
     is_raw_function_tool,
 )
@@ -39,34 +46,56 @@ if TYPE_CHECKING:
 
 def _compute_lcs(old_ids: list[str], new_ids: list[str]) -> list[str]:
     """
-    Standard dynamic-programming LCS to get the common subsequence
-    of IDs (in order) that appear in both old_ids and new_ids.
+    Longest common subsequence of IDs (in order) that appear in both old_ids and new_ids.
+
+    Chat contexts are mostly appended to, so the common prefix and suffix are matched directly
+    and only the middle is diffed. The ids of a ChatContext are unique: the LCS of the middle is
+    the longest increasing subsequence of the old positions of the new ids (patience diff).
+    When an id is duplicated, only its first occurrence in old_ids can be matched.
     """
     n, m = len(old_ids), len(new_ids)
-    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    prefix = 0
+    while prefix < min(n, m) and old_ids[prefix] == new_ids[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while suffix < min(n, m) - prefix and old_ids[n - 1 - suffix] == new_ids[m - 1 - suffix]:
+        suffix += 1
+
+    old_mid = old_ids[prefix : n - suffix]
+    new_mid = new_ids[prefix : m - suffix]
+
+    old_positions: dict[str, int] = {}
+    for i, id in enumerate(old_mid):
+        old_positions.setdefault(id, i)
+
+    # longest strictly increasing subsequence of the old positions, O(n log n)
+    tails: list[int] = []  # smallest old position ending an increasing run of each length
+    tails_idx: list[int] = []  # index in new_mid of the item at tails[i]
+    prev_idx = [-1] * len(new_mid)
+    for j, id in enumerate(new_mid):
+        pos = old_positions.get(id)
+        if pos is None:
+            continue
 
-    # Fill DP table
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            if old_ids[i - 1] == new_ids[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
-            else:
-                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
-
-    # Backtrack to find the actual LCS sequence
-    lcs_ids = []
-    i, j = n, m
-    while i > 0 and j > 0:
-        if old_ids[i - 1] == new_ids[j - 1]:
-            lcs_ids.append(old_ids[i - 1])
-            i -= 1
-            j -= 1
-        elif dp[i - 1][j] > dp[i][j - 1]:
-            i -= 1
+        k = bisect.bisect_left(tails, pos)
+        if k == len(tails):
+            tails.append(pos)
+            tails_idx.append(j)
         else:
-            j -= 1
+            tails[k] = pos
+            tails_idx[k] = j
 
-    return list(reversed(lcs_ids))
+        prev_idx[j] = tails_idx[k - 1] if k > 0 else -1
+
+    mid_lcs: list[str] = []
+    j = tails_idx[-1] if tails_idx else -1
+    while j != -1:
+        mid_lcs.append(new_mid[j])
+        j = prev_idx[j]
+
+    mid_lcs.reverse()
+    return old_ids[:prefix] + mid_lcs + old_ids[n - suffix :]
 
 
 @dataclass
@@ -75,22 +104,31 @@ class DiffOps:
     to_create: list[
         tuple[str | None, str]
     ]  # (previous_item_id, id), if previous_item_id is None, add to the root
+    # (previous_item_id, id) of the items kept in both contexts but with a different content
+    to_update: list[tuple[str | None, str]] = dataclasses.field(default_factory=list)
 
 
 def compute_chat_ctx_diff(old_ctx: ChatContext, new_ctx: ChatContext) -> DiffOps:
-    """Computes the minimal list of create/remove operations to transform old_ctx into new_ctx."""
-    # TODO(theomonnom): Make ChatMessage hashable and also add update ops
+    """Computes the minimal list of create/remove operations to transform old_ctx into new_ctx.
 
+    Items kept in both contexts but whose content changed are returned in `to_update`.
+    """
     old_ids = [m.id for m in old_ctx.items]
     new_ids = [m.id for m in new_ctx.items]
     lcs_ids = set(_compute_lcs(old_ids, new_ids))
 
     to_remove = [msg.id for msg in old_ctx.items if msg.id not in lcs_ids]
     to_create: list[tuple[str | None, str]] = []
+    to_update: list[tuple[str | None, str]] = []
 
+    old_items = {item.id: item for item in old_ctx.items}
     last_id_in_sequence: str | None = None
     for new_msg in new_ctx.items:
         if new_msg.id in lcs_ids:
+            old_msg = old_items[new_msg.id]
+            if old_msg is not new_msg and old_msg != new_msg:
+                to_update.append((last_id_in_sequence, new_msg.id))
+
             last_id_in_sequence = new_msg.id
         else:
             if last_id_in_sequence is None:
@@ -101,7 +139,7 @@ def compute_chat_ctx_diff(old_ctx: ChatContext, new_ctx: ChatContext) -> DiffOps
             to_create.append((prev_id, new_msg.id))
             last_id_in_sequence = new_msg.id
 
-    return DiffOps(to_remove=to_remove, to_create=to_create)
+    return DiffOps(to_remove=to_remove, to_create=to_create, to_update=to_update)
 
 
 def is_context_type(ty: type) -> bool:
@@ -171,14 +209,151 @@ def serialize_image(image: llm.ImageContent) -> SerializedImage:
     raise ValueError("Unsupported image type")
 
 
+_ConvertedT = TypeVar("_ConvertedT")
+_ConvertibleT = TypeVar("_ConvertibleT", bound="llm.ChatItem | llm.ImageContent")
+
+
+def _conversion_fingerprint(item: llm.ChatItem | llm.ImageContent) -> tuple[Any, ...]:
+    """The fields a provider conversion depends on, must not reference the item itself"""
+    if item.type == "message":
+        return (
+            item.role,
+            *(
+                _conversion_fingerprint(c) if isinstance(c, llm.ImageContent) else c
+                for c in item.content
+            ),
+        )
+    elif item.type == "function_call":
+        return (item.call_id, item.name, item.arguments)
+    elif item.type == "function_call_output":
+        return (item.call_id, item.name, item.output, item.is_error)
+    elif item.type == "image_content":
+        return (
+            item.image,
+            item.inference_width,
+            item.inference_height,
+            item.inference_detail,
+            item.mime_type,
+        )
+
+    raise ValueError(f"unsupported item type {item.type}")
+
+
+class ConversionCache(Generic[_ConvertedT]):
+    """Memoizes the conversion of chat items (or image contents) to a provider format.
+
+    A cached conversion is reused as long as the item wasn't modified and is dropped when the
+    item is garbage collected. Cached values are shared between calls and must not be mutated.
+    LLM plugins usually keep one module level cache for each kind of conversion.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref[Any], tuple[Any, ...], _ConvertedT]] = {}
+
+    def get(
+        self, item: _ConvertibleT, convert: Callable[[_ConvertibleT], _ConvertedT]
+    ) -> _ConvertedT:
+        key = id(item)
+        fingerprint = _conversion_fingerprint(item)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is item and entry[1] == fingerprint:
+            return entry[2]
+
+        value = convert(item)
+        self._entries[key] = (weakref.ref(item, self._evict_cb(key)), fingerprint, value)
+        return value
+
+    def _evict_cb(self, key: int) -> Callable[[weakref.ref[Any]], None]:
+        # don't keep the cache alive from the items
+        cache_ref = weakref.ref(self)
+
+        def _evict(ref: weakref.ref[Any]) -> None:
+            cache = cache_ref()
+            if cache is None:
+                return
+
+            entry = cache._entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del cache._entries[key]
+
+        return _evict
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class _CompiledFunctionTool:
+    """What is derived from the signature and the docstring of a tool, built once per tool and
+    cached on its _FunctionToolInfo/_RawFunctionToolInfo"""
+
+    signature: inspect.Signature
+    context_params: tuple[str, ...]
+    """parameters receiving the RunContext"""
+    model: type[BaseModel] | None = None
+    """arguments model of a FunctionTool, None for a RawFunctionTool"""
+    none_defaults: dict[str, Any] = dataclasses.field(default_factory=dict)
+    """parameters that can't be None -> value used when the LLM sends null
+    (inspect.Parameter.empty if the parameter is required)"""
+    _legacy_parameters: bytes | None = None
+    _strict_parameters: bytes | None = None
+
+    @property
+    def legacy_parameters(self) -> bytes:
+        """serialized JSON schema of the arguments"""
+        if self._legacy_parameters is None:
+            assert self.model is not None
+            self._legacy_parameters = to_json(self.model.model_json_schema())
+        return self._legacy_parameters
+
+    @property
+    def strict_parameters(self) -> bytes:
+        """serialized JSON schema of the arguments, in the OpenAI strict mode"""
+        if self._strict_parameters is None:
+            assert self.model is not None
+            self._strict_parameters = to_json(_strict.to_strict_json_schema(self.model))
+        return self._strict_parameters
+
+
+def _compile_function_tool(fnc: FunctionTool | RawFunctionTool) -> _CompiledFunctionTool:
+    info: _FunctionToolInfo | _RawFunctionToolInfo
+    if is_function_tool(fnc):
+        info = get_function_info(fnc)
+    elif is_raw_function_tool(fnc):
+        info = get_raw_function_info(fnc)
+    else:
+        raise ValueError(f"Unsupported function tool type: {type(fnc)}")
+
+    if info._compiled is not None:
+        return info._compiled
+
+    signature = inspect.signature(fnc)
+    type_hints = get_type_hints(fnc, include_extras=True)
+    context_params = tuple(
+        name for name in signature.parameters if is_context_type(type_hints[name])
+    )
+    compiled = _CompiledFunctionTool(signature=signature, context_params=context_params)
+
+    if is_function_tool(fnc):
+        compiled.model = _build_pydantic_model(fnc, signature=signature, type_hints=type_hints)
+        compiled.none_defaults = {
+            name: param.default
+            for name, param in signature.parameters.items()
+            if name not in context_params and not _is_optional_type(type_hints[name])
+        }
+
+    info._compiled = compiled
+    return compiled
+
+
 def build_legacy_openai_schema(
     function_tool: FunctionTool, *, internally_tagged: bool = False
 ) -> dict[str, Any]:
     """non-strict mode tool description
     see https://serde.rs/enum-representations.html for the internally tagged representation"""
-    model = function_arguments_to_pydantic_model(function_tool)
     info = get_function_info(function_tool)
-    schema = model.model_json_schema()
+    # parsing the cached JSON gives a new dict, the callers are free to modify it
+    schema = from_json(_compile_function_tool(function_tool).legacy_parameters)
 
     if internally_tagged:
         return {
@@ -202,9 +377,8 @@ def build_strict_openai_schema(
     function_tool: FunctionTool,
 ) -> dict[str, Any]:
     """strict mode tool description"""
-    model = function_arguments_to_pydantic_model(function_tool)
     info = get_function_info(function_tool)
-    schema = _strict.to_strict_json_schema(model)
+    schema = from_json(_compile_function_tool(function_tool).strict_parameters)
 
     return {
         "type": "function",
@@ -273,9 +447,22 @@ def to_openai_response_format(response_format: type | dict) -> dict:
     }
 
 
-def function_arguments_to_pydantic_model(func: Callable) -> type[BaseModel]:
+def function_arguments_to_pydantic_model(func: Callable[..., Any]) -> type[BaseModel]:
     """Create a Pydantic model from a function’s signature. (excluding context types)"""
+    if is_function_tool(func):
+        model = _compile_function_tool(func).model
+        assert model is not None
+        return model
+
+    return _build_pydantic_model(func)
 
+
+def _build_pydantic_model(
+    func: Callable[..., Any],
+    *,
+    signature: inspect.Signature | None = None,
+    type_hints: dict[str, Any] | None = None,
+) -> type[BaseModel]:
     from docstring_parser import parse_from_object
 
     fnc_name = func.__name__.split("_")
@@ -285,8 +472,10 @@ def function_arguments_to_pydantic_model(func: Callable) -> type[BaseModel]:
     docstring = parse_from_object(func)
     param_docs = {p.arg_name: p.description for p in docstring.params}
 
-    signature = inspect.signature(func)
-    type_hints = get_type_hints(func, include_extras=True)
+    if signature is None:
+        signature = inspect.signature(func)
+    if type_hints is None:
+        type_hints = get_type_hints(func, include_extras=True)
 
     # field_name -> (type, FieldInfo or default)
     fields: dict[str, Any] = {}
@@ -330,31 +519,28 @@ def prepare_function_arguments(
     the raw function output from the LLM.
     """
 
-    signature = inspect.signature(fnc)
-    type_hints = get_type_hints(fnc, include_extras=True)
+    compiled = _compile_function_tool(fnc)
     args_dict = from_json(json_arguments)
 
     if is_function_tool(fnc):
-        model_type = function_arguments_to_pydantic_model(fnc)
+        assert compiled.model is not None
 
         # Function arguments with default values are treated as optional
         # when converted to strict LLM function descriptions. (e.g., we convert default
         # parameters to type: ["string", "null"]).
         # The following make sure to use the default value when we receive None.
         # (Only if the type can't be Optional)
-        for param_name, param in signature.parameters.items():
-            type_hint = type_hints[param_name]
+        for param_name, default in compiled.none_defaults.items():
             if param_name in args_dict and args_dict[param_name] is None:
-                if not _is_optional_type(type_hint):
-                    if param.default is not inspect.Parameter.empty:
-                        args_dict[param_name] = param.default
-                    else:
-                        raise ValueError(
-                            f"Received None for required parameter '{param_name} ;"
-                            "this argument cannot be None and no default is available."
-                        )
-
-        model = model_type.model_validate(args_dict)  # can raise ValidationError
+                if default is not inspect.Parameter.empty:
+                    args_dict[param_name] = default
+                else:
+                    raise ValueError(
+                        f"Received None for required parameter '{param_name} ;"
+                        "this argument cannot be None and no default is available."
+                    )
+
+        model = compiled.model.model_validate(args_dict)  # can raise ValidationError
         raw_fields = _shallow_model_dump(model)
     elif is_raw_function_tool(fnc):
         # e.g async def open_gate(self, raw_arguments: dict[str, object]):
@@ -367,12 +553,10 @@ def prepare_function_arguments(
 
     # inject RunContext if needed
     context_dict = {}
-    for param_name, _ in signature.parameters.items():
-        type_hint = type_hints[param_name]
-        if is_context_type(type_hint) and call_ctx is not None:
-            context_dict[param_name] = call_ctx
+    if call_ctx is not None:
+        context_dict = dict.fromkeys(compiled.context_params, call_ctx)
 
-    bound = signature.bind(**{**raw_fields, **context_dict})
+    bound = compiled.signature.bind(**{**raw_fields, **context_dict})
     bound.apply_defaults()
     return bound.args, bound.kwargs
 
@@ -384,7 +568,7 @@ def _is_optional_type(hint: Any) -> bool:
 
 def _shallow_model_dump(model: BaseModel, *, by_alias: bool = False) -> dict[str, Any]:
     result = {}
-    for name, field in model.model_fields.items():
+    for name, field in type(model).model_fields.items():
         key = field.alias if by_alias and field.alias else name
         result[key] = getattr(model, name)
     return result
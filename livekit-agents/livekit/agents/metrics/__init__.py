@@ -2,6 +2,7 @@ from .base import (
     AgentMetrics,
     EOUMetrics,
     LLMMetrics,
+    SpeculativeGenerationMetrics,
     STTMetrics,
     TTSMetrics,
     VADMetrics,
@@ -14,6 +15,7 @@ __all__ = [
     "AgentMetrics",
     "VADMetrics",
     "EOUMetrics",
+    "SpeculativeGenerationMetrics",
     "STTMetrics",
     "TTSMetrics",
     "UsageSummary",
@@ -69,13 +69,41 @@ class EOUMetrics(BaseModel):
     on_user_turn_completed_delay: float
     """Time taken to invoke the user's `Agent.on_user_turn_completed` callback."""
 
+    turn_detector_cache_hits: int = 0
+    """Number of end of turn predictions of this turn that were answered from the cache of the
+    turn detector."""
+
+    turn_detector_cache_misses: int = 0
+    """Number of end of turn predictions of this turn that required running the model."""
+
     speech_id: str | None = None
 
 
+class SpeculativeGenerationMetrics(BaseModel):
+    type: Literal["speculative_generation_metrics"] = "speculative_generation_metrics"
+    timestamp: float
+    speech_id: str
+    committed: bool
+    """Whether the generation was used to reply to the user, it's discarded otherwise
+    (e.g. the user kept talking)."""
+
+    lead_time: float
+    """Time between the start of the generation and the end of the user turn (or the discard)."""
+
+    prompt_tokens: int
+    completion_tokens: int
+    """LLM tokens used by the generation, they are wasted when it's discarded."""
+    tokens_estimated: bool = False
+    """The LLM didn't report its usage, usually because the generation was cancelled before the
+    end of the stream. The tokens are estimated from the length of the prompt and of the text
+    generated so far (~4 characters per token)."""
+
+
 AgentMetrics = Union[
     STTMetrics,
     LLMMetrics,
     TTSMetrics,
     VADMetrics,
     EOUMetrics,
+    SpeculativeGenerationMetrics,
 ]
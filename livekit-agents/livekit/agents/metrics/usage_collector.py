@@ -1,7 +1,7 @@
 from copy import deepcopy
 from dataclasses import dataclass
 
-from .base import AgentMetrics, LLMMetrics, STTMetrics, TTSMetrics
+from .base import AgentMetrics, LLMMetrics, SpeculativeGenerationMetrics, STTMetrics, TTSMetrics
 
 
 @dataclass
@@ -11,6 +11,10 @@ class UsageSummary:
     llm_completion_tokens: int
     tts_characters_count: int
     stt_audio_duration: float
+    speculative_generations: int = 0
+    speculative_generations_committed: int = 0
+    llm_wasted_prompt_tokens: int = 0
+    llm_wasted_completion_tokens: int = 0
 
 
 class UsageCollector:
@@ -32,5 +36,13 @@ class UsageCollector:
         elif isinstance(metrics, STTMetrics):
             self._summary.stt_audio_duration += metrics.audio_duration
 
+        elif isinstance(metrics, SpeculativeGenerationMetrics):
+            self._summary.speculative_generations += 1
+            if metrics.committed:
+                self._summary.speculative_generations_committed += 1
+            else:
+                self._summary.llm_wasted_prompt_tokens += metrics.prompt_tokens
+                self._summary.llm_wasted_completion_tokens += metrics.completion_tokens
+
     def get_summary(self) -> UsageSummary:
         return deepcopy(self._summary)
@@ -3,7 +3,14 @@ from __future__ import annotations
 import logging
 
 from ..log import logger as default_logger
-from .base import AgentMetrics, EOUMetrics, LLMMetrics, STTMetrics, TTSMetrics
+from .base import (
+    AgentMetrics,
+    EOUMetrics,
+    LLMMetrics,
+    SpeculativeGenerationMetrics,
+    STTMetrics,
+    TTSMetrics,
+)
 
 
 def log_metrics(metrics: AgentMetrics, *, logger: logging.Logger | None = None):
@@ -24,3 +31,7 @@ def log_metrics(metrics: AgentMetrics, *, logger: logging.Logger | None = None):
         )
     elif isinstance(metrics, STTMetrics):
         logger.info(f"STT metrics: audio_duration={metrics.audio_duration:.2f}")
+    elif isinstance(metrics, SpeculativeGenerationMetrics):
+        logger.info(
+            f"Speculative generation metrics: committed={metrics.committed}, lead_time={metrics.lead_time:.2f}, input_tokens={metrics.prompt_tokens}, output_tokens={metrics.completion_tokens}"  # noqa: E501
+        )
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import functools
 import re
+import threading
+
+# results of hyphenate_word kept by each Hyphenator, the same words come up in every conversation
+MAX_CACHED_WORDS = 4096
+
+_DIGITS = str.maketrans("", "", "0123456789")
 
 
 # Frank Liang hyphenator. impl from https://github.com/jfinkels/hyphenate
@@ -8,31 +15,54 @@ import re
 # Users that want different languages or more advanced hyphenation should use the livekit-plugins-*
 class Hyphenator:
     def __init__(self, patterns, exceptions=""):
-        self.tree = {}
-        for pattern in patterns.split():
-            self._insert_pattern(pattern)
+        # the patterns are compiled on first use instead of when the module is imported (by
+        # every job process), see _compile
+        self._patterns = patterns
+        self._exceptions_src = exceptions
+        self._compile_lock = threading.Lock()
+        self._table: dict[str, tuple[tuple[int, int], ...]] | None = None
+        self._exceptions: dict[str, list[int]] = {}
+        self._cached_hyphenate = functools.lru_cache(maxsize=MAX_CACHED_WORDS)(self._hyphenate)
+
+    def _ensure_compiled(self) -> dict[str, tuple[tuple[int, int], ...]]:
+        table = self._table
+        if table is None:
+            with self._compile_lock:
+                if self._table is None:
+                    self._compile()
+                table = self._table
+                assert table is not None
+        return table
+
+    def _compile(self) -> None:
+        # Flatten the pattern tree into a single table indexed by the chars of the pattern, e.g.
+        # 'a1bc3d4' is stored as 'abcd' with the non-zero points [(1, 1), (3, 3), (4, 4)].
+        # Every prefix of a pattern is in the table too (without points), so the lookups of the
+        # substrings starting at a position stop at the first one that can't match, like the
+        # walk of the tree.
+        table: dict[str, tuple[tuple[int, int], ...]] = {}
+        for pattern in self._patterns.split():
+            chars = pattern.translate(_DIGITS)
+            pattern_points = []
+            offset = 0
+            for c in pattern:
+                if c.isdigit():
+                    pattern_points.append((offset, int(c)))
+                else:
+                    offset += 1
+
+            for k in range(1, len(chars)):
+                table.setdefault(chars[:k], ())
+            table[chars] = tuple(pattern_points)
 
-        self.exceptions = {}
-        for ex in exceptions.split():
+        exceptions = {}
+        for ex in self._exceptions_src.split():
             # Convert the hyphenated pattern into a point array for use later.
             points = [0] + [int(h == "-") for h in re.split(r"[a-z]", ex)]
-            self.exceptions[ex.replace("-", "")] = points
+            exceptions[ex.replace("-", "")] = points
 
-    def _insert_pattern(self, pattern):
-        # Convert the a pattern like 'a1bc3d4' into a string of chars 'abcd'
-        # and a list of points [ 0, 1, 0, 3, 4 ].
-        chars = re.sub("[0-9]", "", pattern)
-        points = [int(d or 0) for d in re.split("[.a-z]", pattern)]
-
-        # Insert the pattern into the tree. Each character finds a dict
-        # another level down in the tree, and leaf nodes have the list of
-        # points.
-        t = self.tree
-        for c in chars:
-            if c not in t:
-                t[c] = {}
-            t = t[c]
-        t[None] = points
+        self._exceptions = exceptions
+        self._table = table
 
     def hyphenate_word(self, word: str) -> list[str]:
         """Given a word, returns a list of pieces, broken at the possible
@@ -41,23 +71,30 @@ class Hyphenator:
         # Short words aren't hyphenated.
         if len(word) <= 4:
             return [word]
+
+        # the cached pieces are shared, the callers get their own list
+        return list(self._cached_hyphenate(word))
+
+    def _hyphenate(self, word: str) -> tuple[str, ...]:
+        table = self._ensure_compiled()
+
         # If the word is an exception, get the stored points.
-        if word.lower() in self.exceptions:
-            points = self.exceptions[word.lower()]
+        if word.lower() in self._exceptions:
+            points = self._exceptions[word.lower()]
         else:
             work = "." + word.lower() + "."
-            points = [0] * (len(work) + 1)
-            for i in range(len(work)):
-                t = self.tree
-                for c in work[i:]:
-                    if c in t:
-                        t = t[c]
-                        if None in t:
-                            p = t[None]
-                            for j, p_j in enumerate(p):
-                                points[i + j] = max(points[i + j], p_j)
-                    else:
+            n = len(work)
+            points = [0] * (n + 1)
+            for i in range(n):
+                for j in range(i + 1, n + 1):
+                    pattern_points = table.get(work[i:j])
+                    if pattern_points is None:
                         break
+
+                    for offset, p in pattern_points:
+                        offset += i
+                        if p > points[offset]:
+                            points[offset] = p
             # No hyphens in the first two chars or the last two.
             points[1] = points[2] = points[-2] = points[-3] = 0
 
@@ -67,7 +104,7 @@ class Hyphenator:
             pieces[-1] += c
             if p % 2:
                 pieces.append("")
-        return pieces
+        return tuple(pieces)
 
 
 PATTERNS = (
@@ -1,5 +1,8 @@
 import re
 
+# split_sentences only ends a sentence on one of these characters
+BOUNDARY_PATTERN = r"[.?!\n]"
+
 
 # rule based segmentation based on https://stackoverflow.com/a/31505798, works surprisingly well
 def split_sentences(
@@ -2,6 +2,9 @@ import re
 
 from . import tokenizer
 
+# words are separated by whitespaces
+BOUNDARY_PATTERN = r"\s"
+
 
 def split_words(text: str, ignore_punctuation: bool = True) -> list[tuple[str, int, int]]:
     """
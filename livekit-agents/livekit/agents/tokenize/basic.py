@@ -66,6 +66,7 @@ class SentenceTokenizer(tokenizer.SentenceTokenizer):
             ),
             min_token_len=self._config.min_sentence_len,
             min_ctx_len=self._config.stream_context_len,
+            boundary_pattern=_basic_sent.BOUNDARY_PATTERN,
         )
 
 
@@ -86,6 +87,7 @@ class WordTokenizer(tokenizer.WordTokenizer):
             ),
             min_token_len=1,
             min_ctx_len=1,  # ignore
+            boundary_pattern=_basic_word.BOUNDARY_PATTERN,
         )
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 import typing
 from typing import Callable, Union
 
@@ -10,6 +11,10 @@ from .tokenizer import SentenceStream, TokenData, WordStream
 # If the start and end indices are not available, we attempt to locate the token within the text using str.find.  # noqa: E501
 TokenizeCallable = Callable[[str], Union[list[str], list[tuple[str, int, int]]]]
 
+# whether a boundary ends a token can depend on the text right after it (e.g. "3.5", "Dr. Smith",
+# "example.com"), a boundary followed by this many characters that didn't split the text won't
+BOUNDARY_CONTEXT = 16
+
 
 class BufferedTokenStream:
     def __init__(
@@ -19,35 +24,74 @@ class BufferedTokenStream:
         min_token_len: int,
         min_ctx_len: int,
         retain_format: bool = False,
+        boundary_pattern: str | None = None,
     ) -> None:
+        """
+        Args:
+            boundary_pattern: regex matching the characters that can end a token (e.g. sentence
+                punctuation). When set, the buffered text is only tokenized again once a match
+                was pushed, so long runs of text without any boundary (or with boundaries that
+                don't end a token, like "Dr.") aren't rescanned on every push_text.
+        """
         self._event_ch = aio.Chan[TokenData]()
         self._tokenize_fnc = tokenize_fnc
         self._min_ctx_len = min_ctx_len
         self._min_token_len = min_token_len
         self._retain_format = retain_format
+        self._boundary_re = re.compile(boundary_pattern) if boundary_pattern else None
         self._current_segment_id = shortuuid()
 
         self._buf_tokens: list[str] = []  # <= min_token_len
-        self._in_buf = ""
+        # the unsettled text (after the last emitted token), joined lazily
+        self._in_chunks: list[str] = []
+        self._in_len = 0
+        self._boundary_pending = False
         self._out_buf = ""
 
+    def _take_in_buf(self) -> str:
+        in_buf = "".join(self._in_chunks)
+        self._in_chunks = [in_buf] if in_buf else []
+        return in_buf
+
+    def _set_in_buf(self, in_buf: str) -> None:
+        self._in_chunks = [in_buf] if in_buf else []
+        self._in_len = len(in_buf)
+        self._boundary_pending = self._boundary_re is None or bool(self._boundary_re.search(in_buf))
+
     @typing.no_type_check
     def push_text(self, text: str) -> None:
         self._check_not_closed()
-        self._in_buf += text
+        if not text:
+            return
+
+        self._in_chunks.append(text)
+        self._in_len += len(text)
 
-        if len(self._in_buf) < self._min_ctx_len:
+        if not self._boundary_pending:
+            self._boundary_pending = self._boundary_re is None or bool(
+                self._boundary_re.search(text)
+            )
+
+        if self._in_len < self._min_ctx_len or not self._boundary_pending:
             return
 
-        while True:
-            tokens = self._tokenize_fnc(self._in_buf)
-            if len(tokens) <= 1:
-                break
+        in_buf = self._take_in_buf()
+        tokens = self._tokenize_fnc(in_buf)
+        if len(tokens) <= 1:
+            # the boundaries that didn't split the text are settled once they're followed by
+            # enough context, only a new boundary (or a recent one) requires tokenizing again
+            if self._boundary_re is not None:
+                self._boundary_pending = bool(
+                    self._boundary_re.search(in_buf, max(0, len(in_buf) - BOUNDARY_CONTEXT))
+                )
+            return
 
+        # every token except the last one is settled, the last one can still grow
+        cursor = 0
+        for tok in tokens[:-1]:
             if self._out_buf:
                 self._out_buf += " "
 
-            tok = tokens.pop(0)
             tok_text = tok
             if isinstance(tok, tuple):
                 tok_text = tok[0]
@@ -61,17 +105,24 @@ class BufferedTokenStream:
                 self._out_buf = ""
 
             if isinstance(tok, tuple):
-                self._in_buf = self._in_buf[tok[2] :]
+                cursor = tok[2]
             else:
-                tok_i = max(self._in_buf.find(tok), 0)
-                self._in_buf = self._in_buf[tok_i + len(tok) :].lstrip()
+                tok_i = in_buf.find(tok, cursor)
+                if tok_i < 0:
+                    tok_i = cursor
+                cursor = tok_i + len(tok)
+                while cursor < len(in_buf) and in_buf[cursor].isspace():
+                    cursor += 1
+
+        self._set_in_buf(in_buf[cursor:])
 
     @typing.no_type_check
     def flush(self) -> None:
         self._check_not_closed()
 
-        if self._in_buf or self._out_buf:
-            tokens = self._tokenize_fnc(self._in_buf)
+        in_buf = self._take_in_buf()
+        if in_buf or self._out_buf:
+            tokens = self._tokenize_fnc(in_buf)
             if tokens:
                 if self._out_buf:
                     self._out_buf += " "
@@ -88,7 +139,7 @@ class BufferedTokenStream:
 
             self._current_segment_id = shortuuid()
 
-        self._in_buf = ""
+        self._set_in_buf("")
         self._out_buf = ""
 
     def end_input(self) -> None:
@@ -117,11 +168,13 @@ class BufferedSentenceStream(BufferedTokenStream, SentenceStream):
         tokenizer: TokenizeCallable,
         min_token_len: int,
         min_ctx_len: int,
+        boundary_pattern: str | None = None,
     ) -> None:
         super().__init__(
             tokenize_fnc=tokenizer,
             min_token_len=min_token_len,
             min_ctx_len=min_ctx_len,
+            boundary_pattern=boundary_pattern,
         )
 
 
@@ -132,9 +185,11 @@ class BufferedWordStream(BufferedTokenStream, WordStream):
         tokenizer: TokenizeCallable,
         min_token_len: int,
         min_ctx_len: int,
+        boundary_pattern: str | None = None,
     ) -> None:
         super().__init__(
             tokenize_fnc=tokenizer,
             min_token_len=min_token_len,
             min_ctx_len=min_ctx_len,
+            boundary_pattern=boundary_pattern,
         )
@@ -4,6 +4,7 @@ from . import aio, audio, codecs, http_context, hw, images
 from .audio import AudioBuffer, combine_frames, merge_frames
 from .connection_pool import ConnectionPool
 from .exp_filter import ExpFilter
+from .histogram import Histogram
 from .log import log_exceptions
 from .misc import is_given, shortuuid, time_ms
 from .moving_average import MovingAverage
@@ -20,6 +21,7 @@ __all__ = [
     "http_context",
     "ExpFilter",
     "MovingAverage",
+    "Histogram",
     "EventEmitter",
     "log_exceptions",
     "codecs",
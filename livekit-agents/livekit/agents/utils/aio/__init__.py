@@ -1,8 +1,9 @@
-from . import debug, duplex_unix, itertools
+from . import debug, duplex_shm, duplex_unix, itertools
 from .channel import Chan, ChanClosed, ChanReceiver, ChanSender
 from .interval import Interval, interval
 from .sleep import Sleep, SleepFinished, sleep
 from .task_set import TaskSet
+from .timer_wheel import TimerWheel, TimerWheelHandle, shared_timer_wheel
 from .utils import cancel_and_wait, gracefully_cancel
 from .wait_group import WaitGroup
 
@@ -18,10 +19,14 @@ __all__ = [
     "SleepFinished",
     "sleep",
     "TaskSet",
+    "TimerWheel",
+    "TimerWheelHandle",
+    "shared_timer_wheel",
     "WaitGroup",
     "debug",
     "cancel_and_wait",
     "duplex_unix",
+    "duplex_shm",
     "itertools",
     "cancel_and_wait",
     "gracefully_cancel",
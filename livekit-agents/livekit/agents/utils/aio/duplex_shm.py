@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import io
+import struct
+from multiprocessing import shared_memory
+from typing import Callable, TypeVar, Union
+
+from .duplex_unix import DuplexClosed, _AsyncDuplex
+
+_T = TypeVar("_T")
+
+# capacity, write cursor (owned by the producer), read cursor (owned by the consumer)
+_HEADER = struct.Struct("=QQQ")
+_CAPACITY_OFFSET = 0
+_WRITE_OFFSET = 8
+_READ_OFFSET = 16
+
+_FRAME_RING = 0  # payload is inside the shared ring
+_FRAME_INLINE = 1  # payload follows on the socket (small payload, or the ring is full)
+_RING_FRAME = struct.Struct("!BI")
+_INLINE_FRAME = bytes((_FRAME_INLINE,))
+
+# below this size, copying through the socket is as cheap as going through the ring
+MIN_RING_PAYLOAD = 32 * 1024
+
+
+class _RingWriter:
+    """Serializes a payload into the free space of the ring. The beginning of the payload is
+    buffered until it reaches MIN_RING_PAYLOAD, the rest is written straight into the ring.
+    Nothing is visible to the consumer until the ring commits it. Once the free space is
+    exhausted, the rest of the payload is ignored and `overflow` is set."""
+
+    def __init__(self, ring: _ShmRing) -> None:
+        self._ring = ring
+        self._data = ring._data
+        self._start = 0
+        self._free = 0
+        self.head = bytearray()
+        """the payload while it's smaller than MIN_RING_PAYLOAD"""
+        self.size = 0
+        self.in_ring = False
+        self.overflow = False
+
+    def write(self, data: bytes | bytearray | memoryview, /) -> int:
+        if isinstance(data, memoryview):
+            data = data.cast("B")
+
+        size = len(data)
+        if not self.in_ring and self.size + size < MIN_RING_PAYLOAD:
+            self.head += data
+            self.size += size
+            return size
+
+        if not self.in_ring:
+            self.in_ring = True
+            self._start, self._free = self._ring._free_space()
+            head, self.head = self.head, bytearray()
+            self.size = 0
+            self._copy(head)
+
+        self._copy(data)
+        return size
+
+    def _copy(self, data: bytes | bytearray | memoryview) -> None:
+        size = len(data)
+        if self.overflow or self.size + size > self._free:
+            self.overflow = True
+            return
+
+        capacity = len(self._data)
+        pos = (self._start + self.size) % capacity
+        first = min(size, capacity - pos)
+        self._data[pos : pos + first] = data[:first]
+        if first < size:
+            self._data[: size - first] = data[first:]
+
+        self.size += size
+
+
+class _RingReader:
+    """Reads a payload in place from the ring, only the requested fields are copied out"""
+
+    def __init__(self, data: memoryview, start: int, size: int) -> None:
+        self._data = data
+        self._start = start
+        self._size = size
+        self._offset = 0
+
+    def read(self, size: int | None = -1, /) -> bytes:
+        remaining = self._size - self._offset
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+
+        capacity = len(self._data)
+        pos = (self._start + self._offset) % capacity
+        self._offset += size
+        if pos + size <= capacity:
+            return bytes(self._data[pos : pos + size])
+
+        return b"".join((self._data[pos:], self._data[: size - (capacity - pos)]))
+
+
+_Writer = Union[io.BytesIO, _RingWriter]
+_Reader = Union[io.BytesIO, _RingReader]
+
+
+class _ShmRing:
+    """Single-producer/single-consumer byte ring stored inside a SharedMemory segment.
+
+    The cursors are monotonically increasing byte counters, the ring itself doesn't store
+    any framing. The length of each payload is sent alongside the wakeup notification."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, *, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        self._closed = False
+        assert shm.buf is not None  # only None once the segment is closed
+        self._buf: memoryview = shm.buf
+        capacity: int = struct.unpack_from("=Q", self._buf, _CAPACITY_OFFSET)[0]
+        self._capacity = capacity
+        self._data = self._buf[_HEADER.size : _HEADER.size + capacity]
+
+    @staticmethod
+    def create(capacity: int) -> _ShmRing:
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity)
+        assert shm.buf is not None
+        _HEADER.pack_into(shm.buf, 0, capacity, 0, 0)
+        return _ShmRing(shm, owner=True)
+
+    @staticmethod
+    def attach(name: str) -> _ShmRing:
+        return _ShmRing(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _cursor(self, offset: int) -> int:
+        if self._closed:
+            raise DuplexClosed()
+
+        cursor: int = struct.unpack_from("=Q", self._buf, offset)[0]
+        return cursor
+
+    def writer(self) -> _RingWriter:
+        """A writer over the free space of the ring, published by `commit`"""
+        if self._closed:
+            raise DuplexClosed()
+
+        return _RingWriter(self)
+
+    def _free_space(self) -> tuple[int, int]:
+        """(position, size) of the free space"""
+        write_pos = self._cursor(_WRITE_OFFSET)
+        return write_pos % self._capacity, self._capacity - (write_pos - self._cursor(_READ_OFFSET))
+
+    def commit(self, writer: _RingWriter) -> None:
+        assert writer.in_ring and not writer.overflow
+        struct.pack_into("=Q", self._buf, _WRITE_OFFSET, self._cursor(_WRITE_OFFSET) + writer.size)
+
+    def reader(self, size: int) -> _RingReader:
+        """A reader over the next `size` bytes of the ring, they're released by `release`"""
+        return _RingReader(self._data, self._cursor(_READ_OFFSET) % self._capacity, size)
+
+    def release(self, size: int) -> None:
+        struct.pack_into("=Q", self._buf, _READ_OFFSET, self._cursor(_READ_OFFSET) + size)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        self._data.release()
+        self._buf.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class _AsyncShmDuplex:
+    """Same interface as _AsyncDuplex, payloads are moved through shared memory rings and the
+    unix socket is only used to notify the other end (and as a fallback when a ring is full).
+
+    With send_with/recv_with, the messages are serialized into the ring and deserialized from
+    it in place, without an intermediate copy of the payload."""
+
+    def __init__(self, duplex: _AsyncDuplex, *, tx: _ShmRing, rx: _ShmRing) -> None:
+        self._duplex = duplex
+        self._tx = tx
+        self._rx = rx
+
+    async def recv_with(self, deserialize: Callable[[_Reader], _T]) -> _T:
+        frame = await self._duplex.recv_bytes()
+        if not frame:
+            raise DuplexClosed()
+
+        if frame[0] == _FRAME_RING:
+            _, size = _RING_FRAME.unpack_from(frame)
+            try:
+                return deserialize(self._rx.reader(size))
+            finally:
+                self._rx.release(size)
+
+        # BytesIO shares the buffer of the frame until it's modified
+        b = io.BytesIO(frame)
+        b.seek(1)
+        return deserialize(b)
+
+    async def send_with(self, serialize: Callable[[_Writer], object]) -> None:
+        # the ring write and the notification are queued without yielding to the event loop,
+        # so concurrent senders can't reorder payloads
+        writer = self._tx.writer()
+        serialize(writer)
+        if not writer.in_ring:
+            await self._duplex.send_bytes(writer.head, prefix=_INLINE_FRAME)
+            return
+
+        if not writer.overflow:
+            self._tx.commit(writer)
+            await self._duplex.send_bytes(_RING_FRAME.pack(_FRAME_RING, writer.size))
+            return
+
+        # the payload is larger than the free space of the ring
+        b = io.BytesIO()
+        serialize(b)
+        await self._duplex.send_bytes(b.getbuffer(), prefix=_INLINE_FRAME)
+
+    async def recv_bytes(self) -> bytes:
+        return await self.recv_with(lambda b: b.read())
+
+    async def send_bytes(self, data: bytes | bytearray | memoryview) -> None:
+        await self.send_with(lambda b: b.write(data))
+
+    async def aclose(self) -> None:
+        try:
+            await self._duplex.aclose()
+        finally:
+            self._tx.close()
+            self._rx.close()
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import socket
 import struct
+from typing import Callable, TypeVar
+
+_T = TypeVar("_T")
 
 
 class DuplexClosed(Exception):
@@ -42,15 +46,27 @@ class _AsyncDuplex:
         ) as e:
             raise DuplexClosed() from e
 
-    async def send_bytes(self, data: bytes) -> None:
+    async def send_bytes(
+        self, data: bytes | bytearray | memoryview, *, prefix: bytes = b""
+    ) -> None:
+        """`prefix` is sent in front of `data` as part of the same message, without copying
+        `data` to concatenate them"""
         try:
-            len_bytes = struct.pack("!I", len(data))
-            self._writer.write(len_bytes)
+            self._writer.write(struct.pack("!I", len(prefix) + len(data)) + prefix)
             self._writer.write(data)
             await self._writer.drain()
         except OSError as e:
             raise DuplexClosed() from e
 
+    async def recv_with(self, deserialize: Callable[[io.BytesIO], _T]) -> _T:
+        # BytesIO shares the buffer of the received bytes until it's modified
+        return deserialize(io.BytesIO(await self.recv_bytes()))
+
+    async def send_with(self, serialize: Callable[[io.BytesIO], object]) -> None:
+        b = io.BytesIO()
+        serialize(b)
+        await self.send_bytes(b.getbuffer())
+
     async def aclose(self) -> None:
         try:
             self._writer.close()
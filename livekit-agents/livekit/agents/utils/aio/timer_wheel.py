@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import weakref
+from typing import Any, Callable
+
+from ...log import logger
+
+DEFAULT_TICK = 0.05
+DEFAULT_SLOTS = 64
+
+
+class TimerWheelHandle:
+    __slots__ = ("_when", "_tick", "_callback", "_args", "_cancelled", "_wheel")
+
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        when: float,
+        tick: int,
+        callback: Callable[..., Any],
+        args: tuple[Any, ...],
+    ) -> None:
+        self._wheel = wheel
+        self._when = when
+        self._tick = tick
+        self._callback = callback
+        self._args = args
+        self._cancelled = False
+
+    def when(self) -> float:
+        return self._when
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        if self._cancelled:
+            return
+
+        self._cancelled = True
+        self._wheel._on_cancelled()
+
+
+class TimerWheel:
+    """Schedules callbacks like loop.call_at, with the deadlines rounded up to the next tick.
+
+    All the callbacks due on the same tick are run by a single wakeup of the event loop, instead
+    of one timer per callback, and the wheel doesn't wake up the loop while it's empty. Meant for
+    the frequent timers of many concurrent sessions where a tick of latency doesn't matter (e.g.
+    the transcript synchronization), use `shared_timer_wheel` to share it on the event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        tick: float = DEFAULT_TICK,
+        slots: int = DEFAULT_SLOTS,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        if tick <= 0 or slots <= 0:
+            raise ValueError("tick and slots must be greater than zero")
+
+        self._loop = loop or asyncio.get_event_loop()
+        self._tick = tick
+        self._slots: list[list[TimerWheelHandle]] = [[] for _ in range(slots)]
+        self._origin = self._loop.time()
+        self._next_tick = 1  # the next tick to run, ticks are counted from the origin
+        self._active = 0
+        self._tick_handle: asyncio.TimerHandle | None = None
+        self._running = False
+
+    @property
+    def tick(self) -> float:
+        return self._tick
+
+    @property
+    def active_timers(self) -> int:
+        return self._active
+
+    def time(self) -> float:
+        """current time of the event loop, the clock used by call_at"""
+        return self._loop.time()
+
+    def call_later(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> TimerWheelHandle:
+        return self.call_at(self._loop.time() + delay, callback, *args)
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args: Any) -> TimerWheelHandle:
+        """Run the callback on the first tick at or after `when`, a deadline in the past is run
+        on the next tick"""
+        idle = self._tick_handle is None and not self._running
+        if idle:
+            # skip the ticks elapsed since the wheel became idle
+            elapsed = math.floor((self._loop.time() - self._origin) / self._tick)
+            self._next_tick = max(self._next_tick, elapsed + 1)
+
+        tick = max(math.ceil((when - self._origin) / self._tick), self._next_tick)
+        handle = TimerWheelHandle(self, when, tick, callback, args)
+        self._slots[tick % len(self._slots)].append(handle)
+        self._active += 1
+
+        if idle:
+            self._schedule_tick()
+
+        return handle
+
+    def _schedule_tick(self) -> None:
+        self._tick_handle = self._loop.call_at(
+            self._origin + self._next_tick * self._tick, self._on_tick
+        )
+
+    def _on_cancelled(self) -> None:
+        self._active -= 1
+        if self._active == 0 and self._tick_handle is not None and not self._running:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+
+    def _on_tick(self) -> None:
+        self._tick_handle = None
+        self._running = True
+        try:
+            # catch up with the ticks missed if the loop was busy (the loop can also run the
+            # scheduled tick slightly early, within its clock resolution)
+            last_tick = max(
+                math.floor((self._loop.time() - self._origin) / self._tick), self._next_tick
+            )
+            while self._next_tick <= last_tick and self._active > 0:
+                tick = self._next_tick
+                self._next_tick += 1  # the timers added by the callbacks go to the next ticks
+                self._run_slot(tick)
+        finally:
+            self._running = False
+
+        if self._active > 0:
+            self._next_tick = max(self._next_tick, last_tick + 1)
+            self._schedule_tick()
+
+    def _run_slot(self, tick: int) -> None:
+        slot = self._slots[tick % len(self._slots)]
+        if not slot:
+            return
+
+        due = [handle for handle in slot if handle._tick <= tick]
+        if not due:
+            return
+
+        slot[:] = [handle for handle in slot if handle._tick > tick]
+        for handle in due:
+            if handle._cancelled:
+                continue
+
+            handle._cancelled = True  # a fired handle can't be cancelled anymore
+            self._active -= 1
+            try:
+                handle._callback(*handle._args)
+            except Exception:
+                logger.exception("error running a timer of the timer wheel")
+
+
+_wheels_lock = threading.Lock()
+_wheels: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TimerWheel] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def shared_timer_wheel() -> TimerWheel:
+    """The TimerWheel shared by all the sessions running on the current event loop (a job
+    process, or a thread when the jobs are run by the THREAD executor)"""
+    loop = asyncio.get_event_loop()
+    with _wheels_lock:
+        wheel = _wheels.get(loop)
+        if wheel is None:
+            wheel = _wheels[loop] = TimerWheel(loop=loop)
+        return wheel
@@ -76,9 +76,14 @@ class AudioByteStream:
         if samples_per_channel is None:
             samples_per_channel = sample_rate // 10  # 100ms by default
 
+        self._samples_per_channel = samples_per_channel
         self._bytes_per_frame = num_channels * samples_per_channel * ctypes.sizeof(ctypes.c_int16)
         self._buf = bytearray()
 
+    @property
+    def bytes_per_frame(self) -> int:
+        return self._bytes_per_frame
+
     def push(self, data: bytes) -> list[rtc.AudioFrame]:
         """
         Add audio data to the buffer and retrieve fixed-size frames.
@@ -101,23 +106,46 @@ class AudioByteStream:
         self._buf.extend(data)
 
         frames = []
-        while len(self._buf) >= self._bytes_per_frame:
-            frame_data = self._buf[: self._bytes_per_frame]
-            self._buf = self._buf[self._bytes_per_frame :]
-
+        offset = 0
+        while len(self._buf) - offset >= self._bytes_per_frame:
             frames.append(
                 rtc.AudioFrame(
-                    data=frame_data,
+                    data=self._buf[offset : offset + self._bytes_per_frame],
                     sample_rate=self._sample_rate,
                     num_channels=self._num_channels,
-                    samples_per_channel=len(frame_data) // 2,
+                    samples_per_channel=self._samples_per_channel,
                 )
             )
+            offset += self._bytes_per_frame
 
+        # removing from the front of a bytearray doesn't move the remaining data
+        del self._buf[:offset]
         return frames
 
     write = push  # Alias for the push method.
 
+    def push_bulk(self, data: bytes) -> tuple[bytes, list[int]]:
+        """
+        Add audio data to the buffer and retrieve all the complete frames as a single buffer.
+
+        Parameters:
+            data (bytes): The incoming audio data to buffer.
+
+        Returns:
+            tuple[bytes, list[int]]: The data of the complete frames as one contiguous buffer,
+                and the byte offset of each frame inside it. Each frame is `bytes_per_frame` long.
+
+        This avoids creating an `AudioFrame` per chunk when the consumer only needs the raw
+        data (e.g. to forward it over a websocket), `memoryview(buf)[offset:offset +
+        bytes_per_frame]` gives a frame without copying it.
+        """
+        self._buf.extend(data)
+
+        size = len(self._buf) - len(self._buf) % self._bytes_per_frame
+        buf = bytes(self._buf[:size])
+        del self._buf[:size]
+        return buf, list(range(0, size, self._bytes_per_frame))
+
     def flush(self) -> list[rtc.AudioFrame]:
         """
         Flush the buffer and retrieve any remaining audio data as a frame.
@@ -137,18 +165,20 @@ class AudioByteStream:
         if len(self._buf) == 0:
             return []
 
-        if len(self._buf) % (2 * self._num_channels) != 0:
+        bytes_per_sample = self._num_channels * ctypes.sizeof(ctypes.c_int16)
+        if len(self._buf) % bytes_per_sample != 0:
             logger.warning("AudioByteStream: incomplete frame during flush, dropping")
+            self._buf.clear()
             return []
 
-        return [
-            rtc.AudioFrame(
-                data=self._buf,
-                sample_rate=self._sample_rate,
-                num_channels=self._num_channels,
-                samples_per_channel=len(self._buf) // 2,
-            )
-        ]
+        frame = rtc.AudioFrame(
+            data=bytes(self._buf),
+            sample_rate=self._sample_rate,
+            num_channels=self._num_channels,
+            samples_per_channel=len(self._buf) // bytes_per_sample,
+        )
+        self._buf.clear()
+        return [frame]
 
 
 async def audio_frames_from_file(
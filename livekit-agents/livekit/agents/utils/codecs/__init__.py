@@ -12,6 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .decoder import AudioStreamDecoder, StreamBuffer
+from .decoder import AudioStreamDecoder, DecoderStats, StreamBuffer
 
-__all__ = ["AudioStreamDecoder", "StreamBuffer"]
+__all__ = ["AudioStreamDecoder", "DecoderStats", "StreamBuffer"]
@@ -14,11 +14,14 @@
 
 import asyncio
 import contextlib
-import io
 import struct
+import sys
 import threading
-from collections.abc import AsyncIterator
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Generator
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Optional
 
 import av
@@ -33,45 +36,87 @@ class StreamBuffer:
     """
     A thread-safe buffer that behaves like an IO stream.
     Allows writing from one thread and reading from another.
+
+    Written chunks are queued as-is and consumed in place by the reader, so reads don't copy the
+    unread backlog. The lock is only taken when the reader has to wait for more data.
     """
 
     def __init__(self):
-        self._buffer = io.BytesIO()
-        self._lock = threading.Lock()
-        self._data_available = threading.Condition(self._lock)
+        self._chunks: deque[bytes] = deque()
+        self._offset = 0  # read position inside self._chunks[0]
+        self._data_available = threading.Condition()
+        self._waiting = False
         self._eof = False
+        self._closed = False
+        # each counter is only updated by one side
+        self._written_size = 0
+        self._read_size = 0
+
+    @property
+    def buffered_size(self) -> int:
+        """Number of bytes written but not read yet"""
+        return self._written_size - self._read_size
 
     def write(self, data: bytes):
         """Write data to the buffer from a writer thread."""
-        with self._data_available:
-            self._buffer.seek(0, io.SEEK_END)
-            self._buffer.write(data)
-            self._data_available.notify_all()
+        if self._closed:
+            raise ValueError("write to a closed StreamBuffer")
+
+        if not data:
+            return
+
+        self._chunks.append(bytes(data))
+        self._written_size += len(data)
+        if self._waiting:
+            with self._data_available:
+                self._data_available.notify_all()
 
     def read(self, size: int = -1) -> bytes:
         """Read data from the buffer in a reader thread."""
-
-        if self._buffer.closed:
+        if size == 0:
             return b""
 
-        with self._data_available:
-            while True:
-                if self._buffer.closed:
-                    return b""
-                # always read from beginning
-                self._buffer.seek(0)
-                data = self._buffer.read(size)
-
-                if data:
-                    # shrink the buffer to remove already-read data
-                    remaining = self._buffer.read()
-                    self._buffer = io.BytesIO(remaining)
-                    return data
-
-                if self._eof:
-                    return b""
+        while True:
+            if self._closed:
+                return b""
+
+            if self._chunks:
+                return self._read_chunks(size)
+
+            with self._data_available:
+                # the writer checks self._waiting after queuing its chunk, so the chunks must be
+                # checked again once the flag is set
+                self._waiting = True
+                try:
+                    if self._chunks or self._closed:
+                        continue
+
+                    if self._eof:
+                        return b""
+
+                    self._data_available.wait()
+                finally:
+                    self._waiting = False
+
+    def _read_chunks(self, size: int) -> bytes:
+        out: list[bytes] = []
+        remaining = size if size >= 0 else sys.maxsize
+        while remaining > 0 and self._chunks:
+            head = self._chunks[0]
+            available = len(head) - self._offset
+            if available <= remaining:
+                out.append(head[self._offset :] if self._offset else head)
+                self._chunks.popleft()
+                self._offset = 0
+                remaining -= available
+            else:
+                out.append(head[self._offset : self._offset + remaining])
+                self._offset += remaining
+                remaining = 0
 
-                self._data_available.wait()
+        data = out[0] if len(out) == 1 else b"".join(out)
+        self._read_size += len(data)
+        return data
 
     def end_input(self):
         """Signal that no more data will be written."""
@@ -80,7 +125,19 @@ class StreamBuffer:
             self._data_available.notify_all()
 
     def close(self):
-        self._buffer.close()
+        with self._data_available:
+            self._closed = True
+            self._data_available.notify_all()
+
+
+@dataclass
+class DecoderStats:
+    queued_input_bytes: int
+    """compressed bytes pushed but not read by the decoder yet"""
+    queued_duration: float
+    """duration of the decoded audio not consumed yet"""
+    decode_time: float
+    """total time spent decoding in the decoder threads"""
 
 
 class AudioStreamDecoder:
@@ -88,13 +145,24 @@ class AudioStreamDecoder:
 
     Decoders are stateful, and it should not be reused across multiple streams. Each decoder
     is designed to decode a single stream.
+
+    The wav decoders of the process share a bounded executor, a wav decoder only occupies a
+    thread while it has input to decode. ffmpeg reads its input synchronously while opening and
+    demuxing the stream, so each ffmpeg decoder runs on its own thread instead of blocking a
+    worker of the shared executor. Decoders stop decoding when more than
+    `max_buffered_duration` seconds of decoded audio are waiting to be consumed.
     """
 
     _max_workers: int = 10
     _executor: Optional[ThreadPoolExecutor] = None
 
     def __init__(
-        self, *, sample_rate: int = 48000, num_channels: int = 1, format: Optional[str] = None
+        self,
+        *,
+        sample_rate: int = 48000,
+        num_channels: int = 1,
+        format: Optional[str] = None,
+        max_buffered_duration: float = 10.0,
     ):
         self._sample_rate = sample_rate
         self._layout = "mono"
@@ -103,6 +171,7 @@ class AudioStreamDecoder:
         elif num_channels != 1:
             raise ValueError(f"Invalid number of channels: {num_channels}")
         self._format = format.lower() if format else None
+        self._max_buffered_duration = max_buffered_duration
 
         self._output_ch = aio.Chan[rtc.AudioFrame]()
         self._closed = False
@@ -110,28 +179,131 @@ class AudioStreamDecoder:
         self._input_buf = StreamBuffer()
         self._loop = asyncio.get_event_loop()
 
+        # the decode loop is a generator, advanced by _run_decode in the shared executor
+        self._decode_gen: Optional[Generator[None, None, None]] = None
+        self._decode_running = False
+        self._decode_done = False
+        self._decode_time = 0.0
+        # input bytes the decode loop needs before its next step, see _wait_input
+        self._min_input = 1
+
+        # decoded frames waiting to be sent to the output channel by the event loop
+        self._pending_frames: deque[rtc.AudioFrame] = deque()
+        self._flush_scheduled = False
+        # each counter is only updated by one side (decoder thread / event loop)
+        self._decoded_duration = 0.0
+        self._consumed_duration = 0.0
+
         if self.__class__._executor is None:
             # each decoder instance will submit jobs to the shared pool
             self.__class__._executor = ThreadPoolExecutor(max_workers=self.__class__._max_workers)
 
+    @property
+    def stats(self) -> DecoderStats:
+        return DecoderStats(
+            queued_input_bytes=self._input_buf.buffered_size,
+            queued_duration=max(0.0, self._decoded_duration - self._consumed_duration),
+            decode_time=self._decode_time,
+        )
+
     def push(self, chunk: bytes):
         self._input_buf.write(chunk)
         if not self._started:
             self._started = True
             # choose decode loop based on format
             if self._format == "wav":
-                target = self._decode_wav_loop
+                self._decode_gen = self._decode_wav_loop()
             else:
-                target = self._decode_loop
-            self._loop.run_in_executor(self.__class__._executor, target)
+                self._decode_gen = self._decode_loop()
+
+        self._schedule_decode()
 
     def end_input(self):
         self._input_buf.end_input()
         if not self._started:
             # if no data was pushed, close the output channel
             self._output_ch.close()
+        else:
+            self._schedule_decode()
+
+    def _can_decode(self, *, resume: bool = False) -> bool:
+        if self._closed:
+            return True
+
+        # backpressure, decoding is resumed once half of the buffered audio is consumed
+        max_buffered = self._max_buffered_duration / 2 if resume else self._max_buffered_duration
+        if self._decoded_duration - self._consumed_duration >= max_buffered:
+            return False
+
+        return self._input_buf.buffered_size >= self._min_input or self._input_buf._eof
+
+    def _wait_input(self, size: int) -> Generator[None, None, None]:
+        """Yield until `size` bytes can be read without blocking, the decode loop doesn't hold its
+        worker while waiting for the rest of a header"""
+        self._min_input = size
+        try:
+            while self._input_buf.buffered_size < size and not self._input_buf._eof:
+                yield
+        finally:
+            self._min_input = 1
+
+    def _schedule_decode(self) -> None:
+        if self._decode_gen is None or self._decode_running or self._decode_done:
+            return
 
-    def _decode_loop(self):
+        if not self._can_decode(resume=True):
+            return
+
+        self._decode_running = True
+        if self._format == "wav":
+            self._loop.run_in_executor(self.__class__._executor, self._run_decode)
+        else:
+            # ffmpeg can block reading the input in the middle of a step
+            threading.Thread(target=self._run_decode, name="audio_decoder", daemon=True).start()
+
+    def _run_decode(self) -> None:
+        """Advance the decode loop while it can make progress without waiting for the input"""
+        assert self._decode_gen is not None
+
+        try:
+            if self._closed:
+                # the output channel isn't closed by the generator if it never started
+                self._decode_gen.close()
+                self._decode_done = True
+                self._loop.call_soon_threadsafe(self._output_ch.close)
+                return
+
+            while self._can_decode():
+                started_at = time.perf_counter()
+                try:
+                    next(self._decode_gen)
+                finally:
+                    self._decode_time += time.perf_counter() - started_at
+        except StopIteration:
+            self._decode_done = True
+        finally:
+            self._loop.call_soon_threadsafe(self._on_decode_paused)
+
+    def _on_decode_paused(self) -> None:
+        self._decode_running = False
+        self._schedule_decode()
+
+    def _emit_frame(self, frame: rtc.AudioFrame) -> None:
+        """Called from the decoder thread, the frames decoded while the event loop is busy are
+        handed to it with a single callback"""
+        self._decoded_duration += frame.duration
+        self._pending_frames.append(frame)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_soon_threadsafe(self._flush_pending_frames)
+
+    def _flush_pending_frames(self) -> None:
+        # reset the flag before draining, frames queued after this point schedule a new flush
+        self._flush_scheduled = False
+        while self._pending_frames:
+            self._output_ch.send_nowait(self._pending_frames.popleft())
+
+    def _decode_loop(self) -> Generator[None, None, None]:
         container: av.container.InputContainer | None = None
         resampler: av.AudioResampler | None = None
         try:
@@ -163,16 +335,17 @@ class AudioStreamDecoder:
 
                 for resampled_frame in resampler.resample(frame):
                     nchannels = len(resampled_frame.layout.channels)
-                    self._loop.call_soon_threadsafe(
-                        self._output_ch.send_nowait,
+                    self._emit_frame(
                         rtc.AudioFrame(
                             data=resampled_frame.to_ndarray().tobytes(),
                             num_channels=nchannels,
                             sample_rate=int(resampled_frame.sample_rate),
                             samples_per_channel=int(resampled_frame.samples / nchannels),
-                        ),
+                        )
                     )
 
+                yield
+
         except Exception:
             logger.exception("error decoding audio")
         finally:
@@ -180,7 +353,7 @@ class AudioStreamDecoder:
             if container:
                 container.close()
 
-    def _decode_wav_loop(self):
+    def _decode_wav_loop(self) -> Generator[None, None, None]:
         """Decode wav data from the buffer without ffmpeg, parse header and emit PCM frames.
 
         This can be much faster than using ffmpeg, as we are emitting frames as quickly as possible.
@@ -190,17 +363,16 @@ class AudioStreamDecoder:
             from livekit.agents.utils.audio import AudioByteStream
 
             # parse RIFF header
-            header = b""
-            while len(header) < 12:
-                chunk = self._input_buf.read(12 - len(header))
-                if not chunk:
-                    raise ValueError("Invalid WAV file: incomplete header")
-                header += chunk
+            yield from self._wait_input(12)
+            header = self._input_buf.read(12)
+            if len(header) < 12:
+                raise ValueError("Invalid WAV file: incomplete header")
             if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
                 raise ValueError(f"Invalid WAV file: missing RIFF/WAVE: {header}")
 
             # parse fmt chunk
             while True:
+                yield from self._wait_input(8)
                 sub_header = self._input_buf.read(8)
                 if len(sub_header) < 8:
                     raise ValueError("Invalid WAV file: incomplete fmt chunk header")
@@ -208,6 +380,7 @@ class AudioStreamDecoder:
                 data = b""
                 remaining = chunk_size
                 while remaining > 0:
+                    yield from self._wait_input(min(1024, remaining))
                     part = self._input_buf.read(min(1024, remaining))
                     if not part:
                         raise ValueError("Invalid WAV file: incomplete fmt chunk data")
@@ -223,6 +396,7 @@ class AudioStreamDecoder:
 
             # parse data chunk
             while True:
+                yield from self._wait_input(8)
                 sub_header = self._input_buf.read(8)
                 if len(sub_header) < 8:
                     raise ValueError("Invalid WAV file: incomplete data chunk header")
@@ -233,6 +407,7 @@ class AudioStreamDecoder:
                 # skip chunk data
                 to_skip = chunk_size
                 while to_skip > 0:
+                    yield from self._wait_input(min(1024, to_skip))
                     skipped = self._input_buf.read(min(1024, to_skip))
                     if not skipped:
                         raise ValueError("Invalid WAV file: incomplete chunk while seeking data")
@@ -246,19 +421,19 @@ class AudioStreamDecoder:
 
             def resample_and_push(frame: rtc.AudioFrame):
                 for resampled_frame in resampler.push(frame):
-                    self._loop.call_soon_threadsafe(
-                        self._output_ch.send_nowait,
-                        resampled_frame,
-                    )
+                    self._emit_frame(resampled_frame)
 
             while True:
-                chunk = self._input_buf.read(1024)
+                # one frame per step, so the decoder can pause as soon as the output is full
+                chunk = self._input_buf.read(bstream.bytes_per_frame)
                 if not chunk:
                     break
                 frames = bstream.push(chunk)
                 for rtc_frame in frames:
                     resample_and_push(rtc_frame)
 
+                yield
+
             for rtc_frame in bstream.flush():
                 resample_and_push(rtc_frame)
         except Exception:
@@ -270,7 +445,10 @@ class AudioStreamDecoder:
         return self
 
     async def __anext__(self) -> rtc.AudioFrame:
-        return await self._output_ch.__anext__()
+        frame = await self._output_ch.__anext__()
+        self._consumed_duration += frame.duration
+        self._schedule_decode()
+        return frame
 
     async def aclose(self):
         if self._closed:
@@ -279,6 +457,7 @@ class AudioStreamDecoder:
         self.end_input()
         self._closed = True
         self._input_buf.close()
+        self._schedule_decode()
         # wait for decode loop to finish, only if anything's been pushed
         with contextlib.suppress(aio.ChanClosed):
             if self._started:
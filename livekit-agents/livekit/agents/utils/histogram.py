@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import bisect
+import math
+from collections.abc import Sequence
+
+
+class Histogram:
+    """Counts the samples falling into fixed buckets (e.g. latencies in seconds)."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        # upper bounds of the buckets, the last bucket catches everything above
+        self._bounds = sorted(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum: float = 0
+        self._count: int = 0
+
+    def add_sample(self, sample: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, sample)] += 1
+        self._sum += sample
+        self._count += 1
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """(upper bound, count) of each bucket"""
+        return list(zip([*self._bounds, math.inf], self._counts))
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-quantile (0 if there are no samples)"""
+        if self._count == 0:
+            return 0
+
+        rank = q * self._count
+        seen = 0
+        for bound, count in self.buckets():
+            seen += count
+            if seen >= rank and count > 0:
+                return bound
+
+        return math.inf
+
+    def get_avg(self) -> float:
+        if self._count == 0:
+            return 0
+        return self._sum / self._count
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self._sum = 0
+        self._count = 0
+
+    def size(self) -> int:
+        return self._count
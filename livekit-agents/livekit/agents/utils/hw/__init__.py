@@ -1,3 +1,29 @@
-from .cpu import CGroupV2CPUMonitor, CPUMonitor, DefaultCPUMonitor, get_cpu_monitor
+from .cpu import (
+    CGroupV2CPUMonitor,
+    CPULoadSampler,
+    CPUMonitor,
+    CPUStats,
+    DefaultCPUMonitor,
+    get_cpu_monitor,
+)
+from .memory import (
+    CGroupV2MemoryMonitor,
+    DefaultMemoryMonitor,
+    MemoryMonitor,
+    get_memory_monitor,
+    get_process_memory,
+)
 
-__all__ = ["get_cpu_monitor", "CPUMonitor", "CGroupV2CPUMonitor", "DefaultCPUMonitor"]
+__all__ = [
+    "get_cpu_monitor",
+    "CPUMonitor",
+    "CGroupV2CPUMonitor",
+    "DefaultCPUMonitor",
+    "CPUStats",
+    "CPULoadSampler",
+    "get_memory_monitor",
+    "get_process_memory",
+    "MemoryMonitor",
+    "CGroupV2MemoryMonitor",
+    "DefaultMemoryMonitor",
+]
@@ -1,10 +1,27 @@
+from __future__ import annotations
+
+import math
 import os
+import threading
 import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 
 import psutil
 
 
+@dataclass
+class CPUStats:
+    usage_seconds: float
+    """CPU time consumed since an arbitrary point in time, summed over all the CPUs"""
+    nr_periods: int = 0
+    """Number of cgroup enforcement periods (0 when the CPU isn't limited by a cgroup quota)"""
+    nr_throttled: int = 0
+    """Number of periods during which the cgroup used its whole quota and was throttled"""
+    throttled_usec: int = 0
+    """Total time in microseconds the processes of the cgroup were throttled"""
+
+
 class CPUMonitor(ABC):
     @abstractmethod
     def cpu_count(self) -> float:
@@ -18,6 +35,12 @@ class CPUMonitor(ABC):
         """CPU usage percentage between 0 and 1"""
         pass
 
+    def cpu_stats(self) -> CPUStats:
+        """Cumulative CPU counters, read without blocking"""
+        times = psutil.cpu_times()
+        idle = times.idle + getattr(times, "iowait", 0.0)
+        return CPUStats(usage_seconds=sum(times) - idle)
+
 
 class DefaultCPUMonitor(CPUMonitor):
     def cpu_count(self) -> float:
@@ -55,6 +78,15 @@ class CGroupV2CPUMonitor(CPUMonitor):
 
         return min(cpu_usage_percent, 1)
 
+    def cpu_stats(self) -> CPUStats:
+        stats = self._read_cpu_stat()
+        return CPUStats(
+            usage_seconds=stats["usage_usec"] / 1_000_000,
+            nr_periods=stats.get("nr_periods", 0),
+            nr_throttled=stats.get("nr_throttled", 0),
+            throttled_usec=stats.get("throttled_usec", 0),
+        )
+
     def _read_cpu_max(self) -> tuple[str, int]:
         try:
             with open("/sys/fs/cgroup/cpu.max") as f:
@@ -67,11 +99,116 @@ class CGroupV2CPUMonitor(CPUMonitor):
         return quota, period
 
     def _read_cpu_usage(self) -> int:
+        return self._read_cpu_stat()["usage_usec"]
+
+    def _read_cpu_stat(self) -> dict[str, int]:
+        stats: dict[str, int] = {}
         with open("/sys/fs/cgroup/cpu.stat") as f:
             for line in f:
-                if line.startswith("usage_usec"):
-                    return int(line.split()[1])
-        raise RuntimeError("Failed to read CPU usage")
+                key, _, value = line.partition(" ")
+                if value:
+                    stats[key] = int(value)
+        if "usage_usec" not in stats:
+            raise RuntimeError("Failed to read CPU usage")
+        return stats
+
+
+class CPULoadSampler:
+    """Exponentially smoothed CPU load computed from the deltas of the CPU counters between two
+    samples. Sampling only reads the counters, it never sleeps."""
+
+    def __init__(
+        self,
+        monitor: CPUMonitor | None = None,
+        *,
+        smoothing_window: float = 2.5,
+        min_interval: float = 0.25,
+    ) -> None:
+        self._monitor = monitor or get_cpu_monitor()
+        self._cpu_count = self._monitor.cpu_count()
+        self._smoothing_window = smoothing_window
+        self._min_interval = min_interval
+        # sample() is called from the event loop and from the executor threads
+        self._lock = threading.Lock()
+
+        self._last_stats: CPUStats | None = None
+        self._last_time = 0.0
+        self._load = 0.0
+        self._throttled_ratio = 0.0
+
+        self._processes: dict[int, tuple[psutil.Process, float, float]] = {}
+
+    @property
+    def load(self) -> float:
+        """Smoothed CPU usage between 0 and 1, relative to the CPUs available to the worker"""
+        return self._load
+
+    @property
+    def throttled_ratio(self) -> float:
+        """Fraction of the cgroup periods throttled between the last two samples"""
+        return self._throttled_ratio
+
+    @property
+    def stats(self) -> CPUStats | None:
+        """Counters read by the last sample"""
+        return self._last_stats
+
+    def sample(self) -> float:
+        """Read the CPU counters and update the smoothed load. Calls closer than min_interval
+        return the current load."""
+        with self._lock:
+            now = time.monotonic()
+            if self._last_stats is not None and now - self._last_time < self._min_interval:
+                return self._load
+
+            stats = self._monitor.cpu_stats()
+            dt = now - self._last_time
+            if self._last_stats is not None and dt > 0:
+                usage = (stats.usage_seconds - self._last_stats.usage_seconds) / (
+                    dt * self._cpu_count
+                )
+                usage = min(max(usage, 0.0), 1.0)
+                alpha = 1.0 - math.exp(-dt / self._smoothing_window)
+                self._load += alpha * (usage - self._load)
+
+                periods = stats.nr_periods - self._last_stats.nr_periods
+                throttled = stats.nr_throttled - self._last_stats.nr_throttled
+                self._throttled_ratio = throttled / periods if periods > 0 else 0.0
+
+            self._last_stats = stats
+            self._last_time = now
+            return self._load
+
+    def process_load(self, pids: list[int]) -> dict[int, float]:
+        """CPU usage of each process since the previous call, relative to the CPUs available to
+        the worker. A process seen for the first time has a usage of 0."""
+        with self._lock:
+            now = time.monotonic()
+            loads: dict[int, float] = {}
+            processes: dict[int, tuple[psutil.Process, float, float]] = {}
+            for pid in pids:
+                try:
+                    if pid in self._processes:
+                        process, last_usage, last_time = self._processes[pid]
+                    else:
+                        process, last_usage, last_time = psutil.Process(pid), -1.0, now
+
+                    times = process.cpu_times()
+                    usage = times.user + times.system
+                except psutil.Error:
+                    continue
+
+                dt = now - last_time
+                if last_usage >= 0 and dt > 0:
+                    loads[pid] = max(usage - last_usage, 0.0) / (dt * self._cpu_count)
+                else:
+                    loads[pid] = 0.0
+
+                processes[pid] = (process, usage, now)
+
+            # forget the processes that exited
+            self._processes = processes
+            return loads
 
 
 def get_cpu_monitor() -> CPUMonitor:
@@ -0,0 +1,96 @@
+import os
+from abc import ABC, abstractmethod
+
+import psutil
+
+
+class MemoryMonitor(ABC):
+    @abstractmethod
+    def memory_limit(self) -> int:
+        """Memory in bytes available to the worker (the cgroup limit or the physical memory)"""
+        pass
+
+    @abstractmethod
+    def memory_usage(self) -> int:
+        """Memory in bytes in use that can't be reclaimed by the kernel"""
+        pass
+
+    def memory_pressure(self) -> float:
+        """Memory usage between 0 and 1, relative to the memory limit"""
+        limit = self.memory_limit()
+        if limit <= 0:
+            return 0.0
+
+        return min(max(self.memory_usage() / limit, 0.0), 1.0)
+
+
+class DefaultMemoryMonitor(MemoryMonitor):
+    def memory_limit(self) -> int:
+        return psutil.virtual_memory().total
+
+    def memory_usage(self) -> int:
+        mem = psutil.virtual_memory()
+        return mem.total - mem.available
+
+
+class CGroupV2MemoryMonitor(MemoryMonitor):
+    def memory_limit(self) -> int:
+        # memory.max is "max" when the cgroup isn't limited
+        try:
+            with open("/sys/fs/cgroup/memory.max") as f:
+                limit = f.read().strip()
+        except FileNotFoundError:
+            limit = "max"
+
+        total = psutil.virtual_memory().total
+        if limit == "max":
+            return total
+        return min(int(limit), total)
+
+    def memory_usage(self) -> int:
+        # memory.current includes the page cache, the inactive file pages are reclaimed before
+        # the OOM killer runs (same working set as the one used by the kubelet)
+        with open("/sys/fs/cgroup/memory.current") as f:
+            current = int(f.read().strip())
+
+        inactive_file = 0
+        with open("/sys/fs/cgroup/memory.stat") as f:
+            for line in f:
+                if line.startswith("inactive_file "):
+                    inactive_file = int(line.split()[1])
+                    break
+
+        return max(current - inactive_file, 0)
+
+
+def get_memory_monitor() -> MemoryMonitor:
+    if _is_cgroup_v2():
+        return CGroupV2MemoryMonitor()
+    return DefaultMemoryMonitor()
+
+
+def get_process_memory(pid: int) -> int:
+    """Memory in bytes used by a process, counting its share of the pages shared with other
+    processes (e.g. the ones inherited from a forkserver) instead of all of them.
+
+    Uses the PSS on Linux and the USS on macOS/Windows, falls back to the RSS when they aren't
+    accessible."""
+    process = psutil.Process(pid)
+    try:
+        info = process.memory_full_info()
+    except psutil.AccessDenied:
+        return process.memory_info().rss
+
+    pss = getattr(info, "pss", None)
+    if pss is not None:
+        return int(pss)
+
+    uss = getattr(info, "uss", None)
+    if uss is not None:
+        return int(uss)
+
+    return int(info.rss)
+
+
+def _is_cgroup_v2() -> bool:
+    return os.path.exists("/sys/fs/cgroup/memory.current")
@@ -1,5 +1,6 @@
 from .agent import Agent, InlineTask, ModelSettings
 from .agent_session import AgentSession, VoiceActivityVideoSampler
+from .audio_gate import AudioInputGate
 from .chat_cli import ChatCLI
 from .events import (
     AgentEvent,
@@ -20,6 +21,7 @@ __all__ = [
     "ChatCLI",
     "AgentSession",
     "VoiceActivityVideoSampler",
+    "AudioInputGate",
     "Agent",
     "ModelSettings",
     "InlineTask",
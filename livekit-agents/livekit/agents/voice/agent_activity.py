@@ -5,14 +5,23 @@ import contextvars
 import heapq
 import time
 from collections.abc import AsyncIterable, Coroutine
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from livekit import rtc
 
 from .. import debug, llm, stt, tts, utils, vad
+from ..llm import ChatContext, ChatMessage
 from ..llm.tool_context import StopResponse
 from ..log import logger
-from ..metrics import EOUMetrics, LLMMetrics, STTMetrics, TTSMetrics, VADMetrics
+from ..metrics import (
+    EOUMetrics,
+    LLMMetrics,
+    SpeculativeGenerationMetrics,
+    STTMetrics,
+    TTSMetrics,
+    VADMetrics,
+)
 from ..types import NOT_GIVEN, NotGivenOr
 from ..utils.misc import is_given
 from .agent import Agent, ModelSettings
@@ -26,6 +35,7 @@ from .events import (
 )
 from .generation import (
     _AudioOutput,
+    _LLMGenerationData,
     _TextOutput,
     _TTSGenerationData,
     perform_audio_forwarding,
@@ -58,6 +68,40 @@ if TYPE_CHECKING:
 _AgentActivityContextVar = contextvars.ContextVar["AgentActivity"]("agents_activity")
 _SpeechHandleContextVar = contextvars.ContextVar["SpeechHandle"]("agents_speech_handle")
 
+# rough average of the LLM tokenizers on english text, used when the usage isn't reported
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class _SpeculativeGeneration:
+    """A reply generated before the end of the user turn (see AgentSession.speculative_generation)
+
+    It's only used if the turn ends with the same transcript, and the chat context, tools and
+    tool choice are unchanged after on_user_turn_completed.
+    """
+
+    new_transcript: str
+    user_message: llm.ChatMessage
+    chat_ctx: llm.ChatContext
+    """The chat context of the agent when the generation started, including the user message"""
+    chat_items: list[llm.ChatItem]
+    """The items of the agent chat context when the generation started"""
+    tools: list[llm.FunctionTool | llm.RawFunctionTool]
+    tool_ctx: llm.ToolContext
+    model_settings: ModelSettings
+    speech_handle: SpeechHandle
+    started_at: float = field(default_factory=time.time)
+    resolved_at: float | None = None
+    committed: bool = False
+
+    llm_task: asyncio.Task[Any] | None = None
+    llm_gen_data: _LLMGenerationData | None = None
+    tts_text_input: AsyncIterable[str] | None = None
+    llm_output: AsyncIterable[str] | None = None
+    tts_task: asyncio.Task[Any] | None = None
+    tts_gen_data: _TTSGenerationData | None = None
+    llm_metrics: list[LLMMetrics] = field(default_factory=list)
+
 
 # NOTE: AgentActivity isn't exposed to the public API
 class AgentActivity(RecognitionHooks):
@@ -82,6 +126,10 @@ class AgentActivity(RecognitionHooks):
         self._user_turn_completed_atask: asyncio.Task | None = None
         self._speech_tasks: list[asyncio.Task] = []
 
+        self._speculative_generation: _SpeculativeGeneration | None = None
+        # speculative generations waiting for their LLM metrics, by speech_id
+        self._speculative_generations: dict[str, _SpeculativeGeneration] = {}
+
         from .. import llm as large_language_model
 
         self._turn_detection_mode = (
@@ -359,6 +407,7 @@ class AgentActivity(RecognitionHooks):
                 min_endpointing_delay=self._session.options.min_endpointing_delay,
                 max_endpointing_delay=self._session.options.max_endpointing_delay,
                 manual_turn_detection=self._turn_detection_mode == "manual",
+                input_gate=self._session._input_audio_gate,
             )
             self._audio_recognition.start()
             self._started = True
@@ -378,6 +427,7 @@ class AgentActivity(RecognitionHooks):
 
             self._wake_up_main_task()
             self._draining = True
+            self._discard_speculative_generation()
             if self._main_atask is not None:
                 await asyncio.shield(self._main_atask)
 
@@ -386,6 +436,8 @@ class AgentActivity(RecognitionHooks):
             if not self._draining:
                 logger.warning("task closing without draining")
 
+            self._discard_speculative_generation()
+
             # Unregister event handlers to prevent duplicate metrics
             if isinstance(self.llm, llm.LLM):
                 self.llm.off("metrics_collected", self._on_metrics_collected)
@@ -435,11 +487,14 @@ class AgentActivity(RecognitionHooks):
             # discard the audio if the current speech is not interruptable
             return
 
-        if self._rt_session is not None:
-            self._rt_session.push_audio(frame)
-
+        frames = [frame]
         if self._audio_recognition is not None:
-            self._audio_recognition.push_audio(frame)
+            # the realtime model gets the same audio as the STT, see AudioInputGate
+            frames = self._audio_recognition.push_audio(frame)
+
+        if self._rt_session is not None:
+            for f in frames:
+                self._rt_session.push_audio(f)
 
     def push_video(self, frame: rtc.VideoFrame) -> None:
         if not self._started:
@@ -502,6 +557,7 @@ class AgentActivity(RecognitionHooks):
         instructions: NotGivenOr[str] = NOT_GIVEN,
         tool_choice: NotGivenOr[llm.ToolChoice] = NOT_GIVEN,
         allow_interruptions: NotGivenOr[bool] = NOT_GIVEN,
+        _speculative: _SpeculativeGeneration | None = None,
     ) -> SpeechHandle:
         if (
             isinstance(self.llm, llm.RealtimeModel)
@@ -529,10 +585,14 @@ class AgentActivity(RecognitionHooks):
                     # when generete_reply is called inside a function_tool, set tool_choice to None by default  # noqa: E501
                     tool_choice = "none"
 
-        handle = SpeechHandle.create(
-            allow_interruptions=allow_interruptions
-            if is_given(allow_interruptions)
-            else self.allow_interruptions
+        handle = (
+            _speculative.speech_handle
+            if _speculative is not None
+            else SpeechHandle.create(
+                allow_interruptions=allow_interruptions
+                if is_given(allow_interruptions)
+                else self.allow_interruptions
+            )
         )
         self._session.emit(
             "speech_created",
@@ -571,6 +631,7 @@ class AgentActivity(RecognitionHooks):
                         if utils.is_given(tool_choice) or self._tool_choice is None
                         else self._tool_choice
                     ),
+                    _speculative=_speculative,
                 ),
                 owned_speech_handle=handle,
                 name="AgentActivity.pipeline_reply",
@@ -616,6 +677,7 @@ class AgentActivity(RecognitionHooks):
         return future
 
     def clear_user_turn(self) -> None:
+        self._discard_speculative_generation()
         if self._audio_recognition:
             self._audio_recognition.clear_user_turn()
 
@@ -670,6 +732,11 @@ class AgentActivity(RecognitionHooks):
             isinstance(ev, LLMMetrics) or isinstance(ev, TTSMetrics)
         ):
             ev.speech_id = speech_handle.id
+
+            if isinstance(ev, LLMMetrics) and (
+                speculative := self._speculative_generations.get(speech_handle.id)
+            ):
+                speculative.llm_metrics.append(ev)
         self._session.emit("metrics_collected", MetricsCollectedEvent(metrics=ev))
 
     def _on_error(
@@ -756,6 +823,8 @@ class AgentActivity(RecognitionHooks):
 
     def on_start_of_speech(self, ev: vad.VADEvent) -> None:
         self._session._update_user_state("speaking")
+        # the user keeps talking, the turn won't end with the speculated transcript
+        self._discard_speculative_generation()
 
     def on_end_of_speech(self, ev: vad.VADEvent) -> None:
         self._session._update_user_state("listening")
@@ -824,15 +893,23 @@ class AgentActivity(RecognitionHooks):
             logger.warning("ignoring new user turn, the agent is draining")
             return
 
+        speculative, self._speculative_generation = self._speculative_generation, None
+        if speculative is not None and speculative.new_transcript != info.new_transcript:
+            self._resolve_speculative_generation(speculative, committed=False)
+            speculative = None
+
         old_task = self._user_turn_completed_atask
         self._user_turn_completed_atask = self._create_speech_task(
-            self._user_turn_completed_task(old_task, info),
+            self._user_turn_completed_task(old_task, info, speculative),
             name="AgentActivity._user_turn_completed_task",
         )
 
     @utils.log_exceptions(logger=logger)
     async def _user_turn_completed_task(
-        self, old_task: asyncio.Task | None, info: _EndOfTurnInfo
+        self,
+        old_task: asyncio.Task[None] | None,
+        info: _EndOfTurnInfo,
+        speculative: _SpeculativeGeneration | None = None,
     ) -> None:
         if old_task is not None:
             # We never cancel user code as this is very confusing.
@@ -861,6 +938,8 @@ class AgentActivity(RecognitionHooks):
                     "skipping reply to user input, current speech generation cannot be interrupted",
                     extra={"user_input": info.new_transcript},
                 )
+                if speculative is not None:
+                    self._resolve_speculative_generation(speculative, committed=False)
                 return
 
             log_event(
@@ -884,9 +963,13 @@ class AgentActivity(RecognitionHooks):
                 temp_mutable_chat_ctx, new_message=user_message
             )
         except StopResponse:
+            if speculative is not None:
+                self._resolve_speculative_generation(speculative, committed=False)
             return  # ignore this turn
         except Exception:
             logger.exception("error occured during on_user_turn_completed")
+            if speculative is not None:
+                self._resolve_speculative_generation(speculative, committed=False)
             return
 
         callback_duration = time.time() - start_time
@@ -895,10 +978,20 @@ class AgentActivity(RecognitionHooks):
             # ignore stt transcription for realtime model
             user_message = None
 
+        if speculative is not None:
+            # the reply was already generated from the same inputs, unless on_user_turn_completed
+            # or the agent changed them in the meantime
+            committed = user_message is not None and self._speculative_generation_matches(
+                speculative, new_message=user_message, chat_ctx=temp_mutable_chat_ctx
+            )
+            self._resolve_speculative_generation(speculative, committed=committed)
+            if not committed:
+                speculative = None
+
         # Ensure the new message is passed to generate_reply
         # This preserves the original message_id, making it easier for users to track responses
         speech_handle = self._generate_reply(
-            user_message=user_message, chat_ctx=temp_mutable_chat_ctx
+            user_message=user_message, chat_ctx=temp_mutable_chat_ctx, _speculative=speculative
         )
 
         if self._user_turn_completed_atask != asyncio.current_task():
@@ -912,6 +1005,8 @@ class AgentActivity(RecognitionHooks):
             end_of_utterance_delay=info.end_of_utterance_delay,
             transcription_delay=info.transcription_delay,
             on_user_turn_completed_delay=callback_duration,
+            turn_detector_cache_hits=info.turn_detector_cache_hits,
+            turn_detector_cache_misses=info.turn_detector_cache_misses,
             speech_id=speech_handle.id,
         )
         self._session.emit("metrics_collected", MetricsCollectedEvent(metrics=eou_metrics))
@@ -920,6 +1015,154 @@ class AgentActivity(RecognitionHooks):
     def retrieve_chat_ctx(self) -> llm.ChatContext:
         return self._agent.chat_ctx
 
+    def on_speculative_turn(self, new_transcript: str) -> None:
+        if (
+            not self._session.options.speculative_generation
+            or not isinstance(self.llm, llm.LLM)
+            or self.draining
+        ):
+            return
+
+        user_message = llm.ChatMessage(role="user", content=[new_transcript])
+        if (speculative := self._speculative_generation) is not None:
+            if speculative.new_transcript == new_transcript and (
+                self._speculative_generation_matches(
+                    speculative, new_message=user_message, chat_ctx=self._agent.chat_ctx
+                )
+            ):
+                return  # already generating a reply to this turn
+
+            self._discard_speculative_generation()
+
+        if self._current_speech is not None and not self._current_speech.allow_interruptions:
+            return  # the reply would be skipped
+
+        chat_ctx = self._agent.chat_ctx.copy()
+        chat_items = list(chat_ctx.items)
+        chat_ctx.items.insert(
+            chat_ctx.find_insertion_index(created_at=user_message.created_at), user_message
+        )
+        tools: list[llm.FunctionTool | llm.RawFunctionTool] = list(self._agent.tools)
+        speculative = _SpeculativeGeneration(
+            new_transcript=new_transcript,
+            user_message=user_message,
+            chat_ctx=chat_ctx,
+            chat_items=chat_items,
+            tools=tools,
+            tool_ctx=llm.ToolContext(tools),
+            model_settings=self._reply_model_settings(),
+            speech_handle=SpeechHandle.create(allow_interruptions=self.allow_interruptions),
+        )
+        self._speculative_generation = speculative
+        self._speculative_generations[speculative.speech_handle.id] = speculative
+
+        log_event(
+            "speculative generation started",
+            speech_id=speculative.speech_handle.id,
+            user_input=new_transcript,
+        )
+        # run inside a copy of the context, so the LLM and TTS metrics are tagged with the speech_id
+        contextvars.copy_context().run(self._start_speculative_generation, speculative)
+
+    # endregion
+
+    # region speculative generation
+
+    def _reply_model_settings(self) -> ModelSettings:
+        # the model settings used by _generate_reply when replying to a user turn
+        return ModelSettings(
+            tool_choice=self._tool_choice if self._tool_choice is not None else NOT_GIVEN
+        )
+
+    def _speculative_generation_matches(
+        self,
+        speculative: _SpeculativeGeneration,
+        *,
+        new_message: ChatMessage,
+        chat_ctx: ChatContext,
+    ) -> bool:
+        return (
+            new_message.role == speculative.user_message.role
+            and new_message.content == speculative.user_message.content
+            and len(chat_ctx.items) == len(speculative.chat_items)
+            and all(a is b or a == b for a, b in zip(chat_ctx.items, speculative.chat_items))
+            and self._agent.tools == speculative.tools
+            and self._reply_model_settings() == speculative.model_settings
+        )
+
+    def _start_speculative_generation(self, speculative: _SpeculativeGeneration) -> None:
+        _SpeechHandleContextVar.set(speculative.speech_handle)
+
+        # the outputs are buffered inside the channels until the generation is committed
+        speculative.llm_task, speculative.llm_gen_data = perform_llm_inference(
+            node=self._agent.llm_node,
+            chat_ctx=speculative.chat_ctx,
+            tool_ctx=speculative.tool_ctx,
+            model_settings=speculative.model_settings,
+        )
+        speculative.tts_text_input, speculative.llm_output = utils.aio.itertools.tee(
+            speculative.llm_gen_data.text_ch
+        )
+        if self._session.options.speculative_tts and self._session.output.audio_enabled:
+            speculative.tts_task, speculative.tts_gen_data = perform_tts_inference(
+                node=self._agent.tts_node,
+                input=speculative.tts_text_input,
+                model_settings=speculative.model_settings,
+            )
+
+    def _discard_speculative_generation(self) -> None:
+        speculative, self._speculative_generation = self._speculative_generation, None
+        if speculative is not None:
+            self._resolve_speculative_generation(speculative, committed=False)
+
+    def _resolve_speculative_generation(
+        self, speculative: _SpeculativeGeneration, *, committed: bool
+    ) -> None:
+        speculative.committed = committed
+        speculative.resolved_at = time.time()
+        if not committed:
+            log_event("speculative generation discarded", speech_id=speculative.speech_handle.id)
+            for task in (speculative.llm_task, speculative.tts_task):
+                if task is not None:
+                    task.cancel()
+
+        # the LLM metrics are emitted before the end of the inference task
+        assert speculative.llm_task is not None
+        speculative.llm_task.add_done_callback(
+            lambda _: self._emit_speculative_generation_metrics(speculative)
+        )
+
+    def _emit_speculative_generation_metrics(self, speculative: _SpeculativeGeneration) -> None:
+        self._speculative_generations.pop(speculative.speech_handle.id, None)
+
+        assert speculative.resolved_at is not None
+        prompt_tokens = sum(m.prompt_tokens for m in speculative.llm_metrics)
+        completion_tokens = sum(m.completion_tokens for m in speculative.llm_metrics)
+        # a discarded generation is usually cancelled before the LLM streams its usage
+        tokens_estimated = not prompt_tokens and not completion_tokens
+        if tokens_estimated:
+            prompt_text = "".join(
+                item.text_content or ""
+                for item in speculative.chat_ctx.items
+                if item.type == "message"
+            )
+            generated_text = (
+                speculative.llm_gen_data.generated_text if speculative.llm_gen_data else ""
+            )
+            prompt_tokens = len(prompt_text) // _CHARS_PER_TOKEN
+            completion_tokens = len(generated_text) // _CHARS_PER_TOKEN
+
+        metrics = SpeculativeGenerationMetrics(
+            timestamp=time.time(),
+            speech_id=speculative.speech_handle.id,
+            committed=speculative.committed,
+            lead_time=speculative.resolved_at - speculative.started_at,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            tokens_estimated=tokens_estimated,
+        )
+        self._session.emit("metrics_collected", MetricsCollectedEvent(metrics=metrics))
+
     # endregion
 
     @utils.log_exceptions(logger=logger)
@@ -1035,6 +1278,7 @@ class AgentActivity(RecognitionHooks):
         new_message: llm.ChatMessage | None = None,
         instructions: str | None = None,
         _tools_messages: list[llm.ChatItem] | None = None,
+        _speculative: _SpeculativeGeneration | None = None,
     ) -> None:
         from .agent import ModelSettings
 
@@ -1052,12 +1296,22 @@ class AgentActivity(RecognitionHooks):
             if self._session.output.transcription_enabled
             else None
         )
-        chat_ctx = chat_ctx.copy()
-        tool_ctx = llm.ToolContext(tools)
+        if _speculative is not None:
+            # the generation already started from these, before the end of the user turn
+            chat_ctx = _speculative.chat_ctx
+            tool_ctx = _speculative.tool_ctx
+        else:
+            chat_ctx = chat_ctx.copy()
+            tool_ctx = llm.ToolContext(tools)
 
         if new_message is not None:
-            idx = chat_ctx.find_insertion_index(created_at=new_message.created_at)
-            chat_ctx.items.insert(idx, new_message)
+            if _speculative is not None:
+                idx = chat_ctx.index_by_id(_speculative.user_message.id)
+                assert idx is not None
+                chat_ctx.items[idx] = new_message
+            else:
+                idx = chat_ctx.find_insertion_index(created_at=new_message.created_at)
+                chat_ctx.items.insert(idx, new_message)
             idx = self._agent._chat_ctx.find_insertion_index(created_at=new_message.created_at)
             self._agent._chat_ctx.items.insert(idx, new_message)
             self._session._conversation_item_added(new_message)
@@ -1070,18 +1324,27 @@ class AgentActivity(RecognitionHooks):
 
         self._session._update_agent_state("thinking")
         tasks = []
-        llm_task, llm_gen_data = perform_llm_inference(
-            node=self._agent.llm_node,
-            chat_ctx=chat_ctx,
-            tool_ctx=tool_ctx,
-            model_settings=model_settings,
-        )
+        tts_task: asyncio.Task[Any] | None = None
+        tts_gen_data: _TTSGenerationData | None = None
+        if _speculative is not None:
+            assert _speculative.llm_task is not None and _speculative.llm_gen_data is not None
+            assert _speculative.tts_text_input is not None and _speculative.llm_output is not None
+            llm_task, llm_gen_data = _speculative.llm_task, _speculative.llm_gen_data
+            tts_text_input, llm_output = _speculative.tts_text_input, _speculative.llm_output
+            if _speculative.tts_task is not None:
+                tts_task, tts_gen_data = _speculative.tts_task, _speculative.tts_gen_data
+                tasks.append(tts_task)
+        else:
+            llm_task, llm_gen_data = perform_llm_inference(
+                node=self._agent.llm_node,
+                chat_ctx=chat_ctx,
+                tool_ctx=tool_ctx,
+                model_settings=model_settings,
+            )
+            tts_text_input, llm_output = utils.aio.itertools.tee(llm_gen_data.text_ch)
         tasks.append(llm_task)
-        tts_text_input, llm_output = utils.aio.itertools.tee(llm_gen_data.text_ch)
 
-        tts_task: asyncio.Task | None = None
-        tts_gen_data: _TTSGenerationData | None = None
-        if audio_output is not None:
+        if audio_output is not None and tts_task is None:
             tts_task, tts_gen_data = perform_tts_inference(
                 node=self._agent.tts_node,
                 input=tts_text_input,
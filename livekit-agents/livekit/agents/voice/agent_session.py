@@ -19,6 +19,7 @@ from ..utils.misc import is_given
 from . import io, room_io
 from .agent import Agent
 from .agent_activity import AgentActivity
+from .audio_gate import AudioInputGate
 from .audio_recognition import _TurnDetector
 from .events import (
     AgentEvent,
@@ -41,6 +42,8 @@ class VoiceOptions:
     min_endpointing_delay: float
     max_endpointing_delay: float
     max_tool_steps: int
+    speculative_generation: bool
+    speculative_tts: bool
 
 
 Userdata_T = TypeVar("Userdata_T")
@@ -109,7 +112,10 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         min_endpointing_delay: float = 0.5,
         max_endpointing_delay: float = 6.0,
         max_tool_steps: int = 3,
+        speculative_generation: bool = False,
+        speculative_tts: bool = False,
         video_sampler: NotGivenOr[_VideoSampler | None] = NOT_GIVEN,
+        input_audio_gate: AudioInputGate | None = None,
         loop: asyncio.AbstractEventLoop | None = None,
     ) -> None:
         """`AgentSession` is the LiveKit Agents runtime that glues together
@@ -156,10 +162,23 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 will wait before terminating the turn. Default ``6.0`` s.
             max_tool_steps (int): Maximum consecutive tool calls per LLM turn.
                 Default ``3``.
+            speculative_generation (bool): Start the LLM generation as soon as
+                a final transcript is available, while waiting for the end of
+                the user's turn. The output is held back and used for the reply
+                if the turn ends with the same transcript (and chat context),
+                it's discarded otherwise. This hides most of the endpointing
+                delay at the cost of wasted LLM requests when the user keeps
+                talking. Default ``False``.
+            speculative_tts (bool): Also start the TTS synthesis of the
+                speculative generation. Only used when
+                ``speculative_generation`` is enabled. Default ``False``.
             video_sampler (_VideoSampler, optional): Uses
                 :class:`VoiceActivityVideoSampler` when *NOT_GIVEN*; that sampler
                 captures video at ~1 fps while the user is speaking and ~0.3 fps
                 when silent by default.
+            input_audio_gate (AudioInputGate, optional): Suppresses the silent
+                input audio before it's sent to the STT or the realtime model,
+                using the local VAD. Disabled by default.
             loop (asyncio.AbstractEventLoop, optional): Event loop to bind the
                 session to. Falls back to :pyfunc:`asyncio.get_event_loop()`.
         """
@@ -170,6 +189,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             video_sampler = VoiceActivityVideoSampler(speaking_fps=1.0, silent_fps=0.3)
 
         self._video_sampler = video_sampler
+        self._input_audio_gate = input_audio_gate
 
         # This is the "global" chat_context, it holds the entire conversation history
         self._chat_ctx = ChatContext.empty()
@@ -180,6 +200,8 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             min_endpointing_delay=min_endpointing_delay,
             max_endpointing_delay=max_endpointing_delay,
             max_tool_steps=max_tool_steps,
+            speculative_generation=speculative_generation,
+            speculative_tts=speculative_tts,
         )
         self._started = False
         self._turn_detection = turn_detection or None
@@ -244,6 +266,10 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
     def vad(self) -> vad.VAD | None:
         return self._vad
 
+    @property
+    def input_audio_gate(self) -> AudioInputGate | None:
+        return self._input_audio_gate
+
     @property
     def input(self) -> io.AgentInput:
         return self._input
@@ -421,6 +447,18 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             if self._room_io:
                 await self._room_io.aclose()
 
+            if self._input_audio_gate is not None:
+                gate = self._input_audio_gate
+                logger.debug(
+                    "input audio gate stats",
+                    extra={
+                        "bytes_forwarded": gate.bytes_forwarded,
+                        "bytes_suppressed": gate.bytes_suppressed,
+                        "duration_forwarded": round(gate.duration_forwarded, 2),
+                        "duration_suppressed": round(gate.duration_suppressed, 2),
+                    },
+                )
+
     async def aclose(self) -> None:
         await self._aclose_impl()
 
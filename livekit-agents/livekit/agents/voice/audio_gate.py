@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from collections import deque
+
+from livekit import rtc
+
+
+class AudioInputGate:
+    def __init__(
+        self,
+        *,
+        pre_roll: float = 0.5,
+        hangover: float = 1.0,
+        keepalive_interval: float | None = 5.0,
+    ) -> None:
+        """Suppresses the silent input audio before it's sent to the STT or the realtime model,
+        using the events of the local VAD. Most of a call is silence, and the providers bill
+        (and we send) every second of audio they receive.
+
+        The gate opens at the start of speech, and closes once the end of speech is followed by
+        `hangover` seconds of audio, so the provider gets enough silence to finalize its
+        transcript. While it's closed, the last `pre_roll` seconds of audio are buffered and
+        sent when the gate opens: the VAD detects the speech with a delay, the beginning of the
+        utterance would be cut without them.
+
+        Args:
+            pre_roll (float): Seconds of audio sent before the start of speech. Default ``0.5``.
+            hangover (float): Seconds of audio still sent after the end of speech.
+                Default ``1.0``.
+            keepalive_interval (float, optional): While the gate is closed, a single frame of
+                silence is sent every `keepalive_interval` seconds, so the providers closing
+                an idle connection keep it open. ``None`` sends nothing. Default ``5.0``.
+
+        The gate is only used when the session has a VAD, and the timestamps of the transcripts
+        no longer match the audio timeline of the session.
+        """
+        if pre_roll < 0 or hangover < 0:
+            raise ValueError("pre_roll and hangover must be positive")
+
+        if keepalive_interval is not None and keepalive_interval <= 0:
+            raise ValueError("keepalive_interval must be greater than zero")
+
+        self.pre_roll = pre_roll
+        self.hangover = hangover
+        self.keepalive_interval = keepalive_interval
+
+        self._pre_roll_frames: deque[rtc.AudioFrame] = deque()
+        self._pre_roll_duration = 0.0
+        self._speaking = False
+        self._hangover_left = 0.0
+        self._since_forward = 0.0
+
+        self._bytes_forwarded = 0
+        self._bytes_suppressed = 0
+        self._duration_forwarded = 0.0
+        self._duration_suppressed = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._speaking or self._hangover_left > 0
+
+    @property
+    def bytes_forwarded(self) -> int:
+        """Bytes of audio let through, including the keepalive frames"""
+        return self._bytes_forwarded
+
+    @property
+    def bytes_suppressed(self) -> int:
+        """Bytes of audio that weren't sent to the provider"""
+        return self._bytes_suppressed
+
+    @property
+    def duration_forwarded(self) -> float:
+        return self._duration_forwarded
+
+    @property
+    def duration_suppressed(self) -> float:
+        """Seconds of audio that weren't sent to the provider"""
+        return self._duration_suppressed
+
+    def on_start_of_speech(self) -> None:
+        self._speaking = True
+
+    def on_end_of_speech(self) -> None:
+        self._speaking = False
+        self._hangover_left = self.hangover
+
+    def reset(self) -> None:
+        """Close the gate and drop the buffered audio, the counters are kept"""
+        while self._pre_roll_frames:
+            self._suppress(self._pre_roll_frames.popleft())
+
+        self._pre_roll_duration = 0.0
+        self._speaking = False
+        self._hangover_left = 0.0
+        self._since_forward = 0.0
+
+    def push(self, frame: rtc.AudioFrame) -> list[rtc.AudioFrame]:
+        """Returns the frames to send, the gate follows the duration of the pushed audio"""
+        if self.is_open:
+            if not self._speaking:
+                self._hangover_left = _round(self._hangover_left - frame.duration)
+
+            frames = [*self._pre_roll_frames, frame]
+            self._pre_roll_frames.clear()
+            self._pre_roll_duration = 0.0
+            for f in frames:
+                self._forward(f)
+            return frames
+
+        self._pre_roll_frames.append(frame)
+        self._pre_roll_duration = _round(self._pre_roll_duration + frame.duration)
+        while (
+            self._pre_roll_frames
+            and _round(self._pre_roll_duration - self._pre_roll_frames[0].duration) >= self.pre_roll
+        ):
+            dropped = self._pre_roll_frames.popleft()
+            self._pre_roll_duration = _round(self._pre_roll_duration - dropped.duration)
+            self._suppress(dropped)
+
+        self._since_forward = _round(self._since_forward + frame.duration)
+        if self.keepalive_interval is not None and self._since_forward >= self.keepalive_interval:
+            silence = rtc.AudioFrame(
+                data=bytes(len(frame.data) * 2),  # int16 samples
+                sample_rate=frame.sample_rate,
+                num_channels=frame.num_channels,
+                samples_per_channel=frame.samples_per_channel,
+            )
+            self._forward(silence)
+            return [silence]
+
+        return []
+
+    def _forward(self, frame: rtc.AudioFrame) -> None:
+        self._since_forward = 0.0
+        self._bytes_forwarded += len(frame.data) * 2
+        self._duration_forwarded += frame.duration
+
+    def _suppress(self, frame: rtc.AudioFrame) -> None:
+        self._bytes_suppressed += len(frame.data) * 2
+        self._duration_suppressed += frame.duration
+
+
+def _round(duration: float) -> float:
+    # the durations are sums of frame durations, avoid the float error on the comparisons
+    return round(duration, 6)
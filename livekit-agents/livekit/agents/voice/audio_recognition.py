@@ -14,6 +14,7 @@ from ..log import logger
 from ..utils import aio
 from . import io
 from .agent import ModelSettings
+from .audio_gate import AudioInputGate
 
 
 @dataclass
@@ -21,6 +22,8 @@ class _EndOfTurnInfo:
     new_transcript: str
     transcription_delay: float
     end_of_utterance_delay: float
+    turn_detector_cache_hits: int = 0
+    turn_detector_cache_misses: int = 0
 
 
 class _TurnDetector(Protocol):
@@ -38,6 +41,7 @@ class RecognitionHooks(Protocol):
     def on_interim_transcript(self, ev: stt.SpeechEvent) -> None: ...
     def on_final_transcript(self, ev: stt.SpeechEvent) -> None: ...
     async def on_end_of_turn(self, info: _EndOfTurnInfo) -> None: ...
+    def on_speculative_turn(self, new_transcript: str) -> None: ...
 
     def retrieve_chat_ctx(self) -> llm.ChatContext: ...
 
@@ -53,6 +57,7 @@ class AudioRecognition:
         min_endpointing_delay: float,
         max_endpointing_delay: float,
         manual_turn_detection: bool,
+        input_gate: AudioInputGate | None = None,
     ) -> None:
         self._hooks = hooks
         self._audio_input_atask: asyncio.Task[None] | None = None
@@ -66,6 +71,7 @@ class AudioRecognition:
         self._stt = stt
         self._vad = vad
         self._manual_turn_detection = manual_turn_detection
+        self._input_gate = input_gate
         self._user_turn_committed = False
         self._sample_rate: float | None = None
 
@@ -74,6 +80,9 @@ class AudioRecognition:
         self._last_final_transcript_time: float = 0
         self._audio_transcript = ""
         self._audio_interim_transcript = ""
+        # turn detector predictions of the current user turn, see _EndOfTurnInfo
+        self._turn_detector_cache_hits = 0
+        self._turn_detector_cache_misses = 0
         self._last_language: str | None = None
         self._vad_graph = tracing.Tracing.add_graph(
             title="vad",
@@ -89,6 +98,10 @@ class AudioRecognition:
         self._tasks: set[asyncio.Task] = set()
 
     def start(self) -> None:
+        if self._input_gate is not None:
+            # the gate is shared by the activities of the session
+            self._input_gate.reset()
+
         self.update_stt(self._stt)
         self.update_vad(self._vad)
 
@@ -96,14 +109,24 @@ class AudioRecognition:
         self.update_stt(None)
         self.update_vad(None)
 
-    def push_audio(self, frame: rtc.AudioFrame) -> None:
+    def push_audio(self, frame: rtc.AudioFrame) -> list[rtc.AudioFrame]:
+        """Returns the frames let through by the input gate, the ones to send to the providers.
+        The VAD always receives all of the audio."""
         self._sample_rate = frame.sample_rate
-        if self._stt_ch is not None:
-            self._stt_ch.send_nowait(frame)
-
         if self._vad_ch is not None:
             self._vad_ch.send_nowait(frame)
 
+        if self._input_gate is not None and self._vad is not None:
+            frames = self._input_gate.push(frame)
+        else:
+            frames = [frame]
+
+        if self._stt_ch is not None:
+            for f in frames:
+                self._stt_ch.send_nowait(f)
+
+        return frames
+
     async def aclose(self) -> None:
         await aio.cancel_and_wait(*self._tasks)
         if self._commit_user_turn_atask is not None:
@@ -148,6 +171,8 @@ class AudioRecognition:
 
     def clear_user_turn(self) -> None:
         self._audio_transcript = ""
+        self._turn_detector_cache_hits = 0
+        self._turn_detector_cache_misses = 0
         self._audio_interim_transcript = ""
         self._user_turn_committed = False
 
@@ -159,17 +184,20 @@ class AudioRecognition:
     def commit_user_turn(self, *, audio_detached: bool) -> None:
         async def _commit_user_turn(delay: float = 0.5):
             if time.time() - self._last_final_transcript_time > delay:
-                # flush the stt by pushing silence
+                # flush the stt by pushing silence (bypassing the input gate)
                 if audio_detached and self._sample_rate:
                     num_samples = int(self._sample_rate * 0.5)
-                    self.push_audio(
-                        rtc.AudioFrame(
-                            b"\x00\x00" * num_samples,
-                            sample_rate=self._sample_rate,
-                            num_channels=1,
-                            samples_per_channel=num_samples,
-                        )
+                    silence = rtc.AudioFrame(
+                        b"\x00\x00" * num_samples,
+                        sample_rate=self._sample_rate,
+                        num_channels=1,
+                        samples_per_channel=num_samples,
                     )
+                    if self._stt_ch is not None:
+                        self._stt_ch.send_nowait(silence)
+
+                    if self._vad_ch is not None:
+                        self._vad_ch.send_nowait(silence)
 
                 # wait for the final transcript to be available
                 await asyncio.sleep(delay)
@@ -246,6 +274,9 @@ class AudioRecognition:
 
     async def _on_vad_event(self, ev: vad.VADEvent) -> None:
         if ev.type == vad.VADEventType.START_OF_SPEECH:
+            if self._input_gate is not None:
+                self._input_gate.on_start_of_speech()
+
             self._hooks.on_start_of_speech(ev)
             self._speaking = True
 
@@ -257,6 +288,9 @@ class AudioRecognition:
             self._hooks.on_vad_inference_done(ev)
 
         elif ev.type == vad.VADEventType.END_OF_SPEECH:
+            if self._input_gate is not None:
+                self._input_gate.on_end_of_speech()
+
             self._hooks.on_end_of_speech(ev)
             self._speaking = False
             # when VAD fires END_OF_SPEECH, it already waited for the silence_duration
@@ -287,7 +321,20 @@ class AudioRecognition:
                 if not turn_detector.supports_language(self._last_language):
                     logger.debug("Turn detector does not support language %s", self._last_language)
                 else:
-                    end_of_turn_probability = await turn_detector.predict_end_of_turn(chat_ctx)
+                    # the cache info is optional (returned by the livekit turn detector), it's
+                    # returned for each call since the turn detector can be shared by sessions
+                    predict_with_cache_info = getattr(
+                        turn_detector, "predict_end_of_turn_with_cache_info", None
+                    )
+                    end_of_turn_probability: float
+                    if predict_with_cache_info is not None:
+                        end_of_turn_probability, cache_hit = await predict_with_cache_info(chat_ctx)
+                        if cache_hit:
+                            self._turn_detector_cache_hits += 1
+                        else:
+                            self._turn_detector_cache_misses += 1
+                    else:
+                        end_of_turn_probability = await turn_detector.predict_end_of_turn(chat_ctx)
                     tracing.Tracing.log_event(
                         "end of user turn probability",
                         {"probability": end_of_turn_probability},
@@ -310,14 +357,23 @@ class AudioRecognition:
                         self._last_final_transcript_time - last_speaking_time, 0
                     ),
                     end_of_utterance_delay=time.time() - last_speaking_time,
+                    turn_detector_cache_hits=self._turn_detector_cache_hits,
+                    turn_detector_cache_misses=self._turn_detector_cache_misses,
                 )
             )
             self._audio_transcript = ""
+            self._turn_detector_cache_hits = 0
+            self._turn_detector_cache_misses = 0
 
         if self._end_of_turn_task is not None:
             # TODO(theomonnom): disallow cancel if the extra sleep is done
             self._end_of_turn_task.cancel()
 
+        if self._audio_transcript and not self._manual_turn_detection:
+            # the turn may end with this transcript, allow to start generating a reply while
+            # waiting for the turn detector and the endpointing delay
+            self._hooks.on_speculative_turn(self._audio_transcript)
+
         # copy the last_speaking_time before awaiting (the value can change)
         self._end_of_turn_task = asyncio.create_task(_bounce_eou_task(self._last_speaking_time))
 
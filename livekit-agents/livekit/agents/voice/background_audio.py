@@ -2,9 +2,16 @@ from __future__ import annotations
 
 import asyncio
 import atexit
+import concurrent.futures
 import contextlib
 import enum
+import hashlib
+import os
 import random
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
 from collections.abc import AsyncGenerator, AsyncIterator
 from importlib.resources import as_file, files
 from typing import NamedTuple, Union, cast
@@ -60,6 +67,248 @@ class AudioConfig(NamedTuple):
 # Instead, we remove the sound from the mixer, and it will get removed 400ms later.
 _AUDIO_SOURCE_BUFFER_MS = 400
 
+_SAMPLE_RATE = 48000
+_NUM_CHANNELS = 1
+_CLIP_FRAME_DURATION = 0.1  # matches the blocksize of the mixer
+
+
+class _ClipKey(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+    sample_rate: int
+    num_channels: int
+    volume: float
+
+
+class _ClipCache:
+    """Process-wide cache of the PCM of audio files, decoded once at the mixer format.
+
+    Clips are keyed by the path, size and mtime of the file, the output format and the volume
+    (the gain is applied once, when the clip is cached). When mmap_dir is set, the PCM is also
+    written to that directory and memory-mapped, so the processes of a worker share the same
+    pages instead of each decoding and holding their own copy.
+
+    At most `max_clips` clips are kept in memory (least recently used first out), and the mmap
+    directory is pruned to `max_disk_size` bytes, oldest files first. Files of an outdated
+    version of a clip are removed when the new version is written.
+    """
+
+    def __init__(
+        self,
+        *,
+        mmap_dir: str | None = None,
+        max_clips: int = 32,
+        max_disk_size: int = 512 * 1024 * 1024,
+    ) -> None:
+        self._mmap_dir = mmap_dir
+        self._max_clips = max_clips
+        self._max_disk_size = max_disk_size
+        self._lock = threading.Lock()
+        # concurrent futures, jobs can run on different event loops/threads of the process
+        self._clips: OrderedDict[_ClipKey, concurrent.futures.Future[np.ndarray]] = OrderedDict()
+        self._load_tasks: dict[_ClipKey, asyncio.Task[np.ndarray]] = {}
+
+    async def get(
+        self, path: str, *, sample_rate: int, num_channels: int, volume: float = 1.0
+    ) -> np.ndarray:
+        st = os.stat(path)
+        key = _ClipKey(
+            os.path.abspath(path), st.st_size, st.st_mtime_ns, sample_rate, num_channels, volume
+        )
+        with self._lock:
+            fut = self._clips.get(key)
+            if fut is not None and not fut.done():
+                task = self._load_tasks.get(key)
+                if task is None or task.get_loop().is_closed():
+                    # the loop loading the clip is gone (e.g. its job ended), load it again
+                    fut.cancel()
+                    fut = None
+
+            if fut is None:
+                loading = fut = self._clips[key] = concurrent.futures.Future()
+                task = asyncio.create_task(
+                    self._load(
+                        key, path, sample_rate=sample_rate, num_channels=num_channels, volume=volume
+                    )
+                )
+                task.add_done_callback(lambda task: self._on_loaded(key, loading, task))
+                self._load_tasks[key] = task
+                self._evict()
+            else:
+                self._clips.move_to_end(key)
+
+        # wrap_future also works when the clip is loaded on another event loop. The future is
+        # shared by all the callers, cancelling one of them must not cancel it
+        return await asyncio.shield(asyncio.wrap_future(fut))
+
+    def _on_loaded(
+        self,
+        key: _ClipKey,
+        fut: concurrent.futures.Future[np.ndarray],
+        task: asyncio.Task[np.ndarray],
+    ) -> None:
+        with self._lock:
+            if self._load_tasks.get(key) is task:
+                del self._load_tasks[key]
+
+            if (task.cancelled() or task.exception() is not None) and self._clips.get(key) is fut:
+                del self._clips[key]  # retry on the next play
+
+        if fut.done():
+            return
+
+        if task.cancelled():
+            fut.cancel()
+        elif (exc := task.exception()) is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(task.result())
+
+    def _evict(self) -> None:
+        """Remove the least recently used clips over max_clips, called with the lock held"""
+        for key, fut in list(self._clips.items()):
+            if len(self._clips) <= self._max_clips:
+                break
+
+            if fut.done():
+                # the players of the clip keep their reference
+                del self._clips[key]
+
+    async def _load(
+        self, key: _ClipKey, path: str, *, sample_rate: int, num_channels: int, volume: float
+    ) -> np.ndarray:
+        mmap_path = self._mmap_path(key)
+        if mmap_path is not None and os.path.exists(mmap_path):
+            try:
+                cached = np.memmap(mmap_path, dtype=np.int16, mode="r")
+                with contextlib.suppress(OSError):
+                    os.utime(mmap_path)  # the directory is pruned by mtime
+                return cached
+            except (OSError, ValueError):
+                # removed by another process pruning the directory
+                logger.debug("failed to map the audio clip cache", exc_info=True)
+
+        if volume != 1.0:
+            pcm = await self.get(path, sample_rate=sample_rate, num_channels=num_channels)
+            scaled = pcm.astype(np.float32)
+            scaled *= volume
+            np.clip(scaled, -32768, 32767, out=scaled)
+            pcm = scaled.astype(np.int16)
+        else:
+            data = bytearray()
+            async for frame in audio_frames_from_file(
+                path, sample_rate=sample_rate, num_channels=num_channels
+            ):
+                data += frame.data.cast("B")
+            pcm = np.frombuffer(data, dtype=np.int16)
+
+        if mmap_path is None or not pcm.size:
+            return pcm
+
+        tmp_path = f"{mmap_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            pcm.tofile(tmp_path)
+            os.replace(tmp_path, mmap_path)  # atomic, other processes never see partial clips
+            mapped = np.memmap(mmap_path, dtype=np.int16, mode="r")
+        except (OSError, ValueError):
+            logger.debug("failed to write the audio clip cache", exc_info=True)
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            return pcm
+
+        self._prune_mmap_dir(mmap_path)
+        return mapped
+
+    def _mmap_path(self, key: _ClipKey) -> str | None:
+        if self._mmap_dir is None:
+            return None
+
+        try:
+            os.makedirs(self._mmap_dir, mode=0o700, exist_ok=True)
+            st = os.lstat(self._mmap_dir)
+        except OSError:
+            return None
+
+        # the directory has a predictable name in the shared tempdir, don't map the files of a
+        # directory created or writable by another user
+        if (
+            not stat.S_ISDIR(st.st_mode)
+            or (hasattr(os, "getuid") and st.st_uid != os.getuid())
+            or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        ):
+            logger.warning(
+                "the audio clip cache directory isn't private, the clips won't be memory-mapped",
+                extra={"mmap_dir": self._mmap_dir},
+            )
+            self._mmap_dir = None
+            return None
+
+        # the prefix identifies the clip, the suffix its version (size and mtime of the file)
+        clip_id = (key.path, key.sample_rate, key.num_channels, key.volume)
+        prefix = hashlib.sha1(repr(clip_id).encode()).hexdigest()[:16]
+        version = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(self._mmap_dir, f"{prefix}-{version}.pcm")
+
+    def _prune_mmap_dir(self, written_path: str) -> None:
+        """Remove the outdated versions of the clip just written, then the oldest clips while the
+        directory is larger than max_disk_size. Mapped files stay readable once removed."""
+        assert self._mmap_dir is not None
+        prefix = os.path.basename(written_path).split("-", 1)[0]
+        files: list[tuple[float, int, str]] = []
+        try:
+            with os.scandir(self._mmap_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".pcm") or entry.path == written_path:
+                        continue
+
+                    if entry.name.startswith(f"{prefix}-"):
+                        with contextlib.suppress(OSError):
+                            os.remove(entry.path)
+                        continue
+
+                    with contextlib.suppress(OSError):
+                        st = entry.stat()
+                        files.append((st.st_mtime, st.st_size, entry.path))
+
+            total_size = os.path.getsize(written_path) + sum(size for _, size, _ in files)
+        except OSError:
+            logger.debug("failed to prune the audio clip cache", exc_info=True)
+            return
+
+        for _, size, path in sorted(files):
+            if total_size <= self._max_disk_size:
+                break
+
+            with contextlib.suppress(OSError):
+                os.remove(path)
+                total_size -= size
+
+
+_clip_cache = _ClipCache(
+    mmap_dir=os.path.join(tempfile.gettempdir(), f"livekit-agents-audio-{os.getuid()}")
+    if hasattr(os, "getuid")
+    else None
+)
+
+
+async def _clip_frames(
+    pcm: np.ndarray, *, sample_rate: int, num_channels: int, loop: bool
+) -> AsyncGenerator[rtc.AudioFrame, None]:
+    frame_size = int(sample_rate * _CLIP_FRAME_DURATION) * num_channels
+    while True:
+        for i in range(0, len(pcm), frame_size):
+            chunk = pcm[i : i + frame_size]
+            yield rtc.AudioFrame(
+                data=chunk.data,
+                sample_rate=sample_rate,
+                num_channels=num_channels,
+                samples_per_channel=len(chunk) // num_channels,
+            )
+
+        if not loop or not len(pcm):
+            break
+
 
 class BackgroundAudioPlayer:
     def __init__(
@@ -97,8 +346,15 @@ class BackgroundAudioPlayer:
         self._ambient_sound = ambient_sound if is_given(ambient_sound) else None
         self._thinking_sound = thinking_sound if is_given(thinking_sound) else None
 
-        self._audio_source = rtc.AudioSource(48000, 1, queue_size_ms=_AUDIO_SOURCE_BUFFER_MS)
-        self._audio_mixer = rtc.AudioMixer(48000, 1, blocksize=4800, capacity=1)
+        self._audio_source = rtc.AudioSource(
+            _SAMPLE_RATE, _NUM_CHANNELS, queue_size_ms=_AUDIO_SOURCE_BUFFER_MS
+        )
+        self._audio_mixer = rtc.AudioMixer(
+            _SAMPLE_RATE,
+            _NUM_CHANNELS,
+            blocksize=int(_SAMPLE_RATE * _CLIP_FRAME_DURATION),
+            capacity=1,
+        )
         self._publication: rtc.LocalTrackPublication | None = None
         self._lock = asyncio.Lock()
 
@@ -322,10 +578,14 @@ class BackgroundAudioPlayer:
             sound = sound.path()
 
         if isinstance(sound, str):
-            if loop:
-                sound = _loop_audio_frames(sound)
-            else:
-                sound = audio_frames_from_file(sound)
+            # files are decoded once per process (with the volume applied) and played from memory
+            pcm = await _clip_cache.get(
+                sound, sample_rate=_SAMPLE_RATE, num_channels=_NUM_CHANNELS, volume=volume
+            )
+            sound = _clip_frames(
+                pcm, sample_rate=_SAMPLE_RATE, num_channels=_NUM_CHANNELS, loop=loop
+            )
+            volume = 1.0
 
         async def _gen_wrapper() -> AsyncGenerator[rtc.AudioFrame, None]:
             async for frame in sound:
@@ -415,9 +675,3 @@ class PlayHandle:
     def _mark_playout_done(self) -> None:
         with contextlib.suppress(asyncio.InvalidStateError):
             self._done_fut.set_result(None)
-
-
-async def _loop_audio_frames(file_path: str) -> AsyncGenerator[rtc.AudioFrame, None]:
-    while True:
-        async for frame in audio_frames_from_file(file_path):
-            yield frame
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import contextlib
 import functools
 import time
 from dataclasses import dataclass, field
@@ -122,6 +121,18 @@ class _AudioData:
     sr_data_annotated: _SpeakingRateData | None = None  # speaking rate from `start_time`
 
 
+@dataclass
+class _SentenceTimeline:
+    """words of a sentence to emit, with their syllable count"""
+
+    sentence: str
+    words: list[tuple[int, int]]
+    """(end position, hyphens) of each word"""
+    done: asyncio.Future[None]
+    index: int = 0
+    text_cursor: int = 0
+
+
 @dataclass
 class _TextData:
     sentence_stream: tokenize.SentenceStream
@@ -150,6 +161,12 @@ class _SegmentSynchronizerImpl:
         self._out_ch = utils.aio.Chan[str]()
         self._close_future = asyncio.Future[None]()
 
+        # the words are emitted by the timer wheel shared by the sessions of the event loop
+        self._wheel = utils.aio.shared_timer_wheel()
+        self._timeline: _SentenceTimeline | None = None
+        self._timer: utils.aio.TimerWheelHandle | None = None
+        self._next_word_at: float | None = None  # loop time
+
         self._main_atask = asyncio.create_task(self._main_task())
         self._main_atask.add_done_callback(lambda _: self._out_ch.close())
         self._capture_atask = asyncio.create_task(self._capture_task())
@@ -255,6 +272,7 @@ class _SegmentSynchronizerImpl:
         # transcript is sent. (In case we're late)
         if not interrupted:
             self._playback_completed = True
+            self._flush_timeline()
 
     @property
     def synchronized_transcript(self) -> str:
@@ -289,49 +307,138 @@ class _SegmentSynchronizerImpl:
         assert self._start_wall_time is not None
 
         async for text_seg in self._text_data.sentence_stream:
+            if self.closed and not self._playback_completed:
+                return
+
             sentence = text_seg.token
-            text_cursor = 0
-            for word, _, end_pos in self._opts.split_words(sentence):
-                if self.closed and not self._playback_completed:
-                    return
-
-                if self._playback_completed:
-                    self._out_ch.send_nowait(sentence[text_cursor:end_pos])
-                    text_cursor = end_pos
-                    continue
-
-                word_hyphens = len(self._opts.hyphenate_word(word))
-                elapsed = time.time() - self._start_wall_time
-
-                target_hyphens: float | None = None
-                if self._audio_data.sr_data_annotated:
-                    # use the actual speaking rate
-                    target_hyphens = self._audio_data.sr_data_annotated.accumulate_to(elapsed)
-                elif self._speed_on_speaking_unit:
-                    # use the estimated speed from speaking rate
-                    target_speaking_units = self._audio_data.sr_data_est.accumulate_to(elapsed)
-                    target_hyphens = target_speaking_units * self._speed_on_speaking_unit
-
-                if target_hyphens is not None:
-                    dt = np.ceil(target_hyphens) - self._text_data.forwarded_hyphens
-                    delay = max(0.0, word_hyphens - dt) / self._speed
-                else:
-                    delay = word_hyphens / self._speed
-
-                # if playback completed, flush the word as soon as possible
-                if self._playback_completed:
-                    delay = 0
-
-                await self._sleep_if_not_closed(delay / 2.0)
-                self._out_ch.send_nowait(sentence[text_cursor:end_pos])
-                await self._sleep_if_not_closed(delay / 2.0)
-
-                self._text_data.forwarded_hyphens += word_hyphens
-                text_cursor = end_pos
-
-            if text_cursor < len(sentence):
-                # send the remaining text (e.g. new line or spaces)
-                self._out_ch.send_nowait(sentence[text_cursor:])
+            if self._playback_completed:
+                self._out_ch.send_nowait(sentence)
+                continue
+
+            # the syllables of the whole sentence are computed once, the words are then emitted
+            # by the timer callbacks without waking up this task
+            timeline = _SentenceTimeline(
+                sentence=sentence,
+                words=[
+                    (end_pos, len(self._opts.hyphenate_word(word)))
+                    for word, _, end_pos in self._opts.split_words(sentence)
+                ],
+                done=asyncio.get_running_loop().create_future(),
+            )
+            self._timeline = timeline
+            self._schedule_next_word()
+            await timeline.done
+            self._timeline = None
+
+    def _schedule_next_word(self) -> None:
+        """Called when the previous word is done, computes when the next word is emitted (in
+        the middle of its estimated duration) and when the following one starts."""
+        timeline = self._timeline
+        assert timeline is not None and self._start_wall_time is not None
+
+        while timeline.index < len(timeline.words):
+            _, word_hyphens = timeline.words[timeline.index]
+            elapsed = time.time() - self._start_wall_time
+
+            target_hyphens: float | None = None
+            if self._audio_data.sr_data_annotated:
+                # use the actual speaking rate
+                target_hyphens = self._audio_data.sr_data_annotated.accumulate_to(elapsed)
+            elif self._speed_on_speaking_unit:
+                # use the estimated speed from speaking rate
+                target_speaking_units = self._audio_data.sr_data_est.accumulate_to(elapsed)
+                target_hyphens = target_speaking_units * self._speed_on_speaking_unit
+
+            if target_hyphens is not None:
+                dt = np.ceil(target_hyphens) - self._text_data.forwarded_hyphens
+                delay = max(0.0, word_hyphens - dt) / self._speed
+            else:
+                delay = word_hyphens / self._speed
+
+            now = self._wheel.time()
+            # start from the deadline of the previous word, so the timers fired late by up to a
+            # tick don't make the text drift behind the audio
+            start = now
+            if self._next_word_at is not None:
+                start = max(self._next_word_at, now - self._wheel.tick)
+
+            next_word_at = self._next_word_at = start + delay
+            emit_at = start + delay / 2.0
+            if emit_at > now:
+                self._timer = self._wheel.call_at(emit_at, self._on_timer, self._on_emit_word)
+                return
+
+            self._emit_word()
+            if next_word_at > now:
+                self._timer = self._wheel.call_at(
+                    next_word_at, self._on_timer, self._schedule_next_word
+                )
+                return
+
+        self._finish_timeline()
+
+    def _on_timer(self, callback: Callable[[], None]) -> None:
+        """Run a callback of the timeline, an error resolves the timeline so _main_task isn't
+        left waiting for words that will never be emitted"""
+        try:
+            callback()
+        except Exception:
+            logger.exception("error synchronizing the transcript")
+            self._timer = None
+            timeline = self._timeline
+            if timeline is not None and not timeline.done.done():
+                timeline.done.set_result(None)
+
+    def _on_emit_word(self) -> None:
+        assert self._next_word_at is not None
+        self._emit_word()
+        self._timer = self._wheel.call_at(
+            self._next_word_at, self._on_timer, self._schedule_next_word
+        )
+
+    def _emit_word(self) -> None:
+        timeline = self._timeline
+        assert timeline is not None
+
+        end_pos, word_hyphens = timeline.words[timeline.index]
+        self._out_ch.send_nowait(timeline.sentence[timeline.text_cursor : end_pos])
+        self._text_data.forwarded_hyphens += word_hyphens
+        timeline.text_cursor = end_pos
+        timeline.index += 1
+
+    def _finish_timeline(self) -> None:
+        timeline = self._timeline
+        assert timeline is not None
+
+        if timeline.text_cursor < len(timeline.sentence):
+            # send the remaining text (e.g. new line or spaces)
+            self._out_ch.send_nowait(timeline.sentence[timeline.text_cursor :])
+            timeline.text_cursor = len(timeline.sentence)
+
+        if not timeline.done.done():
+            timeline.done.set_result(None)
+
+    def _flush_timeline(self) -> None:
+        """the playback is completed, send the rest of the sentence immediately"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._timeline is None or self._timeline.done.done():
+            return
+
+        while self._timeline.index < len(self._timeline.words):
+            self._emit_word()
+        self._finish_timeline()
+
+    def _stop_timeline(self) -> None:
+        """closed before the end of the playback, the rest of the text is dropped"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._timeline is not None and not self._timeline.done.done():
+            self._timeline.done.set_result(None)
 
     def _calc_hyphens(self, text: str) -> list[str]:
         """Calculate hyphens for text."""
@@ -342,16 +449,14 @@ class _SegmentSynchronizerImpl:
             hyphens.extend(new)
         return hyphens
 
-    async def _sleep_if_not_closed(self, delay: float) -> None:
-        with contextlib.suppress(asyncio.TimeoutError):
-            await asyncio.wait([self._close_future], timeout=delay)
-
     async def aclose(self) -> None:
         if self.closed:
             return
 
         self._close_future.set_result(None)
         self._start_fut.set()  # avoid deadlock of main_task in case it never started
+        if not self._playback_completed:
+            self._stop_timeline()
         await self._text_data.sentence_stream.aclose()
         await self._audio_data.sr_stream.aclose()
         await self._capture_atask
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import dataclasses
 import datetime
 import inspect
 import json
@@ -23,17 +24,18 @@ import math
 import multiprocessing as mp
 import os
 import sys
-import threading
 import time
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import reduce
+from multiprocessing.context import BaseContext
 from typing import Any, Callable, Generic, Literal, TypeVar
 from urllib.parse import urljoin, urlparse
 
 import aiohttp
 import jwt
+import psutil
 from aiohttp import web
 
 from livekit import api, rtc
@@ -43,6 +45,7 @@ from . import http_server, ipc, utils
 from ._exceptions import AssignmentTimeoutError
 from .debug import tracing
 from .inference_runner import _InferenceRunner
+from .ipc.proc_autoscaler import IdleProcessAutoscaling
 from .job import (
     JobAcceptArguments,
     JobContext,
@@ -54,12 +57,16 @@ from .job import (
 from .log import DEV_LEVEL, logger
 from .types import NOT_GIVEN, NotGivenOr
 from .utils import is_given
-from .utils.hw import get_cpu_monitor
+from .utils.hw import CPULoadSampler, get_cpu_monitor, get_memory_monitor, get_process_memory
 from .version import __version__
 
 ASSIGNMENT_TIMEOUT = 7.5
 UPDATE_STATUS_INTERVAL = 2.5
 UPDATE_LOAD_INTERVAL = 0.5
+# reading the PSS of every process is more expensive than the memory usage of the machine
+UPDATE_PROCESS_MEMORY_INTERVAL = 5.0
+# warn when the cgroup of the worker is throttled during this fraction of its CPU periods
+CPU_THROTTLED_WARN_RATIO = 0.1
 
 
 def _default_initialize_process_fnc(proc: JobProcess) -> Any:
@@ -82,33 +89,10 @@ class SimulateJobInfo:
 
 
 class _DefaultLoadCalc:
-    _instance = None
-
-    def __init__(self) -> None:
-        self._m_avg = utils.MovingAverage(5)  # avg over 2.5
-        self._cpu_monitor = get_cpu_monitor()
-        self._thread = threading.Thread(
-            target=self._calc_load, daemon=True, name="worker_cpu_load_monitor"
-        )
-        self._lock = threading.Lock()
-        self._thread.start()
-
-    def _calc_load(self) -> None:
-        while True:
-            cpu_p = self._cpu_monitor.cpu_percent(interval=0.5)
-            with self._lock:
-                self._m_avg.add_sample(cpu_p)
-
-    def _get_avg(self) -> float:
-        with self._lock:
-            return self._m_avg.get_avg()
-
     @classmethod
     def get_load(cls, worker: Worker) -> float:
-        if cls._instance is None:
-            cls._instance = _DefaultLoadCalc()
-
-        return cls._instance._m_avg.get_avg()
+        # the sampler only reads the CPU counters, it is also sampled by the load task
+        return worker._cpu_sampler.sample()
 
 
 @dataclass
@@ -155,7 +139,10 @@ class WorkerOptions:
     prewarm_fnc: Callable[[JobProcess], Any] = _default_initialize_process_fnc
     """A function to perform any necessary initialization before the job starts."""
     load_fnc: Callable[[Worker], float] | Callable[[], float] = _DefaultLoadCalc.get_load
-    """Called to determine the current load of the worker. Should return a value between 0 and 1."""
+    """Called to determine the current load of the worker. Should return a value between 0 and 1.
+
+    Defaults to the CPU usage of the machine (or of the cgroup of the worker), exponentially
+    smoothed over 2.5 seconds."""
     job_executor_type: JobExecutorType = _default_job_executor_type
     """Which executor to use to run jobs. (currently thread or process are supported)"""
     load_threshold: float | _WorkerEnvOption[float] = _WorkerEnvOption(
@@ -165,6 +152,18 @@ class WorkerOptions:
 
     Defaults to 0.75 on "production" mode, and is disabled in "development" mode.
     """
+    memory_threshold: float | _WorkerEnvOption[float] = _WorkerEnvOption(
+        dev_default=math.inf, prod_default=0.9
+    )
+    """When the memory used on the machine (or inside the cgroup of the worker) exceeds this
+    fraction of the memory limit, the worker is marked as unavailable and rejects new jobs.
+    The average memory (PSS) of the running jobs is added to the memory used, so a new job is
+    only accepted when there is room left for it.
+
+    The memory usage is also reported as the load of the worker when it is higher than the load
+    returned by load_fnc, so jobs are assigned to the workers with more memory left first.
+    Defaults to 0.9 on "production" mode, and is disabled in "development" mode.
+    """
 
     job_memory_warn_mb: float = 500
     """Memory warning threshold in MB. If the job process exceeds this limit, a warning will be logged."""  # noqa: E501
@@ -178,10 +177,41 @@ class WorkerOptions:
         dev_default=0, prod_default=math.ceil(get_cpu_monitor().cpu_count())
     )
     """Number of idle processes to keep warm."""
+    idle_process_autoscaling: IdleProcessAutoscaling | None = None
+    """Adjust the number of idle processes from the job arrival rate, the time the jobs waited for
+    a process, the warmup time of the processes and the available memory. num_idle_processes is
+    then the maximum. By default, the number of idle processes only depends on the load."""
+    multiprocessing_context: Literal["spawn", "forkserver"] = "spawn"
+    """Start method of the job and inference processes.
+
+    With "spawn", each process starts a new interpreter and imports livekit, the plugins and their
+    models again before running prewarm_fnc. With "forkserver", a server process imports them
+    once (including the module of the agent) and the processes are forked from it on demand. The
+    prewarm_fnc still runs inside each process, as what it loads may hold threads or connections
+    that can't be shared by forking. Not available on Windows."""
     shutdown_process_timeout: float = 60.0
     """Maximum amount of time to wait for a job to shut down gracefully"""
     initialize_process_timeout: float = 10.0
     """Maximum amount of time to wait for a process to initialize/prewarm"""
+    num_inference_processes: int | _WorkerEnvOption[int] = _WorkerEnvOption(
+        dev_default=1, prod_default=math.ceil(get_cpu_monitor().cpu_count() / 8)
+    )
+    """Number of processes running the inference runners (e.g. turn detection). Each request is
+    routed to the process with the fewest outstanding requests, and a process that exits is
+    respawned.
+
+    Defaults to one process for every 8 CPUs on "production" mode, and 1 in "development" mode."""
+    inference_num_threads: int = 0
+    """Number of threads of each inference process running the requests of a runner. Defaults
+    to 0 (the default size of a ThreadPoolExecutor)."""
+    inference_intra_op_threads: int = 0
+    """Number of threads a single inference may use (e.g. the intra-op threads of the ONNX turn
+    detector). Defaults to 0, the CPUs are split between the inference processes when there are
+    more than one, otherwise the runtime decides."""
+    ipc_shm_ring_size: int = 0
+    """Size in bytes of the shared memory rings used to exchange messages with the job and
+    inference processes. The unix socket is then only used for wakeups. Defaults to 0
+    (disabled, every message goes through the socket)."""
     permissions: WorkerPermissions = field(default_factory=WorkerPermissions)
     """Permissions that the agent should join the room with."""
     agent_name: str = ""
@@ -222,6 +252,36 @@ class WorkerOptions:
                 f"load_threshold in prod env must be less than 1, current value: {load_threshold}"
             )
 
+        memory_threshold = _WorkerEnvOption.getvalue(self.memory_threshold, devmode)
+        if memory_threshold > 1 and not devmode:
+            logger.warning(
+                "memory_threshold in prod env must be less than 1, "
+                f"current value: {memory_threshold}"
+            )
+
+
+def _multiprocessing_context(method: Literal["spawn", "forkserver"]) -> BaseContext:
+    if method == "forkserver":
+        if sys.platform.startswith("win"):
+            logger.warning("the forkserver multiprocessing context isn't available on Windows")
+            return mp.get_context("spawn")
+
+        # the module of the agent must be preloaded for the processes to find the functions
+        # (entrypoint, prewarm) defined inside it
+        preload = ["__main__", "livekit.agents"]
+        preload.extend(
+            sorted(
+                name
+                for name in sys.modules
+                if name.startswith("livekit.plugins.") and name.count(".") == 2
+            )
+        )
+        mp_ctx = mp.get_context("forkserver")
+        mp_ctx.set_forkserver_preload(preload)
+        return mp_ctx
+
+    return mp.get_context("spawn")
+
 
 @dataclass
 class WorkerInfo:
@@ -277,13 +337,22 @@ class Worker(utils.EventEmitter[EventTypes]):
         self._devmode = devmode
         self._register = register
 
-        # using spawn context for all platforms. We may have further optimizations for
-        # Linux with forkserver, but for now, this is the safest option
-        mp_ctx = mp.get_context("spawn")
+        mp_ctx = _multiprocessing_context(opts.multiprocessing_context)
 
-        self._inference_executor: ipc.inference_proc_executor.InferenceProcExecutor | None = None
+        self._inference_executor: ipc.inference_pool.InferencePool | None = None
         if len(_InferenceRunner.registered_runners) > 0:
-            self._inference_executor = ipc.inference_proc_executor.InferenceProcExecutor(
+            num_inference_processes = _WorkerEnvOption.getvalue(
+                opts.num_inference_processes, self._devmode
+            )
+            intra_op_threads = opts.inference_intra_op_threads
+            if intra_op_threads <= 0 and num_inference_processes > 1:
+                # don't let every inference process use all the CPUs
+                intra_op_threads = max(
+                    1, int(get_cpu_monitor().cpu_count() // num_inference_processes)
+                )
+
+            self._inference_executor = ipc.inference_pool.InferencePool(
+                num_processes=num_inference_processes,
                 runners=_InferenceRunner.registered_runners,
                 initialize_timeout=30,
                 close_timeout=5,
@@ -295,6 +364,9 @@ class Worker(utils.EventEmitter[EventTypes]):
                 mp_ctx=mp_ctx,
                 loop=self._loop,
                 http_proxy=opts.http_proxy or None,
+                shm_ring_size=opts.ipc_shm_ring_size,
+                num_threads=opts.inference_num_threads,
+                intra_op_threads=intra_op_threads,
             )
 
         self._proc_pool = ipc.proc_pool.ProcPool(
@@ -310,6 +382,8 @@ class Worker(utils.EventEmitter[EventTypes]):
             memory_warn_mb=opts.job_memory_warn_mb,
             memory_limit_mb=opts.job_memory_limit_mb,
             http_proxy=opts.http_proxy or None,
+            shm_ring_size=opts.ipc_shm_ring_size,
+            autoscaling=opts.idle_process_autoscaling,
         )
 
         self._previous_status = agent.WorkerStatus.WS_AVAILABLE
@@ -326,11 +400,29 @@ class Worker(utils.EventEmitter[EventTypes]):
             return web.Response(text="OK")
 
         async def worker(_: Any):
+            cpu_stats = self._cpu_sampler.stats
             body = json.dumps(
                 {
                     "agent_name": self._opts.agent_name,
                     "worker_type": agent.JobType.Name(self._opts.worker_type.value),
                     "active_jobs": len(self.active_jobs),
+                    "load": self._worker_load,
+                    "cpu_load": self._cpu_sampler.load,
+                    "cpu_throttled_ratio": self._cpu_sampler.throttled_ratio,
+                    "cpu_nr_throttled": cpu_stats.nr_throttled if cpu_stats else 0,
+                    "cpu_throttled_usec": cpu_stats.throttled_usec if cpu_stats else 0,
+                    "memory_pressure": self._memory_pressure,
+                    "job_processes_memory_mb": self._job_processes_memory_mb,
+                    "inference_processes_memory_mb": self._inference_processes_memory_mb,
+                    "job_memory_pressure": self._job_memory_pressure,
+                    "idle_processes": self._proc_pool.num_idle_processes,
+                    "target_idle_processes": self._target_idle_processes(),
+                    "idle_process_autoscaling": (
+                        dataclasses.asdict(autoscaler.decision)
+                        if (autoscaler := self._proc_pool.autoscaler) and autoscaler.decision
+                        else None
+                    ),
+                    "jobs": self._running_jobs_status(),
                 }
             )
             return web.Response(body=body, content_type="application/json")
@@ -352,6 +444,33 @@ class Worker(utils.EventEmitter[EventTypes]):
             max_data_points=int(1 / UPDATE_LOAD_INTERVAL * 30),
         )
 
+        self._cpu_sampler = CPULoadSampler()
+        self._cpu_throttled = False
+        self._job_cpu_load: dict[int, float] = {}
+        self._cpu_throttled_graph = tracing.Tracing.add_graph(
+            title="cpu_throttled_ratio",
+            x_label="time",
+            y_label="throttled",
+            x_type="time",
+            y_range=(0, 1),
+            max_data_points=int(1 / UPDATE_LOAD_INTERVAL * 30),
+        )
+
+        self._memory_monitor = get_memory_monitor()
+        self._memory_pressure: float = 0.0
+        self._job_processes_memory_mb: float = 0.0
+        self._inference_processes_memory_mb: float = 0.0
+        # expected memory of a new job relative to the memory limit, kept free by the admission
+        self._job_memory_pressure: float = 0.0
+        self._memory_pressure_graph = tracing.Tracing.add_graph(
+            title="memory_pressure",
+            x_label="time",
+            y_label="memory",
+            x_type="time",
+            y_range=(0, 1),
+            max_data_points=int(1 / UPDATE_LOAD_INTERVAL * 30),
+        )
+
         default_num_idle_processes = _WorkerEnvOption.getvalue(
             self._opts.num_idle_processes, self._devmode
         )
@@ -373,6 +492,89 @@ class Worker(utils.EventEmitter[EventTypes]):
             max_data_points=int(1 / UPDATE_LOAD_INTERVAL * 30),
         )
 
+    def _job_pids(self) -> list[int]:
+        return [
+            proc.pid
+            for proc in self._proc_pool.processes
+            if isinstance(proc, ipc.job_proc_executor.ProcJobExecutor) and proc.pid
+        ]
+
+    def _running_jobs_status(self) -> list[dict[str, Any]]:
+        jobs = []
+        for proc in self._proc_pool.processes:
+            if proc.running_job is None:
+                continue
+
+            pid = proc.pid if isinstance(proc, ipc.job_proc_executor.ProcJobExecutor) else None
+            jobs.append(
+                {
+                    "job_id": proc.running_job.job.id,
+                    "pid": pid,
+                    "cpu_load": self._job_cpu_load.get(pid) if pid else None,
+                }
+            )
+        return jobs
+
+    def _update_cpu_throttling(self) -> None:
+        throttled_ratio = self._cpu_sampler.throttled_ratio
+        throttled = throttled_ratio >= CPU_THROTTLED_WARN_RATIO
+        if throttled != self._cpu_throttled:
+            # only log when the state changes
+            self._cpu_throttled = throttled
+            stats = self._cpu_sampler.stats
+            extra = {
+                "throttled_ratio": round(throttled_ratio, 3),
+                "nr_throttled": stats.nr_throttled if stats else 0,
+                "throttled_usec": stats.throttled_usec if stats else 0,
+                "cpu_load": self._cpu_sampler.load,
+            }
+            if throttled:
+                logger.warning("the worker cgroup is throttled by its CPU quota", extra=extra)
+            else:
+                logger.info("the worker cgroup is no longer throttled", extra=extra)
+
+    async def _update_processes_memory(self) -> None:
+        job_pids = self._job_pids()
+        running_job_pids = {
+            proc.pid
+            for proc in self._proc_pool.processes
+            if isinstance(proc, ipc.job_proc_executor.ProcJobExecutor)
+            and proc.pid
+            and proc.running_job is not None
+        }
+        inference_pids = []
+        if self._inference_executor is not None:
+            inference_pids = [proc.pid for proc in self._inference_executor.processes if proc.pid]
+
+        def _memory_mb(pids: list[int]) -> dict[int, float]:
+            memory = {}
+            for pid in pids:
+                with contextlib.suppress(psutil.Error):
+                    memory[pid] = get_process_memory(pid) / (1024 * 1024)
+            return memory
+
+        loop = asyncio.get_event_loop()
+        job_memory = await loop.run_in_executor(None, _memory_mb, job_pids)
+        inference_memory = await loop.run_in_executor(None, _memory_mb, inference_pids)
+        memory_limit = await loop.run_in_executor(None, self._memory_monitor.memory_limit)
+        memory_limit_mb = memory_limit / (1024 * 1024)
+
+        self._job_processes_memory_mb = sum(job_memory.values())
+        self._inference_processes_memory_mb = sum(inference_memory.values())
+
+        # a new job is expected to grow as much as the running ones
+        running = [mb for pid, mb in job_memory.items() if pid in running_job_pids]
+        if running and memory_limit_mb > 0:
+            self._job_memory_pressure = sum(running) / len(running) / memory_limit_mb
+        else:
+            self._job_memory_pressure = 0.0
+
+    def _target_idle_processes(self) -> int:
+        target = self._proc_pool.target_idle_processes
+        if self._proc_pool.autoscaler is not None:
+            target = min(target, self._proc_pool.autoscaler.target)
+        return target
+
     @property
     def worker_info(self) -> WorkerInfo:
         return WorkerInfo(http_port=self._http_server.port)
@@ -386,10 +588,17 @@ class Worker(utils.EventEmitter[EventTypes]):
             extra={"version": __version__, "rtc-version": rtc.__version__},
         )
 
+        if self._opts.multiprocessing_context == "forkserver" and not sys.platform.startswith(
+            "win"
+        ):
+            # start the server now, it imports the preloaded modules while the worker starts
+            from multiprocessing import forkserver
+
+            await self._loop.run_in_executor(None, forkserver.ensure_running)
+
         if self._inference_executor is not None:
             logger.info("starting inference executor")
             await self._inference_executor.start()
-            await self._inference_executor.initialize()
 
         self._closed = False
 
@@ -415,6 +624,7 @@ class Worker(utils.EventEmitter[EventTypes]):
         async def _load_task():
             """periodically check load"""
             interval = utils.aio.interval(UPDATE_LOAD_INTERVAL)
+            next_process_memory_update = 0.0
             while True:
                 await interval.tick()
 
@@ -426,7 +636,23 @@ class Worker(utils.EventEmitter[EventTypes]):
 
                     return self._opts.load_fnc(self)  # type: ignore
 
-                self._worker_load = await asyncio.get_event_loop().run_in_executor(None, load_fnc)
+                # reading the counters doesn't block, the load task is the sampling timer
+                self._cpu_sampler.sample()
+                self._job_cpu_load = self._cpu_sampler.process_load(self._job_pids())
+                self._update_cpu_throttling()
+
+                loop = asyncio.get_event_loop()
+                if self._opts.load_fnc == _DefaultLoadCalc.get_load:
+                    self._worker_load = _DefaultLoadCalc.get_load(self)
+                else:
+                    self._worker_load = await loop.run_in_executor(None, load_fnc)
+                self._memory_pressure = await loop.run_in_executor(
+                    None, self._memory_monitor.memory_pressure
+                )
+
+                if time.monotonic() >= next_process_memory_update:
+                    next_process_memory_update = time.monotonic() + UPDATE_PROCESS_MEMORY_INTERVAL
+                    await self._update_processes_memory()
 
                 load_threshold = _WorkerEnvOption.getvalue(self._opts.load_threshold, self._devmode)
                 default_num_idle_processes = _WorkerEnvOption.getvalue(
@@ -446,11 +672,13 @@ class Worker(utils.EventEmitter[EventTypes]):
                     else:
                         self._proc_pool.set_target_idle_processes(default_num_idle_processes)
 
-                self._num_idle_target_graph.plot(time.time(), self._proc_pool.target_idle_processes)
+                self._num_idle_target_graph.plot(time.time(), self._target_idle_processes())
                 self._num_idle_process_graph.plot(
                     time.time(), self._proc_pool._warmed_proc_queue.qsize()
                 )
                 self._worker_load_graph.plot(time.time(), self._worker_load)
+                self._memory_pressure_graph.plot(time.time(), self._memory_pressure)
+                self._cpu_throttled_graph.plot(time.time(), self._cpu_sampler.throttled_ratio)
 
         tasks = []
         self._load_task = asyncio.create_task(_load_task(), name="load_task")
@@ -848,6 +1076,21 @@ class Worker(utils.EventEmitter[EventTypes]):
 
         job_req = JobRequest(job=msg.job, on_reject=_on_reject, on_accept=_on_accept)
 
+        if self._is_out_of_memory():
+            # the status update marking the worker as full may not have been received yet
+            logger.warning(
+                "rejecting job request, the worker is running out of memory",
+                extra={
+                    "job_id": msg.job.id,
+                    "memory_pressure": self._memory_pressure,
+                    "job_memory_pressure": self._job_memory_pressure,
+                    "memory_threshold": self._opts.memory_threshold,
+                    "agent_name": self._opts.agent_name,
+                },
+            )
+            await _on_reject()
+            return
+
         logger.info(
             "received job request",
             extra={
@@ -898,6 +1141,10 @@ class Worker(utils.EventEmitter[EventTypes]):
             return
         await proc.aclose()
 
+    def _is_out_of_memory(self) -> bool:
+        memory_threshold = _WorkerEnvOption.getvalue(self._opts.memory_threshold, self._devmode)
+        return self._memory_pressure + self._job_memory_pressure >= memory_threshold
+
     async def _update_worker_status(self):
         job_cnt = len(self.active_jobs)
         if self._draining:
@@ -907,14 +1154,16 @@ class Worker(utils.EventEmitter[EventTypes]):
             return
 
         load_threshold = _WorkerEnvOption.getvalue(self._opts.load_threshold, self._devmode)
-        is_full = self._worker_load >= load_threshold
+        is_full = self._worker_load >= load_threshold or self._is_out_of_memory()
         currently_available = not is_full and not self._draining
 
         status = (
             agent.WorkerStatus.WS_AVAILABLE if currently_available else agent.WorkerStatus.WS_FULL
         )
 
-        update = agent.UpdateWorkerStatus(load=self._worker_load, status=status, job_count=job_cnt)
+        # workers close to running out of memory are the last ones to get new jobs
+        load = max(self._worker_load, self._memory_pressure)
+        update = agent.UpdateWorkerStatus(load=load, status=status, job_count=job_cnt)
 
         # only log if status has changed
         if self._previous_status != status and not self._draining:
@@ -922,6 +1171,9 @@ class Worker(utils.EventEmitter[EventTypes]):
             extra = {
                 "load": self._worker_load,
                 "threshold": self._opts.load_threshold,
+                "memory_pressure": self._memory_pressure,
+                "job_memory_pressure": self._job_memory_pressure,
+                "memory_threshold": self._opts.memory_threshold,
             }
             if is_full:
                 logger.info(
@@ -166,7 +166,7 @@ class LLM(llm.LLM):
                         anthropic_tool_choice["disable_parallel_tool_use"] = not parallel_tool_calls
                     extra["tool_choice"] = anthropic_tool_choice
 
-        anthropic_ctx, system_message = to_chat_ctx(chat_ctx, id(self), caching=self._opts.caching)
+        anthropic_ctx, system_message = to_chat_ctx(chat_ctx, caching=self._opts.caching)
 
         if system_message:
             extra["system"] = [system_message]
@@ -1,13 +1,30 @@
 import base64
 import json
-from typing import Any, Literal
+from typing import Any, Literal, Union
 
 import anthropic
 from livekit.agents import llm
 from livekit.agents.llm import FunctionTool
+from livekit.agents.types import NOT_GIVEN, NotGivenOr
+from livekit.agents.utils import is_given
+
+from .log import logger
 
 CACHE_CONTROL_EPHEMERAL = anthropic.types.CacheControlEphemeralParam(type="ephemeral")
 
+_ContentBlockParam = Union[
+    anthropic.types.TextBlockParam,
+    anthropic.types.ImageBlockParam,
+    anthropic.types.ToolUseBlockParam,
+    anthropic.types.ToolResultBlockParam,
+]
+
+# the converted items are reused across turns, only new or modified items are converted
+_content_cache: llm.utils.ConversionCache[list[_ContentBlockParam]] = llm.utils.ConversionCache()
+_image_cache: llm.utils.ConversionCache[anthropic.types.ImageBlockParam] = (
+    llm.utils.ConversionCache()
+)
+
 __all__ = ["to_fnc_ctx", "to_chat_ctx"]
 
 
@@ -26,13 +43,17 @@ def to_fnc_ctx(
 
 def to_chat_ctx(
     chat_ctx: llm.ChatContext,
-    cache_key: Any,
-    caching: Literal["ephemeral"] | None,
+    # deprecated, the conversions are cached per item
+    cache_key: NotGivenOr[Any] = NOT_GIVEN,
+    caching: Literal["ephemeral"] | None = None,
 ) -> list[anthropic.types.MessageParam]:
+    if is_given(cache_key):
+        logger.warning("cache_key is deprecated and will be removed in 1.5.0, it is no longer used")
+
     messages: list[anthropic.types.MessageParam] = []
     system_message: anthropic.types.TextBlockParam | None = None
     current_role: str | None = None
-    content: list[anthropic.types.TextBlockParam] = []
+    content: list[_ContentBlockParam] = []
     for i, msg in enumerate(chat_ctx.items):
         if msg.type == "message" and msg.role == "system":
             for content in msg.content:
@@ -62,35 +83,11 @@ def to_chat_ctx(
             content = []
             current_role = role
 
-        if msg.type == "message":
-            for c in msg.content:
-                if c and isinstance(c, str):
-                    content.append(
-                        anthropic.types.TextBlockParam(
-                            text=c, type="text", cache_control=cache_ctrl
-                        )
-                    )
-                elif isinstance(c, llm.ImageContent):
-                    content.append(_to_image_content(c, cache_key, cache_ctrl=cache_ctrl))
-        elif msg.type == "function_call":
-            content.append(
-                anthropic.types.ToolUseBlockParam(
-                    id=msg.call_id,
-                    type="tool_use",
-                    name=msg.name,
-                    input=json.loads(msg.arguments or "{}"),
-                    cache_control=cache_ctrl,
-                )
-            )
-        elif msg.type == "function_call_output":
-            content.append(
-                anthropic.types.ToolResultBlockParam(
-                    tool_use_id=msg.call_id,
-                    type="tool_result",
-                    content=msg.output,
-                    cache_control=cache_ctrl,
-                )
-            )
+        blocks = _content_cache.get(msg, _to_content_blocks)
+        if cache_ctrl is not None:
+            # the cached blocks are shared, only the last item is marked as a cache breakpoint
+            blocks = [{**block, "cache_control": cache_ctrl} for block in blocks]  # type: ignore
+        content.extend(blocks)
 
     if current_role is not None and content:
         messages.append(anthropic.types.MessageParam(role=current_role, content=content))
@@ -108,21 +105,48 @@ def to_chat_ctx(
     return messages, system_message
 
 
-def _to_image_content(
-    image: llm.ImageContent,
-    cache_key: Any,
-    cache_ctrl: anthropic.types.CacheControlEphemeralParam | None,
-) -> anthropic.types.ImageBlockParam:
+def _to_content_blocks(msg: llm.ChatItem) -> list[_ContentBlockParam]:
+    content: list[_ContentBlockParam] = []
+    if msg.type == "message":
+        for c in msg.content:
+            if c and isinstance(c, str):
+                content.append(
+                    anthropic.types.TextBlockParam(text=c, type="text", cache_control=None)
+                )
+            elif isinstance(c, llm.ImageContent):
+                content.append(_image_cache.get(c, _to_image_content))
+    elif msg.type == "function_call":
+        content.append(
+            anthropic.types.ToolUseBlockParam(
+                id=msg.call_id,
+                type="tool_use",
+                name=msg.name,
+                input=json.loads(msg.arguments or "{}"),
+                cache_control=None,
+            )
+        )
+    elif msg.type == "function_call_output":
+        content.append(
+            anthropic.types.ToolResultBlockParam(
+                tool_use_id=msg.call_id,
+                type="tool_result",
+                content=msg.output,
+                cache_control=None,
+            )
+        )
+
+    return content
+
+
+def _to_image_content(image: llm.ImageContent) -> anthropic.types.ImageBlockParam:
     img = llm.utils.serialize_image(image)
     if img.external_url:
         return {
             "type": "image",
             "source": {"type": "url", "url": img.external_url},
-            "cache_control": cache_ctrl,
+            "cache_control": None,
         }
-    if cache_key not in image._cache:
-        image._cache[cache_key] = img.data_bytes
-    b64_data = base64.b64encode(image._cache[cache_key]).decode("utf-8")
+    b64_data = base64.b64encode(img.data_bytes).decode("utf-8")
     return {
         "type": "image",
         "source": {
@@ -130,7 +154,7 @@ def _to_image_content(
             "data": f"data:{img.mime_type};base64,{b64_data}",
             "media_type": img.mime_type,
         },
-        "cache_control": cache_ctrl,
+        "cache_control": None,
     }
 
 
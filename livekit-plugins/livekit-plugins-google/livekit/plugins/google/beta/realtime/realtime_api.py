@@ -309,7 +309,7 @@ class RealtimeSession(llm.RealtimeSession):
     async def update_chat_ctx(self, chat_ctx: llm.ChatContext) -> None:
         async with self._update_lock:
             self._chat_ctx = chat_ctx.copy()
-            turns, _ = to_chat_ctx(self._chat_ctx, id(self), ignore_functions=True)
+            turns, _ = to_chat_ctx(self._chat_ctx, ignore_functions=True)
             tool_results = get_tool_results_for_realtime(self._chat_ctx)
             # TODO(dz): need to compute delta and then either append or recreate session
             if turns:
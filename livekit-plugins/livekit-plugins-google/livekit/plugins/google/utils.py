@@ -10,11 +10,17 @@ from pydantic import TypeAdapter
 from google.genai import types
 from livekit.agents import llm
 from livekit.agents.llm import FunctionTool, utils as llm_utils
+from livekit.agents.types import NOT_GIVEN, NotGivenOr
+from livekit.agents.utils import is_given
 
 from .log import logger
 
 __all__ = ["to_chat_ctx", "to_fnc_ctx"]
 
+# the converted items are reused across turns, only new or modified items are converted
+_parts_cache: llm.utils.ConversionCache[list[types.Part]] = llm.utils.ConversionCache()
+_image_cache: llm.utils.ConversionCache[types.Part] = llm.utils.ConversionCache()
+
 
 def to_fnc_ctx(fncs: list[FunctionTool]) -> list[types.FunctionDeclaration]:
     return [_build_gemini_fnc(fnc) for fnc in fncs]
@@ -39,8 +45,14 @@ def get_tool_results_for_realtime(chat_ctx: llm.ChatContext) -> types.LiveClient
 
 
 def to_chat_ctx(
-    chat_ctx: llm.ChatContext, cache_key: Any, ignore_functions: bool = False
+    chat_ctx: llm.ChatContext,
+    # deprecated, the conversions are cached per item
+    cache_key: NotGivenOr[Any] = NOT_GIVEN,
+    ignore_functions: bool = False,
 ) -> tuple[list[types.Content], types.Content | None]:
+    if is_given(cache_key):
+        logger.warning("cache_key is deprecated and will be removed in 1.5.0, it is no longer used")
+
     turns: list[types.Content] = []
     system_instruction: types.Content | None = None
     current_role: str | None = None
@@ -69,32 +81,8 @@ def to_chat_ctx(
             parts = []
             current_role = role
 
-        if msg.type == "message":
-            for content in msg.content:
-                if content and isinstance(content, str):
-                    parts.append(types.Part(text=content))
-                elif content and isinstance(content, dict):
-                    parts.append(types.Part(text=json.dumps(content)))
-                elif isinstance(content, llm.ImageContent):
-                    parts.append(_to_image_part(content, cache_key))
-        elif msg.type == "function_call" and not ignore_functions:
-            parts.append(
-                types.Part(
-                    function_call=types.FunctionCall(
-                        name=msg.name,
-                        args=json.loads(msg.arguments),
-                    )
-                )
-            )
-        elif msg.type == "function_call_output" and not ignore_functions:
-            parts.append(
-                types.Part(
-                    function_response=types.FunctionResponse(
-                        name=msg.name,
-                        response={"text": msg.output},
-                    )
-                )
-            )
+        if msg.type == "message" or not ignore_functions:
+            parts.extend(_parts_cache.get(msg, _to_parts))
 
     if current_role is not None and parts:
         turns.append(types.Content(role=current_role, parts=parts))
@@ -107,7 +95,39 @@ def to_chat_ctx(
     return turns, system_instruction
 
 
-def _to_image_part(image: llm.ImageContent, cache_key: Any) -> types.Part:
+def _to_parts(msg: llm.ChatItem) -> list[types.Part]:
+    parts: list[types.Part] = []
+    if msg.type == "message":
+        for content in msg.content:
+            if content and isinstance(content, str):
+                parts.append(types.Part(text=content))
+            elif content and isinstance(content, dict):
+                parts.append(types.Part(text=json.dumps(content)))
+            elif isinstance(content, llm.ImageContent):
+                parts.append(_image_cache.get(content, _to_image_part))
+    elif msg.type == "function_call":
+        parts.append(
+            types.Part(
+                function_call=types.FunctionCall(
+                    name=msg.name,
+                    args=json.loads(msg.arguments),
+                )
+            )
+        )
+    elif msg.type == "function_call_output":
+        parts.append(
+            types.Part(
+                function_response=types.FunctionResponse(
+                    name=msg.name,
+                    response={"text": msg.output},
+                )
+            )
+        )
+
+    return parts
+
+
+def _to_image_part(image: llm.ImageContent) -> types.Part:
     img = llm.utils.serialize_image(image)
     if img.external_url:
         if img.mime_type:
@@ -116,9 +136,7 @@ def _to_image_part(image: llm.ImageContent, cache_key: Any) -> types.Part:
             logger.debug("No media type provided for image, defaulting to image/jpeg.")
             mime_type = "image/jpeg"
         return types.Part.from_uri(file_uri=img.external_url, mime_type=mime_type)
-    if cache_key not in image._cache:
-        image._cache[cache_key] = img.data_bytes
-    return types.Part.from_bytes(data=image._cache[cache_key], mime_type=img.mime_type)
+    return types.Part.from_bytes(data=img.data_bytes, mime_type=img.mime_type)
 
 
 def _build_gemini_fnc(function_tool: FunctionTool) -> types.FunctionDeclaration:
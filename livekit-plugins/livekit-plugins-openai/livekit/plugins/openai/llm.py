@@ -564,7 +564,7 @@ class LLMStream(llm.LLMStream):
 
         try:
             self._oai_stream = stream = await self._client.chat.completions.create(
-                messages=to_chat_ctx(self._chat_ctx, id(self._llm)),
+                messages=to_chat_ctx(self._chat_ctx),
                 tools=to_fnc_ctx(self._tools) if self._tools else openai.NOT_GIVEN,
                 model=self._model,
                 stream_options={"include_usage": True},
@@ -9,7 +9,7 @@ import time
 import weakref
 from collections.abc import Iterator
 from dataclasses import dataclass
-from typing import Literal, Union, overload
+from typing import Any, Literal, Union, overload
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 import aiohttp
@@ -35,13 +35,11 @@ from openai.types.beta.realtime import (
     ConversationItemInputAudioTranscriptionFailedEvent,
     ConversationItemTruncateEvent,
     ErrorEvent,
-    InputAudioBufferAppendEvent,
     InputAudioBufferClearEvent,
     InputAudioBufferCommitEvent,
     InputAudioBufferSpeechStartedEvent,
     InputAudioBufferSpeechStoppedEvent,
     RealtimeClientEvent,
-    ResponseAudioDeltaEvent,
     ResponseAudioDoneEvent,
     ResponseAudioTranscriptDoneEvent,
     ResponseCancelEvent,
@@ -95,6 +93,7 @@ class _RealtimeOptions:
     azure_deployment: str | None
     entra_token: str | None
     api_version: str | None
+    input_audio_send_interval: float
 
 
 @dataclass
@@ -130,6 +129,28 @@ class _CreateResponseHandle:
         self.done_fut.add_done_callback(lambda _: self.timeout.cancel())
 
 
+@dataclass
+class _InputAudioAppend:
+    """input_audio_buffer.append client event, sent without going through pydantic and
+    json.dumps since it's by far the most frequent one"""
+
+    audio: str
+    """base64 encoded PCM16 audio"""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"type": "input_audio_buffer.append", "audio": self.audio}
+
+    def to_json(self) -> str:
+        # the base64 alphabet never needs to be escaped
+        return _INPUT_AUDIO_APPEND_PREFIX + self.audio + '"}'
+
+
+_INPUT_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+
+# messages queued to the websocket, dicts are sent as-is
+_ClientMessage = Union[RealtimeClientEvent, _InputAudioAppend, dict[str, Any]]
+
+
 _MOCK_AUDIO_ID_PREFIX = "lk_mock_audio_item_"
 
 # default values got from a "default" session from their API
@@ -146,6 +167,8 @@ DEFAULT_INPUT_AUDIO_TRANSCRIPTION = InputAudioTranscription(
     model="gpt-4o-mini-transcribe",
 )
 DEFAULT_TOOL_CHOICE = "auto"
+# duration of the input audio sent in each input_audio_buffer.append event
+DEFAULT_INPUT_AUDIO_SEND_INTERVAL = 0.1
 
 AZURE_DEFAULT_TURN_DETECTION = TurnDetection(
     type="server_vad",
@@ -174,6 +197,7 @@ class RealtimeModel(llm.RealtimeModel):
         api_key: str | None = None,
         base_url: str | None = None,
         http_session: aiohttp.ClientSession | None = None,
+        input_audio_send_interval: float = DEFAULT_INPUT_AUDIO_SEND_INTERVAL,
     ) -> None: ...
 
     @overload
@@ -191,6 +215,7 @@ class RealtimeModel(llm.RealtimeModel):
         temperature: NotGivenOr[float] = NOT_GIVEN,
         tool_choice: NotGivenOr[llm.ToolChoice | None] = NOT_GIVEN,
         http_session: aiohttp.ClientSession | None = None,
+        input_audio_send_interval: float = DEFAULT_INPUT_AUDIO_SEND_INTERVAL,
     ) -> None: ...
 
     def __init__(
@@ -208,6 +233,7 @@ class RealtimeModel(llm.RealtimeModel):
         azure_deployment: str | None = None,
         entra_token: str | None = None,
         api_version: str | None = None,
+        input_audio_send_interval: float = DEFAULT_INPUT_AUDIO_SEND_INTERVAL,
     ) -> None:
         super().__init__(
             capabilities=llm.RealtimeCapabilities(
@@ -217,6 +243,9 @@ class RealtimeModel(llm.RealtimeModel):
             )
         )
 
+        if input_audio_send_interval <= 0:
+            raise ValueError("input_audio_send_interval must be greater than 0")
+
         is_azure = (
             api_version is not None or entra_token is not None or azure_deployment is not None
         )
@@ -257,6 +286,7 @@ class RealtimeModel(llm.RealtimeModel):
             azure_deployment=azure_deployment,
             entra_token=entra_token,
             api_version=api_version,
+            input_audio_send_interval=input_audio_send_interval,
         )
         self._http_session = http_session
         self._sessions = weakref.WeakSet[RealtimeSession]()
@@ -276,6 +306,7 @@ class RealtimeModel(llm.RealtimeModel):
         turn_detection: NotGivenOr[TurnDetection | None] = NOT_GIVEN,
         temperature: float = 0.8,
         http_session: aiohttp.ClientSession | None = None,
+        input_audio_send_interval: float = DEFAULT_INPUT_AUDIO_SEND_INTERVAL,
     ):
         """
         Create a RealtimeClient instance configured for Azure OpenAI Service.
@@ -293,6 +324,7 @@ class RealtimeModel(llm.RealtimeModel):
             temperature (float, optional): Sampling temperature for response generation. Defaults to 0.8.
             max_response_output_tokens (int or Literal["inf"], optional): Maximum number of tokens in the response. Defaults to "inf".
             http_session (aiohttp.ClientSession or None, optional): Async HTTP session to use for requests. If None, a new session will be created.
+            input_audio_send_interval (float, optional): Duration in seconds of the input audio sent in each event, shorter chunks lower the latency and increase the CPU usage. Defaults to 0.1.
 
         Returns:
             RealtimeClient: An instance of RealtimeClient configured for Azure OpenAI Service.
@@ -343,6 +375,7 @@ class RealtimeModel(llm.RealtimeModel):
             api_version=api_version,
             entra_token=entra_token,
             base_url=base_url,
+            input_audio_send_interval=input_audio_send_interval,
         )
 
     def update_options(
@@ -440,7 +473,7 @@ class RealtimeSession(
         super().__init__(realtime_model)
         self._realtime_model = realtime_model
         self._tools = llm.ToolContext.empty()
-        self._msg_ch = utils.aio.Chan[Union[RealtimeClientEvent, dict]]()
+        self._msg_ch = utils.aio.Chan[_ClientMessage]()
         self._input_resampler: rtc.AudioResampler | None = None
 
         self._main_atask = asyncio.create_task(self._main_task(), name="RealtimeSession._main_task")
@@ -459,11 +492,15 @@ class RealtimeSession(
         self._update_chat_ctx_lock = asyncio.Lock()
         self._update_fnc_ctx_lock = asyncio.Lock()
 
-        # 100ms chunks
+        # the input audio is coalesced in chunks of input_audio_send_interval
         self._bstream = utils.audio.AudioByteStream(
-            SAMPLE_RATE, NUM_CHANNELS, samples_per_channel=SAMPLE_RATE // 10
+            SAMPLE_RATE,
+            NUM_CHANNELS,
+            samples_per_channel=max(
+                int(SAMPLE_RATE * realtime_model._opts.input_audio_send_interval), 1
+            ),
         )
-        self._pushed_duration_s = 0  # duration of audio pushed to the OpenAI Realtime API
+        self._pushed_duration_s = 0.0  # duration of audio pushed to the OpenAI Realtime API
 
     def send_event(self, event: RealtimeClientEvent | dict) -> None:
         with contextlib.suppress(utils.aio.channel.ChanClosed):
@@ -504,6 +541,15 @@ class RealtimeSession(
             nonlocal closing
             async for msg in self._msg_ch:
                 try:
+                    if isinstance(msg, _InputAudioAppend):
+                        self.emit("openai_client_event_queued", msg.to_dict())
+                        await ws_conn.send_str(msg.to_json())
+
+                        if _log_oai_events:
+                            msg_copy = {**msg.to_dict(), "audio": "..."}
+                            logger.debug(f">>> {msg_copy}")
+                        continue
+
                     if isinstance(msg, BaseModel):
                         msg = msg.model_dump(
                             by_alias=True, exclude_unset=True, exclude_defaults=False
@@ -562,7 +608,12 @@ class RealtimeSession(
 
                         logger.debug(f"<<< {event_copy}")
 
-                    if event["type"] == "input_audio_buffer.speech_started":
+                    # the deltas are handled as plain dicts, they're most of the server events
+                    if event["type"] == "response.audio.delta":
+                        self._handle_response_audio_delta(event)
+                    elif event["type"] == "response.audio_transcript.delta":
+                        self._handle_response_audio_transcript_delta(event)
+                    elif event["type"] == "input_audio_buffer.speech_started":
                         self._handle_input_audio_buffer_speech_started(
                             InputAudioBufferSpeechStartedEvent.construct(**event)
                         )
@@ -600,12 +651,6 @@ class RealtimeSession(
                         self._handle_response_content_part_done(
                             ResponseContentPartDoneEvent.construct(**event)
                         )
-                    elif event["type"] == "response.audio_transcript.delta":
-                        self._handle_response_audio_transcript_delta(event)
-                    elif event["type"] == "response.audio.delta":
-                        self._handle_response_audio_delta(
-                            ResponseAudioDeltaEvent.construct(**event)
-                        )
                     elif event["type"] == "response.audio_transcript.done":
                         self._handle_response_audio_transcript_done(
                             ResponseAudioTranscriptDoneEvent.construct(**event)
@@ -837,26 +882,35 @@ class RealtimeSession(
         )
 
     def push_audio(self, frame: rtc.AudioFrame) -> None:
+        bytes_per_frame = self._bstream.bytes_per_frame
         for f in self._resample_audio(frame):
-            data = f.data.tobytes()
-            for nf in self._bstream.write(data):
-                self.send_event(
-                    InputAudioBufferAppendEvent(
-                        type="input_audio_buffer.append",
-                        audio=base64.b64encode(nf.data).decode("utf-8"),
-                    )
-                )
-                self._pushed_duration_s += nf.duration
+            data, offsets = self._bstream.push_bulk(f.data.tobytes())
+            view = memoryview(data)
+            for offset in offsets:
+                self._send_input_audio(view[offset : offset + bytes_per_frame])
+
+    def _send_input_audio(self, data: bytes | memoryview) -> None:
+        # queued directly, send_event only accepts the public client events
+        with contextlib.suppress(utils.aio.channel.ChanClosed):
+            self._msg_ch.send_nowait(
+                _InputAudioAppend(audio=base64.b64encode(data).decode("ascii"))
+            )
+        self._pushed_duration_s += len(data) / (2 * SAMPLE_RATE * NUM_CHANNELS)
 
     def push_video(self, frame: rtc.VideoFrame) -> None:
         pass
 
     def commit_audio(self) -> None:
+        # send the audio still waiting to fill a chunk
+        for f in self._bstream.flush():
+            self._send_input_audio(f.data.cast("B"))
+
         if self._pushed_duration_s > 0.1:  # OpenAI requires at least 100ms of audio
             self.send_event(InputAudioBufferCommitEvent(type="input_audio_buffer.commit"))
             self._pushed_duration_s = 0
 
     def clear_audio(self) -> None:
+        self._bstream.flush()
         self.send_event(InputAudioBufferClearEvent(type="input_audio_buffer.clear"))
         self._pushed_duration_s = 0
 
@@ -1162,11 +1216,11 @@ class RealtimeSession(
         item_generation = self._current_generation.messages[item_id]
         item_generation.text_ch.send_nowait(delta)
 
-    def _handle_response_audio_delta(self, event: ResponseAudioDeltaEvent) -> None:
+    def _handle_response_audio_delta(self, event: dict[str, Any]) -> None:
         assert self._current_generation is not None, "current_generation is None"
-        item_generation = self._current_generation.messages[event.item_id]
+        item_generation = self._current_generation.messages[event["item_id"]]
 
-        data = base64.b64decode(event.delta)
+        data = base64.b64decode(event["delta"])
         item_generation.audio_ch.send_nowait(
             rtc.AudioFrame(
                 data=data,
@@ -14,14 +14,26 @@ from livekit.agents.llm.tool_context import (
     is_raw_function_tool,
 )
 from livekit.agents.log import logger
+from livekit.agents.types import NOT_GIVEN, NotGivenOr
+from livekit.agents.utils import is_given
 from openai.types.chat import (
+    ChatCompletionAssistantMessageParam,
     ChatCompletionContentPartParam,
     ChatCompletionMessageParam,
+    ChatCompletionMessageToolCallParam,
     ChatCompletionToolParam,
 )
 
 AsyncAzureADTokenProvider = Callable[[], Union[str, Awaitable[str]]]
 
+# the converted items are reused across turns, only new or modified items are converted
+_chat_item_cache: llm.utils.ConversionCache[ChatCompletionMessageParam] = (
+    llm.utils.ConversionCache()
+)
+_image_cache: llm.utils.ConversionCache[ChatCompletionContentPartParam] = (
+    llm.utils.ConversionCache()
+)
+
 
 def get_base_url(base_url: str | None) -> str:
     if not base_url:
@@ -64,7 +76,7 @@ class _ChatItemGroup:
             self.tool_outputs.append(item)
         return self
 
-    def to_chat_items(self, cache_key: Any) -> list[ChatCompletionMessageParam]:
+    def to_chat_items(self) -> list[ChatCompletionMessageParam]:
         tool_calls = {tool_call.call_id: tool_call for tool_call in self.tool_calls}
         tool_outputs = {tool_output.call_id: tool_output for tool_output in self.tool_outputs}
 
@@ -90,28 +102,45 @@ class _ChatItemGroup:
         if not self.message and not tool_calls and not tool_outputs:
             return []
 
-        msg = (
-            _to_chat_item(self.message, cache_key)
+        msg: ChatCompletionMessageParam = (
+            _chat_item_cache.get(self.message, _to_chat_item)
             if self.message
             else {"role": "assistant", "tool_calls": []}
         )
         if tool_calls:
-            msg.setdefault("tool_calls", [])
-        for tool_call in tool_calls.values():
-            msg["tool_calls"].append(
-                {
-                    "id": tool_call.call_id,
-                    "type": "function",
-                    "function": {"name": tool_call.name, "arguments": tool_call.arguments},
-                }
-            )
+            # the cached message is shared, extend a copy of it
+            assistant_msg: ChatCompletionAssistantMessageParam = {"role": "assistant"}
+            tool_call_params: list[ChatCompletionMessageToolCallParam] = []
+            if msg["role"] == "assistant":
+                if "content" in msg:
+                    assistant_msg["content"] = msg["content"]
+                tool_call_params.extend(msg.get("tool_calls", []))
+
+            for tool_call in tool_calls.values():
+                tool_call_params.append(
+                    {
+                        "id": tool_call.call_id,
+                        "type": "function",
+                        "function": {"name": tool_call.name, "arguments": tool_call.arguments},
+                    }
+                )
+            assistant_msg["tool_calls"] = tool_call_params
+            msg = assistant_msg
+
         items = [msg]
         for tool_output in tool_outputs.values():
-            items.append(_to_chat_item(tool_output, cache_key))
+            items.append(_chat_item_cache.get(tool_output, _to_chat_item))
         return items
 
 
-def to_chat_ctx(chat_ctx: llm.ChatContext, cache_key: Any) -> list[ChatCompletionMessageParam]:
+def to_chat_ctx(
+    chat_ctx: llm.ChatContext,
+    # deprecated, the conversions are cached per item
+    cache_key: NotGivenOr[Any] = NOT_GIVEN,
+) -> list[ChatCompletionMessageParam]:
+    if is_given(cache_key):
+        logger.warning("cache_key is deprecated and will be removed in 1.5.0, it is no longer used")
+
     # OAI requires the tool calls to be followed by the corresponding tool outputs
     # we group them first and remove invalid tool calls and outputs before converting
 
@@ -146,11 +175,11 @@ def to_chat_ctx(chat_ctx: llm.ChatContext, cache_key: Any) -> list[ChatCompletio
 
     messages = []
     for group in item_groups.values():
-        messages.extend(group.to_chat_items(cache_key))
+        messages.extend(group.to_chat_items())
     return messages
 
 
-def _to_chat_item(msg: llm.ChatItem, cache_key: Any) -> ChatCompletionMessageParam:
+def _to_chat_item(msg: llm.ChatItem) -> ChatCompletionMessageParam:
     if msg.type == "message":
         list_content: list[ChatCompletionContentPartParam] = []
         text_content = ""
@@ -160,7 +189,7 @@ def _to_chat_item(msg: llm.ChatItem, cache_key: Any) -> ChatCompletionMessagePar
                     text_content += "\n"
                 text_content += content
             elif isinstance(content, llm.ImageContent):
-                list_content.append(_to_image_content(content, cache_key))
+                list_content.append(_image_cache.get(content, _to_image_content))
 
         if not list_content:
             # certain providers require text-only content in a string vs a list.
@@ -201,7 +230,7 @@ def _to_chat_item(msg: llm.ChatItem, cache_key: Any) -> ChatCompletionMessagePar
         }
 
 
-def _to_image_content(image: llm.ImageContent, cache_key: Any) -> ChatCompletionContentPartParam:
+def _to_image_content(image: llm.ImageContent) -> ChatCompletionContentPartParam:
     img = llm.utils.serialize_image(image)
     if img.external_url:
         return {
@@ -211,9 +240,8 @@ def _to_image_content(image: llm.ImageContent, cache_key: Any) -> ChatCompletion
                 "detail": img.inference_detail,
             },
         }
-    if cache_key not in image._cache:
-        image._cache[cache_key] = img.data_bytes
-    b64_data = base64.b64encode(image._cache[cache_key]).decode("utf-8")
+    assert img.data_bytes is not None
+    b64_data = base64.b64encode(img.data_bytes).decode("utf-8")
     return {
         "type": "image_url",
         "image_url": {
@@ -68,15 +68,56 @@ class OnnxModel:
     def context_size(self) -> int:
         return self._context_size
 
-    def __call__(self, x: np.ndarray) -> float:
+    def _prepare_input(self, x: np.ndarray) -> np.ndarray:
         self._input_buffer[:, : self._context_size] = self._context
         self._input_buffer[:, self._context_size :] = x
+        return self._input_buffer
 
+    def __call__(self, x: np.ndarray) -> float:
         ort_inputs = {
-            "input": self._input_buffer,
+            "input": self._prepare_input(x),
             "state": self._rnn_state,
             "sr": self._sample_rate_nd,
         }
-        out, self._state = self._sess.run(None, ort_inputs)
+        out, self._rnn_state = self._sess.run(None, ort_inputs)
         self._context = self._input_buffer[:, -self._context_size :]
         return out.item()
+
+
+def run_batched(models: list[OnnxModel], windows: list[np.ndarray]) -> list[list[float]]:
+    """Run the inference windows of several models inside as few session calls as possible.
+
+    All the models must share the same session and sample rate. `windows[i]` has the shape
+    (n, window_size_samples) and holds the consecutive windows of `models[i]`: they are run in
+    order since each one depends on the state left by the previous one, while the windows of
+    different models are stacked along the batch dimension.
+    """
+    results: list[list[float]] = [[] for _ in models]
+    for step in range(max(len(w) for w in windows)):
+        indexes = [i for i, w in enumerate(windows) if len(w) > step]
+        if len(indexes) == 1:
+            i = indexes[0]
+            results[i].append(models[i](windows[i][step]))
+            continue
+
+        probs = _run_step([models[i] for i in indexes], [windows[i][step] for i in indexes])
+        for i, p in zip(indexes, probs):
+            results[i].append(p)
+
+    return results
+
+
+def _run_step(models: list[OnnxModel], xs: list[np.ndarray]) -> list[float]:
+    first = models[0]
+    ort_inputs = {
+        "input": np.concatenate([model._prepare_input(x) for model, x in zip(models, xs)], axis=0),
+        "state": np.concatenate([model._rnn_state for model in models], axis=1),
+        "sr": first._sample_rate_nd,
+    }
+    out, state = first._sess.run(None, ort_inputs)
+    for i, model in enumerate(models):
+        model._rnn_state = state[:, i : i + 1]
+        model._context = model._input_buffer[:, -model._context_size :]
+
+    probs: list[float] = np.asarray(out, dtype=np.float32).reshape(len(models), -1)[:, 0].tolist()
+    return probs
@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 import time
 import weakref
 from concurrent.futures import ThreadPoolExecutor
@@ -48,6 +49,132 @@ class _VADOptions:
     sample_rate: int
 
 
+# a batch runs at most this many consecutive windows of a stream, the rest of a backlog (e.g.
+# after an event loop stall) waits for the next batch instead of delaying the other streams
+MAX_BATCH_WINDOWS = 8
+
+
+class _InferenceRequest:
+    def __init__(
+        self,
+        model: onnx_model.OnnxModel,
+        windows: np.ndarray,
+        loop: asyncio.AbstractEventLoop,
+        fut: asyncio.Future[list[float]],
+    ) -> None:
+        self.model = model
+        self.windows = windows
+        self.loop = loop
+        self.fut = fut
+        self.probs: list[float] = []
+
+
+class _InferenceBatcher:
+    """Runs the inference windows of the VAD streams of an onnx session, whatever their event
+    loop.
+
+    Windows submitted while the previous batch is running are stacked into the same onnx calls
+    (one per sample rate). The batching is opportunistic, the windows of the streams aren't
+    aligned on shared ticks since that would delay them: with a few realtime streams a window
+    rarely waits for another one, the batches grow when the batcher thread falls behind (many
+    streams or backlogs). There is no added latency when a stream is alone.
+
+    Each session has its own batcher thread: onnxruntime releases the GIL, so the streams of
+    different VADs (e.g. one VAD.load() per job) still run in parallel.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="silero_vad")
+        self._pending: list[_InferenceRequest] = []
+        self._running = False
+
+    def infer(
+        self, model: onnx_model.OnnxModel, windows: np.ndarray
+    ) -> asyncio.Future[list[float]]:
+        """Schedule consecutive windows of shape (n, window_size_samples) for the given model,
+        `windows` must not be modified until the future is done"""
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[list[float]] = loop.create_future()
+        with self._lock:
+            self._pending.append(_InferenceRequest(model, windows, loop, fut))
+            if self._running:
+                return fut
+
+            self._running = True
+
+        self._executor.submit(self._run)
+        return fut
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                batch = [req for req in self._pending if not req.fut.cancelled()]
+                self._pending = []
+                if not batch:
+                    self._running = False
+                    return
+
+            groups: dict[tuple[int, int], list[_InferenceRequest]] = {}
+            for req in batch:
+                key = (id(req.model._sess), req.model.sample_rate)
+                groups.setdefault(key, []).append(req)
+
+            remaining: list[_InferenceRequest] = []
+            for group in groups.values():
+                try:
+                    results = onnx_model.run_batched(
+                        [req.model for req in group],
+                        [
+                            req.windows[len(req.probs) : len(req.probs) + MAX_BATCH_WINDOWS]
+                            for req in group
+                        ],
+                    )
+                except Exception as e:
+                    for req in group:
+                        _resolve(req, exc=e)
+                    continue
+
+                for req, probs in zip(group, results):
+                    req.probs.extend(probs)
+                    if len(req.probs) < len(req.windows):
+                        remaining.append(req)
+                    else:
+                        _resolve(req)
+
+            with self._lock:
+                self._pending[:0] = remaining
+
+
+def _resolve(req: _InferenceRequest, *, exc: Exception | None = None) -> None:
+    def _set() -> None:
+        if req.fut.done():
+            return
+
+        if exc is not None:
+            req.fut.set_exception(exc)
+        else:
+            req.fut.set_result(req.probs)
+
+    try:
+        req.loop.call_soon_threadsafe(_set)
+    except RuntimeError:
+        pass  # the loop of the stream is closed
+
+
+_batchers = weakref.WeakKeyDictionary[onnxruntime.InferenceSession, _InferenceBatcher]()
+_batchers_lock = threading.Lock()
+
+
+def _inference_batcher(session: onnxruntime.InferenceSession) -> _InferenceBatcher:
+    with _batchers_lock:
+        batcher = _batchers.get(session)
+        if batcher is None:
+            batcher = _batchers[session] = _InferenceBatcher()
+
+        return batcher
+
+
 class VAD(agents.vad.VAD):
     """
     Silero Voice Activity Detection (VAD) class.
@@ -201,18 +328,65 @@ class VAD(agents.vad.VAD):
             )
 
 
+class _SpeechBuffer:
+    """Ring buffer holding the prefix padding and the current speech, at the input sample rate.
+
+    The positions are absolute sample counts, dropping data is only a matter of moving the
+    start position.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._data = np.empty(capacity, dtype=np.int16)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append as many samples as the buffer can hold, returns the number of samples written"""
+        capacity = len(self._data)
+        size = min(len(samples), capacity - len(self))
+        if size <= 0:
+            return 0
+
+        pos = self._end % capacity
+        first = min(size, capacity - pos)
+        self._data[pos : pos + first] = samples[:first]
+        self._data[: size - first] = samples[first:size]
+        self._end += size
+        return size
+
+    def keep_last(self, size: int) -> None:
+        self._start = max(self._start, self._end - size)
+
+    def read(self) -> np.ndarray:
+        capacity = len(self._data)
+        pos = self._start % capacity if capacity else 0
+        size = len(self)
+        if pos + size <= capacity:
+            return self._data[pos : pos + size].copy()
+
+        return np.concatenate((self._data[pos:], self._data[: pos + size - capacity]))
+
+    def resize(self, capacity: int) -> None:
+        data = self.read()[:capacity]
+        self._data = np.empty(capacity, dtype=np.int16)
+        self._data[: len(data)] = data
+        self._start = 0
+        self._end = len(data)
+
+
 class VADStream(agents.vad.VADStream):
     def __init__(self, vad: VAD, opts: _VADOptions, model: onnx_model.OnnxModel) -> None:
         super().__init__(vad)
         self._opts, self._model = opts, model
         self._loop = asyncio.get_event_loop()
-
-        self._executor = ThreadPoolExecutor(max_workers=1)
-        self._task.add_done_callback(lambda _: self._executor.shutdown(wait=False))
+        self._batcher = _inference_batcher(model._sess)
         self._exp_filter = utils.ExpFilter(alpha=0.35)
 
         self._input_sample_rate = 0
-        self._speech_buffer: np.ndarray | None = None
+        self._speech_buffer: _SpeechBuffer | None = None
         self._speech_buffer_max_reached = False
         self._prefix_padding_samples = 0  # (input_sample_rate)
 
@@ -267,8 +441,8 @@ class VADStream(agents.vad.VADStream):
 
     @agents.utils.log_exceptions(logger=logger)
     async def _main_task(self):
-        inference_f32_data = np.empty(self._model.window_size_samples, dtype=np.float32)
-        speech_buffer_index: int = 0
+        window_size = self._model.window_size_samples
+        window_duration = window_size / self._opts.sample_rate
 
         # "pub_" means public, these values are exposed to the users through events
         pub_speaking = False
@@ -280,8 +454,9 @@ class VADStream(agents.vad.VADStream):
         speech_threshold_duration = 0.0
         silence_threshold_duration = 0.0
 
-        input_frames = []
-        inference_frames = []
+        # samples not consumed by the inference yet, at the input and at the inference sample rate
+        input_pending = np.empty(0, dtype=np.int16)
+        inference_pending = np.empty(0, dtype=np.int16)
         resampler: rtc.AudioResampler | None = None
 
         # used to avoid drift when the sample_rate ratio is not an integer
@@ -289,138 +464,132 @@ class VADStream(agents.vad.VADStream):
 
         extra_inference_time = 0.0
 
-        async for input_frame in self._input_ch:
-            if not isinstance(input_frame, rtc.AudioFrame):
-                continue  # ignore flush sentinel for now
+        def _reset_write_cursor() -> None:
+            assert self._speech_buffer is not None
 
-            if not self._input_sample_rate:
-                self._input_sample_rate = input_frame.sample_rate
+            if len(self._speech_buffer) <= self._prefix_padding_samples:
+                return
 
-                # alloc the buffers now that we know the input sample rate
-                self._prefix_padding_samples = int(
-                    self._opts.prefix_padding_duration * self._input_sample_rate
-                )
+            self._speech_buffer_max_reached = False
+            self._speech_buffer.keep_last(self._prefix_padding_samples)
 
-                self._speech_buffer = np.empty(
-                    int(self._opts.max_buffered_speech * self._input_sample_rate)
-                    + self._prefix_padding_samples,
-                    dtype=np.int16,
-                )
+        def _copy_speech_buffer() -> rtc.AudioFrame:
+            assert self._speech_buffer is not None
+            speech_data = self._speech_buffer.read()
 
-                if self._input_sample_rate != self._opts.sample_rate:
-                    # resampling needed: the input sample rate isn't the same as the model's
-                    # sample rate used for inference
-                    resampler = rtc.AudioResampler(
-                        input_rate=self._input_sample_rate,
-                        output_rate=self._opts.sample_rate,
-                        quality=rtc.AudioResamplerQuality.QUICK,  # VAD doesn't need high quality
+            return rtc.AudioFrame(
+                sample_rate=self._input_sample_rate,
+                num_channels=1,
+                samples_per_channel=len(speech_data),
+                data=speech_data.tobytes(),
+            )
+
+        async for first_frame in self._input_ch:
+            # every frame already queued (e.g. after an event loop stall) is processed in the same
+            # block, its windows are converted at once and sent in a single inference request
+            queued_frames = [first_frame]
+            while not self._input_ch.empty():
+                queued_frames.append(self._input_ch.recv_nowait())
+
+            input_data = [input_pending]
+            inference_data = [inference_pending]
+            for input_frame in queued_frames:
+                if not isinstance(input_frame, rtc.AudioFrame):
+                    continue  # ignore flush sentinel for now
+
+                if not self._input_sample_rate:
+                    self._input_sample_rate = input_frame.sample_rate
+
+                    # alloc the buffers now that we know the input sample rate
+                    self._prefix_padding_samples = int(
+                        self._opts.prefix_padding_duration * self._input_sample_rate
                     )
 
-            elif self._input_sample_rate != input_frame.sample_rate:
-                logger.error("a frame with another sample rate was already pushed")
-                continue
+                    self._speech_buffer = _SpeechBuffer(
+                        int(self._opts.max_buffered_speech * self._input_sample_rate)
+                        + self._prefix_padding_samples
+                    )
+
+                    if self._input_sample_rate != self._opts.sample_rate:
+                        # resampling needed: the input sample rate isn't the same as the model's
+                        # sample rate used for inference (VAD doesn't need high quality)
+                        resampler = rtc.AudioResampler(
+                            input_rate=self._input_sample_rate,
+                            output_rate=self._opts.sample_rate,
+                            quality=rtc.AudioResamplerQuality.QUICK,
+                        )
+
+                elif self._input_sample_rate != input_frame.sample_rate:
+                    logger.error("a frame with another sample rate was already pushed")
+                    continue
+
+                input_data.append(np.frombuffer(input_frame.data, dtype=np.int16))
+                if resampler is not None:
+                    # the resampler may have a bit of latency, but it is OK to ignore since it
+                    # should be negligible
+                    for frame in resampler.push(input_frame):
+                        inference_data.append(np.frombuffer(frame.data, dtype=np.int16))
+                else:
+                    inference_data.append(input_data[-1])
+
+            input_pending = np.concatenate(input_data)
+            inference_pending = np.concatenate(inference_data)
+
+            num_windows = len(inference_pending) // window_size
+            if num_windows == 0:
+                continue  # not enough samples to run inference
 
             assert self._speech_buffer is not None
 
-            input_frames.append(input_frame)
-            if resampler is not None:
-                # the resampler may have a bit of latency, but it is OK to ignore since it should be
-                # negligible
-                inference_frames.extend(resampler.push(input_frame))
-            else:
-                inference_frames.append(input_frame)
+            start_time = time.perf_counter()
 
-            while True:
-                start_time = time.perf_counter()
+            # convert data to f32, one row per inference window
+            inference_windows = np.divide(
+                inference_pending[: num_windows * window_size].reshape(num_windows, window_size),
+                np.iinfo(np.int16).max,
+                dtype=np.float32,
+            )
+            inference_pending = inference_pending[num_windows * window_size :]
 
-                available_inference_samples = sum(
-                    [frame.samples_per_channel for frame in inference_frames]
-                )
-                if available_inference_samples < self._model.window_size_samples:
-                    break  # not enough samples to run inference
-
-                input_frame = utils.combine_frames(input_frames)
-                inference_frame = utils.combine_frames(inference_frames)
-
-                # convert data to f32
-                np.divide(
-                    inference_frame.data[: self._model.window_size_samples],
-                    np.iinfo(np.int16).max,
-                    out=inference_f32_data,
-                    dtype=np.float32,
-                )
+            # run the inference
+            probs = await self._batcher.infer(self._model, inference_windows)
 
-                # run the inference
-                p = await self._loop.run_in_executor(
-                    self._executor, self._model, inference_f32_data
+            block_duration = time.perf_counter() - start_time
+            inference_duration = block_duration / num_windows
+            extra_inference_time = max(
+                0.0,
+                extra_inference_time + block_duration - num_windows * window_duration,
+            )
+            if inference_duration > SLOW_INFERENCE_THRESHOLD:
+                logger.warning(
+                    "inference is slower than realtime",
+                    extra={"delay": extra_inference_time},
                 )
-                p = self._exp_filter.apply(exp=1.0, sample=p)
 
-                window_duration = self._model.window_size_samples / self._opts.sample_rate
+            resampling_ratio = self._input_sample_rate / self._model.sample_rate
+            for raw_p in probs:
+                p = self._exp_filter.apply(exp=1.0, sample=raw_p)
 
-                pub_current_sample += self._model.window_size_samples
+                pub_current_sample += window_size
                 pub_timestamp += window_duration
 
-                resampling_ratio = self._input_sample_rate / self._model.sample_rate
-                to_copy = (
-                    self._model.window_size_samples * resampling_ratio + input_copy_remaining_fract
-                )
+                to_copy = window_size * resampling_ratio + input_copy_remaining_fract
                 to_copy_int = int(to_copy)
                 input_copy_remaining_fract = to_copy - to_copy_int
 
+                # the input samples matching the inference window
+                window_data = input_pending[:to_copy_int]
+                input_pending = input_pending[to_copy_int:]
+
                 # copy the inference window to the speech buffer
-                available_space = len(self._speech_buffer) - speech_buffer_index
-                to_copy_buffer = min(to_copy_int, available_space)
-                if to_copy_buffer > 0:
-                    self._speech_buffer[
-                        speech_buffer_index : speech_buffer_index + to_copy_buffer
-                    ] = input_frame.data[:to_copy_buffer]
-                    speech_buffer_index += to_copy_buffer
-                elif not self._speech_buffer_max_reached:
+                written = self._speech_buffer.write(window_data)
+                if written < len(window_data) and not self._speech_buffer_max_reached:
                     # reached self._opts.max_buffered_speech (padding is included)
-                    speech_buffer_max_reached = True
+                    self._speech_buffer_max_reached = True
                     logger.warning(
                         "max_buffered_speech reached, ignoring further data for the current speech input"  # noqa: E501
                     )
 
-                inference_duration = time.perf_counter() - start_time
-                extra_inference_time = max(
-                    0.0,
-                    extra_inference_time + inference_duration - window_duration,
-                )
-                if inference_duration > SLOW_INFERENCE_THRESHOLD:
-                    logger.warning(
-                        "inference is slower than realtime",
-                        extra={"delay": extra_inference_time},
-                    )
-
-                def _reset_write_cursor():
-                    nonlocal speech_buffer_index, speech_buffer_max_reached
-                    assert self._speech_buffer is not None
-
-                    if speech_buffer_index <= self._prefix_padding_samples:
-                        return
-
-                    padding_data = self._speech_buffer[
-                        speech_buffer_index - self._prefix_padding_samples : speech_buffer_index
-                    ]
-
-                    self._speech_buffer_max_reached = False
-                    self._speech_buffer[: self._prefix_padding_samples] = padding_data
-                    speech_buffer_index = self._prefix_padding_samples
-
-                def _copy_speech_buffer() -> rtc.AudioFrame:
-                    # copy the data from speech_buffer
-                    assert self._speech_buffer is not None
-                    speech_data = self._speech_buffer[:speech_buffer_index].tobytes()  # noqa: B023
-
-                    return rtc.AudioFrame(
-                        sample_rate=self._input_sample_rate,
-                        num_channels=1,
-                        samples_per_channel=speech_buffer_index,  # noqa: B023
-                        data=speech_data,
-                    )
-
                 if pub_speaking:
                     pub_speech_duration += window_duration
                 else:
@@ -437,10 +606,10 @@ class VADStream(agents.vad.VADStream):
                         inference_duration=inference_duration,
                         frames=[
                             rtc.AudioFrame(
-                                data=input_frame.data[:to_copy_int].tobytes(),
+                                data=window_data.tobytes(),
                                 sample_rate=self._input_sample_rate,
                                 num_channels=1,
-                                samples_per_channel=to_copy_int,
+                                samples_per_channel=len(window_data),
                             )
                         ],
                         speaking=pub_speaking,
@@ -499,30 +668,3 @@ class VADStream(agents.vad.VADStream):
                         )
 
                         _reset_write_cursor()
-
-                # remove the frames that were used for inference from the input and inference frames
-                input_frames = []
-                inference_frames = []
-
-                # add the remaining data
-                if len(input_frame.data) - to_copy_int > 0:
-                    data = input_frame.data[to_copy_int:].tobytes()
-                    input_frames.append(
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=self._input_sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    )
-
-                if len(inference_frame.data) - self._model.window_size_samples > 0:
-                    data = inference_frame.data[self._model.window_size_samples :].tobytes()
-                    inference_frames.append(
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=self._opts.sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    )
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import json
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
 
 from livekit.agents import llm
 from livekit.agents.inference_runner import _InferenceRunner
@@ -16,6 +20,12 @@ from .models import HG_MODEL, MODEL_REVISIONS, ONNX_FILENAME, EOUModelType
 MAX_HISTORY_TOKENS = 256
 MAX_HISTORY_TURNS = 6
 
+# the runner is shared by all the jobs of the inference process, the caches are bounded LRUs
+MAX_CACHED_RESULTS = 1024
+MAX_CACHED_PREFIXES = 256
+
+_TURN_START = "<|im_start|>"
+
 
 def _download_from_hf_hub(repo_id, filename, **kwargs):
     from huggingface_hub import hf_hub_download
@@ -29,18 +39,18 @@ class _EUORunnerBase(_InferenceRunner):
         super().__init__()
         self._model_revision = MODEL_REVISIONS[model_type]
 
-    def _format_chat_ctx(self, chat_ctx: dict):
-        new_chat_ctx = []
-        for msg in chat_ctx:
-            content = msg["content"]
-            if not content:
-                continue
-
-            msg["content"] = content
-            new_chat_ctx.append(msg)
+        # run can be called concurrently from the executor threads
+        self._cache_lock = threading.Lock()
+        # conversation -> (eou_probability, formatted text)
+        self._result_cache: OrderedDict[tuple[tuple[str, str], ...], tuple[float, str]] = (
+            OrderedDict()
+        )
+        # formatted history (everything before the last turn) -> token ids
+        self._prefix_cache: OrderedDict[str, list[int]] = OrderedDict()
 
+    def _format_chat_ctx(self, chat_ctx: list[dict]):
         convo_text = self._tokenizer.apply_chat_template(
-            new_chat_ctx,
+            chat_ctx,
             add_generation_prompt=False,
             add_special_tokens=False,
             tokenize=False,
@@ -64,8 +74,13 @@ class _EUORunnerBase(_InferenceRunner):
                 revision=self._model_revision,
                 local_files_only=True,
             )
+            sess_options = ort.SessionOptions()
+            if self.intra_op_threads > 0:
+                sess_options.intra_op_num_threads = self.intra_op_threads
+                sess_options.inter_op_num_threads = 1
+
             self._session = ort.InferenceSession(
-                local_path_onnx, providers=["CPUExecutionProvider"]
+                local_path_onnx, sess_options=sess_options, providers=["CPUExecutionProvider"]
             )
 
             self._tokenizer = AutoTokenizer.from_pretrained(
@@ -86,34 +101,82 @@ class _EUORunnerBase(_InferenceRunner):
                 f"Could not find model {HG_MODEL} with revision {self._model_revision}."
             ) from None
 
-    def run(self, data: bytes) -> bytes | None:
+    def _parse_input(self, data: bytes) -> list[dict]:
         data_json = json.loads(data)
         chat_ctx = data_json.get("chat_ctx", None)
 
         if not chat_ctx:
             raise ValueError("chat_ctx is required on the inference input data")
 
+        return [msg for msg in chat_ctx if msg["content"]]
+
+    def _tokenize(self, text: str) -> tuple[list[int], bool]:
+        """Tokenize the formatted conversation, reusing the tokens of its history.
+
+        While the user is speaking, the turn detector is called again and again with the same
+        history and a different last turn. The text is split right before the special token
+        starting the last turn, so the tokens of both parts are the same as the tokens of the
+        whole text. Returns the token ids and whether the history was cached."""
+        split = text.rfind(_TURN_START)
+        if split <= 0:
+            return self._encode(text), False
+
+        prefix = text[:split]
+        with self._cache_lock:
+            prefix_ids = self._prefix_cache.get(prefix)
+            if prefix_ids is not None:
+                self._prefix_cache.move_to_end(prefix)
+
+        prefix_hit = prefix_ids is not None
+        if prefix_ids is None:
+            prefix_ids = self._encode(prefix)
+            with self._cache_lock:
+                self._prefix_cache[prefix] = prefix_ids
+                if len(self._prefix_cache) > MAX_CACHED_PREFIXES:
+                    self._prefix_cache.popitem(last=False)
+
+        return (prefix_ids + self._encode(text[split:]))[-MAX_HISTORY_TOKENS:], prefix_hit
+
+    def _encode(self, text: str) -> list[int]:
+        # same as truncating on the left side to MAX_HISTORY_TOKENS
+        return self._tokenizer(text, add_special_tokens=False)["input_ids"][-MAX_HISTORY_TOKENS:]
+
+    def run(self, data: bytes) -> bytes | None:
         start_time = time.perf_counter()
 
-        text = self._format_chat_ctx(chat_ctx)
-        inputs = self._tokenizer(
-            text,
-            add_special_tokens=False,
-            return_tensors="np",
-            max_length=MAX_HISTORY_TOKENS,
-            truncation=True,
-        )
-        # Run inference
-        outputs = self._session.run(None, {"input_ids": inputs["input_ids"].astype("int64")})
-        eou_probability = outputs[0][0]
+        key = tuple((msg["role"], msg["content"]) for msg in self._parse_input(data))
+        with self._cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+
+        prefix_hit = False
+        eou_probability: float
+        if cached is not None:
+            eou_probability, text = cached
+        else:
+            text = self._format_chat_ctx(
+                [{"role": role, "content": content} for role, content in key]
+            )
+            input_ids, prefix_hit = self._tokenize(text)
+            outputs = self._session.run(None, {"input_ids": np.array([input_ids], dtype=np.int64)})
+            eou_probability = float(np.asarray(outputs[0]).reshape(-1)[0])
+
+            with self._cache_lock:
+                self._result_cache[key] = (eou_probability, text)
+                if len(self._result_cache) > MAX_CACHED_RESULTS:
+                    self._result_cache.popitem(last=False)
+
         end_time = time.perf_counter()
 
-        data = {
-            "eou_probability": float(eou_probability),
+        data_json = {
+            "eou_probability": eou_probability,
             "input": text,
             "duration": round(end_time - start_time, 3),
+            "cache_hit": cached is not None,
+            "prefix_cache_hit": prefix_hit,
         }
-        return json.dumps(data).encode()
+        return json.dumps(data_json).encode()
 
 
 class EOUModelBase(ABC):
@@ -174,6 +237,17 @@ class EOUModelBase(ABC):
     async def predict_end_of_turn(
         self, chat_ctx: llm.ChatContext, *, timeout: float | None = 3
     ) -> float:
+        eou_probability, _ = await self.predict_end_of_turn_with_cache_info(
+            chat_ctx, timeout=timeout
+        )
+        return eou_probability
+
+    async def predict_end_of_turn_with_cache_info(
+        self, chat_ctx: llm.ChatContext, *, timeout: float | None = 3
+    ) -> tuple[float, bool]:
+        """Same as predict_end_of_turn, also returns whether the prediction was answered from the
+        result cache of the inference runner. The model can be shared by several sessions, the
+        cache info is returned for each call instead of being counted on the model."""
         messages = []
 
         for item in chat_ctx.items:
@@ -209,4 +283,4 @@ class EOUModelBase(ABC):
             "eou prediction",
             extra=result_json,
         )
-        return result_json["eou_probability"]
+        return result_json["eou_probability"], bool(result_json.get("cache_hit"))
@@ -0,0 +1,77 @@
+"""Throughput benchmark of utils.audio.AudioByteStream on large pushes.
+
+Compares the previous implementation (reslicing the remaining bytearray after each emitted
+frame) with the current push() and push_bulk() when decoded audio arrives in big chunks,
+e.g. a whole HTTP response from a TTS provider.
+
+    python tests/benchmarks/bench_audio_byte_stream.py
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from livekit import rtc
+from livekit.agents.utils.audio import AudioByteStream
+
+SAMPLE_RATE = 24000
+SAMPLES_PER_CHANNEL = SAMPLE_RATE // 100  # 10ms frames
+PUSH_SIZES = [4 * 1024, 64 * 1024, 1024 * 1024]
+TOTAL_SIZE = 8 * 1024 * 1024
+
+
+class _ReslicingByteStream:
+    """The previous AudioByteStream.push"""
+
+    def __init__(self, sample_rate: int, num_channels: int, samples_per_channel: int) -> None:
+        self._sample_rate = sample_rate
+        self._num_channels = num_channels
+        self._bytes_per_frame = num_channels * samples_per_channel * 2
+        self._buf = bytearray()
+
+    def push(self, data: bytes) -> list[rtc.AudioFrame]:
+        self._buf.extend(data)
+
+        frames = []
+        while len(self._buf) >= self._bytes_per_frame:
+            frame_data = self._buf[: self._bytes_per_frame]
+            self._buf = self._buf[self._bytes_per_frame :]
+
+            frames.append(
+                rtc.AudioFrame(
+                    data=frame_data,
+                    sample_rate=self._sample_rate,
+                    num_channels=self._num_channels,
+                    samples_per_channel=len(frame_data) // 2,
+                )
+            )
+
+        return frames
+
+
+def _bench(push, chunk: bytes) -> float:
+    started_at = time.perf_counter()
+    for _ in range(TOTAL_SIZE // len(chunk)):
+        push(chunk)
+
+    return TOTAL_SIZE / (time.perf_counter() - started_at) / 1024 / 1024
+
+
+def main() -> None:
+    print(
+        f"{'push size':>10} {'reslicing (MB/s)':>17} {'push (MB/s)':>12} {'push_bulk (MB/s)':>17}"
+    )
+    for size in PUSH_SIZES:
+        chunk = os.urandom(size)
+        legacy = _ReslicingByteStream(SAMPLE_RATE, 1, SAMPLES_PER_CHANNEL)
+        bstream = AudioByteStream(SAMPLE_RATE, 1, SAMPLES_PER_CHANNEL)
+        bulk_bstream = AudioByteStream(SAMPLE_RATE, 1, SAMPLES_PER_CHANNEL)
+        print(
+            f"{size // 1024:>8}KB {_bench(legacy.push, chunk):>17.1f} "
+            f"{_bench(bstream.push, chunk):>12.1f} {_bench(bulk_bstream.push_bulk, chunk):>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark of llm.utils.compute_chat_ctx_diff on long chat contexts.
+
+Measures the diff of a ChatContext of 100/1k/10k items against the usual updates done by
+realtime models: a few appended items, a removed item in the middle, and the truncation of the
+oldest items. The previous full DP table LCS is reported for comparison (skipped at 10k items).
+
+    python tests/benchmarks/bench_chat_ctx_diff.py
+"""
+
+from __future__ import annotations
+
+import time
+
+from livekit.agents.llm import ChatContext, ChatMessage, utils
+
+SIZES = [100, 1_000, 10_000]
+MAX_DP_SIZE = 1_000
+
+
+def _dp_lcs(old_ids: list[str], new_ids: list[str]) -> list[str]:
+    """The previous _compute_lcs"""
+    n, m = len(old_ids), len(new_ids)
+    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            if old_ids[i - 1] == new_ids[j - 1]:
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+
+    lcs_ids = []
+    i, j = n, m
+    while i > 0 and j > 0:
+        if old_ids[i - 1] == new_ids[j - 1]:
+            lcs_ids.append(old_ids[i - 1])
+            i -= 1
+            j -= 1
+        elif dp[i - 1][j] > dp[i][j - 1]:
+            i -= 1
+        else:
+            j -= 1
+
+    return list(reversed(lcs_ids))
+
+
+def _updates(old_ctx: ChatContext) -> dict[str, ChatContext]:
+    appended = old_ctx.copy()
+    appended.add_message(role="user", content="new question")
+    appended.add_message(role="assistant", content="new answer")
+
+    removed = old_ctx.copy()
+    removed.items.pop(len(removed.items) // 2)
+
+    truncated = old_ctx.copy()
+    truncated.items[: len(truncated.items) // 10] = []
+
+    return {"append": appended, "remove": removed, "truncate": truncated}
+
+
+def _timeit(fnc, repeat: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        fnc()
+
+    return (time.perf_counter() - started_at) / repeat * 1000
+
+
+def main() -> None:
+    print(f"{'items':>7} {'update':>9} {'diff (ms)':>10} {'dp lcs (ms)':>12}")
+    for size in SIZES:
+        old_ctx = ChatContext([ChatMessage(role="user", content=[f"{i}"]) for i in range(size)])
+        old_ids = [item.id for item in old_ctx.items]
+        for name, new_ctx in _updates(old_ctx).items():
+            new_ids = [item.id for item in new_ctx.items]
+            repeat = max(1, 10_000 // size)
+            diff_ms = _timeit(lambda: utils.compute_chat_ctx_diff(old_ctx, new_ctx), repeat)  # noqa: B023
+            dp_ms = (
+                f"{_timeit(lambda: _dp_lcs(old_ids, new_ids), 1):>12.2f}"  # noqa: B023
+                if size <= MAX_DP_SIZE
+                else f"{'-':>12}"
+            )
+            print(f"{size:>7} {name:>9} {diff_ms:>10.3f} {dp_ms}")
+
+
+if __name__ == "__main__":
+    main()
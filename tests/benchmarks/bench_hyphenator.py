@@ -0,0 +1,144 @@
+"""Cost of the basic hyphenator used by the transcript synchronization.
+
+Compares the previous Hyphenator (pattern tree built when the module is imported, no cache) with
+the current one (flat pattern table compiled on first use, LRU cache of the words): the time
+spent loading the module, building the patterns, and hyphenating the words of a long transcript.
+
+    python tests/benchmarks/bench_hyphenator.py
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import pathlib
+import re
+import time
+
+from livekit.agents.tokenize import _basic_hyphenator
+from livekit.agents.tokenize._basic_hyphenator import EXCEPTIONS, PATTERNS, Hyphenator
+
+ROUNDS = 5
+TRANSCRIPT = pathlib.Path(__file__).parent.parent / "long_transcript.txt"
+
+
+class _PreviousHyphenator:
+    """The previous Hyphenator"""
+
+    def __init__(self, patterns, exceptions=""):
+        self.tree = {}
+        for pattern in patterns.split():
+            self._insert_pattern(pattern)
+
+        self.exceptions = {}
+        for ex in exceptions.split():
+            points = [0] + [int(h == "-") for h in re.split(r"[a-z]", ex)]
+            self.exceptions[ex.replace("-", "")] = points
+
+    def _insert_pattern(self, pattern):
+        chars = re.sub("[0-9]", "", pattern)
+        points = [int(d or 0) for d in re.split("[.a-z]", pattern)]
+
+        t = self.tree
+        for c in chars:
+            if c not in t:
+                t[c] = {}
+            t = t[c]
+        t[None] = points
+
+    def hyphenate_word(self, word: str) -> list[str]:
+        if len(word) <= 4:
+            return [word]
+        if word.lower() in self.exceptions:
+            points = self.exceptions[word.lower()]
+        else:
+            work = "." + word.lower() + "."
+            points = [0] * (len(work) + 1)
+            for i in range(len(work)):
+                t = self.tree
+                for c in work[i:]:
+                    if c in t:
+                        t = t[c]
+                        if None in t:
+                            p = t[None]
+                            for j, p_j in enumerate(p):
+                                points[i + j] = max(points[i + j], p_j)
+                    else:
+                        break
+            points[1] = points[2] = points[-2] = points[-3] = 0
+
+        pieces = [""]
+        for c, p in zip(word, points[2:]):
+            pieces[-1] += c
+            if p % 2:
+                pieces.append("")
+        return pieces
+
+
+def _load_module() -> None:
+    spec = importlib.util.spec_from_file_location("_bench_hyphenator", _basic_hyphenator.__file__)
+    assert spec is not None and spec.loader is not None
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+
+
+def _hyphenate_all(hyphenate_word, words: list[str]) -> int:
+    return sum(len(hyphenate_word(w)) for w in words)
+
+
+def _best_ms(fnc, *args) -> float:
+    """time in ms of one call, best of ROUNDS"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        fnc(*args)
+        best = min(best, time.perf_counter() - started_at)
+    return best * 1000
+
+
+def _first_word_ms() -> float:
+    """construction and first call of a new Hyphenator, best of ROUNDS"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        Hyphenator(PATTERNS, EXCEPTIONS).hyphenate_word("hyphenation")
+        best = min(best, time.perf_counter() - started_at)
+    return best * 1000
+
+
+def main() -> None:
+    words = re.findall(r"[A-Za-z']+", TRANSCRIPT.read_text())
+    previous = _PreviousHyphenator(PATTERNS, EXCEPTIONS)
+    for w in set(words):
+        assert previous.hyphenate_word(w) == Hyphenator(PATTERNS, EXCEPTIONS).hyphenate_word(w)
+
+    print("startup")
+    print(f"  module load (patterns compiled lazily): {_best_ms(_load_module):>8.2f}ms")
+    print(
+        f"  previous construction:                  "
+        f"{_best_ms(_PreviousHyphenator, PATTERNS, EXCEPTIONS):>8.2f}ms"
+    )
+    print(f"  compilation on the first word:          {_first_word_ms():>8.2f}ms")
+
+    uncached = Hyphenator(PATTERNS, EXCEPTIONS)
+    uncached.hyphenate_word("hyphenation")  # compile the patterns
+
+    def _uncached(words: list[str]) -> int:
+        uncached._cached_hyphenate.cache_clear()
+        return sum(len(uncached.hyphenate_word(w)) for w in words)
+
+    cached = Hyphenator(PATTERNS, EXCEPTIONS)
+    _hyphenate_all(cached.hyphenate_word, words)
+
+    n = len(words)
+    print(f"\n{n} words ({len(set(words))} distinct) of {TRANSCRIPT.name}")
+    print(f"{'':>22} {'total':>10} {'per word':>10}")
+    for name, fnc, hyphenate_word in (
+        ("previous", _hyphenate_all, previous.hyphenate_word),
+        ("table, no cache", lambda _, w: _uncached(w), None),
+        ("table, cached", _hyphenate_all, cached.hyphenate_word),
+    ):
+        total = _best_ms(fnc, hyphenate_word, words)
+        print(f"{name:>22} {total:>8.2f}ms {total * 1000 / n:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Round-trip benchmark of the IPC transports used between the worker and its subprocesses.
+
+Compares the length-prefixed unix socket duplex (_AsyncDuplex) with the shared memory rings
+(_AsyncShmDuplex) on InferenceRequest messages from 100 B to 1 MB.
+
+    python tests/benchmarks/bench_ipc_transport.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing as mp
+import os
+import socket
+import time
+
+from livekit.agents import ipc, utils
+
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+RING_SIZE = 4 * 1024 * 1024
+DURATION = 1.0  # seconds per measurement
+
+
+def _echo_main(mp_cch: socket.socket, down_ring: str, up_ring: str) -> None:
+    async def _echo() -> None:
+        dplx: ipc.channel.AsyncDuplex = await utils.aio.duplex_unix._AsyncDuplex.open(mp_cch)
+        if down_ring:
+            dplx = utils.aio.duplex_shm._AsyncShmDuplex(
+                dplx,
+                tx=utils.aio.duplex_shm._ShmRing.attach(up_ring),
+                rx=utils.aio.duplex_shm._ShmRing.attach(down_ring),
+            )
+
+        while True:
+            try:
+                msg = await ipc.channel.arecv_message(dplx, ipc.proto.IPC_MESSAGES)
+                await ipc.channel.asend_message(dplx, msg)
+            except utils.aio.duplex_unix.DuplexClosed:
+                break
+
+        await dplx.aclose()
+
+    asyncio.run(_echo())
+
+
+async def _bench(transport: str, size: int) -> tuple[int, float]:
+    down_ring = up_ring = None
+    if transport == "shm":
+        down_ring = utils.aio.duplex_shm._ShmRing.create(RING_SIZE)
+        up_ring = utils.aio.duplex_shm._ShmRing.create(RING_SIZE)
+
+    mp_pch, mp_cch = socket.socketpair()
+    proc = mp.get_context("spawn").Process(
+        target=_echo_main,
+        args=(mp_cch, down_ring.name if down_ring else "", up_ring.name if up_ring else ""),
+    )
+    proc.start()
+    mp_cch.close()
+
+    pch: ipc.channel.AsyncDuplex = await utils.aio.duplex_unix._AsyncDuplex.open(mp_pch)
+    if down_ring is not None and up_ring is not None:
+        pch = utils.aio.duplex_shm._AsyncShmDuplex(pch, tx=down_ring, rx=up_ring)
+
+    req = ipc.proto.InferenceRequest(method="bench", request_id="req", data=os.urandom(size))
+
+    # warmup
+    for _ in range(10):
+        await ipc.channel.asend_message(pch, req)
+        await ipc.channel.arecv_message(pch, ipc.proto.IPC_MESSAGES)
+
+    count = 0
+    started_at = time.perf_counter()
+    while (elapsed := time.perf_counter() - started_at) < DURATION:
+        await ipc.channel.asend_message(pch, req)
+        await ipc.channel.arecv_message(pch, ipc.proto.IPC_MESSAGES)
+        count += 1
+
+    await pch.aclose()
+    proc.join()
+    return count, elapsed
+
+
+async def main() -> None:
+    print(f"{'size':>10} {'transport':>10} {'round trips/s':>14} {'latency (us)':>13} {'MB/s':>9}")
+    for size in SIZES:
+        for transport in ("unix", "shm"):
+            count, elapsed = await _bench(transport, size)
+            print(
+                f"{size:>10} {transport:>10} {count / elapsed:>14.0f} "
+                f"{elapsed / count * 1e6:>13.1f} {2 * size * count / elapsed / 1e6:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,187 @@
+"""CPU cost of the audio events of the OpenAI realtime session.
+
+Simulates one minute of bidirectional audio: 10ms input frames pushed by the microphone and
+serialized as input_audio_buffer.append events, and response.audio.delta events decoded into
+AudioFrames. The previous path (pydantic events, model_dump and json.dumps) is compared with the
+templated one for a few input_audio_send_interval, no network is involved.
+
+    python tests/benchmarks/bench_realtime_audio.py
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import time
+
+from openai.types.beta.realtime import InputAudioBufferAppendEvent, ResponseAudioDeltaEvent
+
+from livekit import rtc
+from livekit.agents.utils.audio import AudioByteStream
+from livekit.plugins.openai.realtime.realtime_model import (
+    NUM_CHANNELS,
+    SAMPLE_RATE,
+    _InputAudioAppend,
+)
+
+DURATION = 60.0
+INPUT_FRAME_SIZE = SAMPLE_RATE // 100  # 10ms frames from the microphone
+OUTPUT_DELTA_SIZE = SAMPLE_RATE // 10  # 100ms response.audio.delta
+SEND_INTERVALS = [0.05, 0.1, 0.2]
+ROUNDS = 5
+
+# the event types checked before response.audio.delta by the previous dispatch
+_PREVIOUS_DISPATCH_TYPES = [
+    "input_audio_buffer.speech_started",
+    "input_audio_buffer.speech_stopped",
+    "response.created",
+    "response.output_item.added",
+    "conversation.item.created",
+    "conversation.item.deleted",
+    "conversation.item.input_audio_transcription.completed",
+    "conversation.item.input_audio_transcription.failed",
+    "response.content_part.added",
+    "response.content_part.done",
+    "response.audio_transcript.delta",
+]
+
+
+def _input_frames() -> list[rtc.AudioFrame]:
+    return [
+        rtc.AudioFrame(
+            data=os.urandom(INPUT_FRAME_SIZE * 2),
+            sample_rate=SAMPLE_RATE,
+            num_channels=NUM_CHANNELS,
+            samples_per_channel=INPUT_FRAME_SIZE,
+        )
+        for _ in range(int(DURATION * SAMPLE_RATE / INPUT_FRAME_SIZE))
+    ]
+
+
+def _server_events() -> list[str]:
+    return [
+        json.dumps(
+            {
+                "type": "response.audio.delta",
+                "event_id": f"event_{i}",
+                "response_id": "resp_1",
+                "item_id": "item_1",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": base64.b64encode(os.urandom(OUTPUT_DELTA_SIZE * 2)).decode(),
+            }
+        )
+        for i in range(int(DURATION * SAMPLE_RATE / OUTPUT_DELTA_SIZE))
+    ]
+
+
+def _previous_send(frames: list[rtc.AudioFrame], send_interval: float) -> int:
+    """The previous push_audio and _send_task"""
+    bstream = AudioByteStream(SAMPLE_RATE, NUM_CHANNELS, int(SAMPLE_RATE * send_interval))
+    sent = 0
+    for f in frames:
+        for nf in bstream.write(f.data.tobytes()):
+            event = InputAudioBufferAppendEvent(
+                type="input_audio_buffer.append",
+                audio=base64.b64encode(nf.data).decode("utf-8"),
+            )
+            msg = event.model_dump(by_alias=True, exclude_unset=True, exclude_defaults=False)
+            json.dumps(msg)
+            sent += 1
+    return sent
+
+
+def _templated_send(frames: list[rtc.AudioFrame], send_interval: float) -> int:
+    bstream = AudioByteStream(SAMPLE_RATE, NUM_CHANNELS, int(SAMPLE_RATE * send_interval))
+    bytes_per_frame = bstream.bytes_per_frame
+    sent = 0
+    for f in frames:
+        data, offsets = bstream.push_bulk(f.data.tobytes())
+        view = memoryview(data)
+        for offset in offsets:
+            msg = _InputAudioAppend(
+                audio=base64.b64encode(view[offset : offset + bytes_per_frame]).decode("ascii")
+            )
+            msg.to_json()
+            sent += 1
+    return sent
+
+
+def _previous_recv(events: list[str]) -> int:
+    """The previous _recv_task dispatch and _handle_response_audio_delta"""
+    received = 0
+    for raw in events:
+        event = json.loads(raw)
+        for event_type in _PREVIOUS_DISPATCH_TYPES:
+            if event["type"] == event_type:
+                break
+
+        delta = ResponseAudioDeltaEvent.construct(**event)
+        data = base64.b64decode(delta.delta)
+        frame = rtc.AudioFrame(
+            data=data,
+            sample_rate=SAMPLE_RATE,
+            num_channels=NUM_CHANNELS,
+            samples_per_channel=len(data) // 2,
+        )
+        received += frame.samples_per_channel
+    return received
+
+
+def _dict_recv(events: list[str]) -> int:
+    received = 0
+    for raw in events:
+        event = json.loads(raw)
+        if event["type"] == "response.audio.delta":
+            data = base64.b64decode(event["delta"])
+            frame = rtc.AudioFrame(
+                data=data,
+                sample_rate=SAMPLE_RATE,
+                num_channels=NUM_CHANNELS,
+                samples_per_channel=len(data) // 2,
+            )
+            received += frame.samples_per_channel
+    return received
+
+
+def _cpu_ms(fnc, *args) -> float:
+    """CPU time in ms of one call, best of ROUNDS"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started_at = time.process_time()
+        fnc(*args)
+        best = min(best, time.process_time() - started_at)
+    return best * 1000
+
+
+def main() -> None:
+    frames = _input_frames()
+    events = _server_events()
+    assert _previous_send(frames, 0.1) == _templated_send(frames, 0.1)
+    msg = _InputAudioAppend(audio=base64.b64encode(frames[0].data).decode("ascii"))
+    assert json.loads(msg.to_json()) == msg.to_dict()
+    assert _previous_recv(events) == _dict_recv(events)
+
+    previous_recv = _cpu_ms(_previous_recv, events)
+    dict_recv = _cpu_ms(_dict_recv, events)
+
+    delta_ms = OUTPUT_DELTA_SIZE * 1000 // SAMPLE_RATE
+    print(f"CPU time per minute of bidirectional audio ({delta_ms}ms response.audio.delta)")
+    print(
+        f"{'send interval':>14} {'previous send':>14} {'templated send':>15} "
+        f"{'previous total':>15} {'new total':>10}"
+    )
+    for interval in SEND_INTERVALS:
+        previous_send = _cpu_ms(_previous_send, frames, interval)
+        templated_send = _cpu_ms(_templated_send, frames, interval)
+        print(
+            f"{interval * 1000:>12.0f}ms {previous_send:>12.1f}ms {templated_send:>13.1f}ms "
+            f"{previous_send + previous_recv:>13.1f}ms {templated_send + dict_recv:>8.1f}ms"
+        )
+
+    print(f"\nresponse.audio.delta: previous {previous_recv:.1f}ms, dict {dict_recv:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
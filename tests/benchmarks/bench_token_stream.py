@@ -0,0 +1,68 @@
+"""Benchmark of the streamed tokenizers on LLM-like responses pushed one token at a time.
+
+Reports the total time spent in push_text/flush for responses of increasing size, the time
+per KB should stay flat as the response grows.
+
+    python tests/benchmarks/bench_token_stream.py
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+
+from livekit.agents.tokenize import basic
+
+SIZES_KB = [1, 4, 16, 64]
+PROSE = open(os.path.join(os.path.dirname(__file__), "..", "long_synthesize.txt")).read()
+# markdown-like output without any sentence punctuation
+RUN_ON = "".join(f"- item {i} with a short description and some details\n" for i in range(40))
+# a single sentence with dots that don't end it
+DECIMALS = "".join(
+    f"the version {i}.5 of the app costs a few dollars more each month, " for i in range(40)
+)
+
+
+def _llm_tokens(text: str) -> list[str]:
+    # roughly the size of the deltas returned by LLMs
+    return re.findall(r"\s*\S{1,4}", text)
+
+
+def _bench(make_stream, text: str) -> float:
+    tokens = _llm_tokens(text)
+    stream = make_stream()
+    started_at = time.perf_counter()
+    for tok in tokens:
+        stream.push_text(tok)
+    stream.flush()
+    elapsed = time.perf_counter() - started_at
+    stream.end_input()
+    return elapsed
+
+
+def main() -> None:
+    streams = {
+        "sentence": lambda: basic.SentenceTokenizer().stream(),
+        "sentence (retain_format)": lambda: basic.SentenceTokenizer(retain_format=True).stream(),
+        "word": lambda: basic.WordTokenizer().stream(),
+    }
+
+    print(f"{'stream':>26} {'text':>8} {'size':>6} {'total (ms)':>11} {'per KB (ms)':>12}")
+    for name, make_stream in streams.items():
+        for text_name, base in (
+            ("prose", PROSE),
+            ("run-on", RUN_ON.replace("\n", " ")),
+            ("decimals", DECIMALS),
+        ):
+            for size_kb in SIZES_KB:
+                text = (base * (size_kb * 1024 // len(base) + 1))[: size_kb * 1024]
+                elapsed = _bench(make_stream, text)
+                print(
+                    f"{name:>26} {text_name:>8} {size_kb:>4}KB {elapsed * 1000:>11.2f} "
+                    f"{elapsed * 1000 / size_kb:>12.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
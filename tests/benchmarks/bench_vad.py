@@ -0,0 +1,93 @@
+"""Throughput benchmark of the silero VADStream on recorded speech.
+
+Feeds the PCM of an audio file (tests/long.mp3 by default) as 10ms frames through concurrent
+VADStreams and reports the number of inference windows processed per second. In "realtime"
+mode a frame is pushed per event loop iteration, in "backlog" mode the whole file is queued at
+once (e.g. what the stream has to catch up on after an event loop stall).
+
+    python tests/benchmarks/bench_vad.py [audio_file]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+from livekit import rtc
+from livekit.agents import utils, vad
+from livekit.plugins import silero
+
+CONCURRENCY = [1, 4, 16]
+FRAME_DURATION = 0.01
+DEFAULT_AUDIO = os.path.join(os.path.dirname(__file__), "..", "long.mp3")
+
+
+async def _read_audio(path: str) -> rtc.AudioFrame:
+    decoder = utils.codecs.AudioStreamDecoder(sample_rate=48000, num_channels=1)
+    with open(path, "rb") as f:
+        while chunk := f.read(4096):
+            decoder.push(chunk)
+    decoder.end_input()
+
+    return rtc.combine_audio_frames([frame async for frame in decoder])
+
+
+def _split_frames(audio: rtc.AudioFrame) -> list[rtc.AudioFrame]:
+    samples = int(audio.sample_rate * FRAME_DURATION)
+    data = audio.data
+    return [
+        rtc.AudioFrame(
+            data=data[i : i + samples].tobytes(),
+            sample_rate=audio.sample_rate,
+            num_channels=1,
+            samples_per_channel=len(data[i : i + samples]),
+        )
+        for i in range(0, len(data), samples)
+    ]
+
+
+async def _run_stream(stream: vad.VADStream, frames: list[rtc.AudioFrame], backlog: bool) -> int:
+    async def _push() -> None:
+        for frame in frames:
+            stream.push_frame(frame)
+            if not backlog:
+                await asyncio.sleep(0)
+
+        stream.end_input()
+
+    push_task = asyncio.create_task(_push())
+    windows = 0
+    async for ev in stream:
+        if ev.type == vad.VADEventType.INFERENCE_DONE:
+            windows += 1
+
+    await push_task
+    return windows
+
+
+async def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_AUDIO
+    frames = _split_frames(await _read_audio(path))
+    silero_vad = silero.VAD.load()
+
+    print(f"{'mode':>9} {'streams':>8} {'windows':>8} {'elapsed (s)':>12} {'windows/s':>10}")
+    for mode in ("realtime", "backlog"):
+        for concurrency in CONCURRENCY:
+            started_at = time.perf_counter()
+            windows = await asyncio.gather(
+                *[
+                    _run_stream(silero_vad.stream(), frames, mode == "backlog")
+                    for _ in range(concurrency)
+                ]
+            )
+            elapsed = time.perf_counter() - started_at
+            print(
+                f"{mode:>9} {concurrency:>8} {sum(windows):>8} {elapsed:>12.2f} "
+                f"{sum(windows) / elapsed:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
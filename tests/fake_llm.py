@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from livekit.agents import NOT_GIVEN, NotGivenOr, utils
+from livekit.agents.llm import (
+    LLM,
+    ChatChunk,
+    ChatContext,
+    ChoiceDelta,
+    CompletionUsage,
+    FunctionTool,
+    LLMStream,
+    ToolChoice,
+)
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
+
+
+class FakeLLM(LLM):
+    """Replies with `fake_response` followed by the text of the last user message"""
+
+    def __init__(
+        self,
+        *,
+        fake_response: str = "reply to: ",
+        fake_timeout: float | None = None,
+        fake_exception: Exception | None = None,
+    ) -> None:
+        super().__init__()
+
+        self._fake_response = fake_response
+        self._fake_timeout = fake_timeout
+        self._fake_exception = fake_exception
+
+        self._chat_ch = utils.aio.Chan[FakeLLMStream]()
+        self._streams: list[FakeLLMStream] = []
+
+    def update_options(
+        self,
+        *,
+        fake_response: NotGivenOr[str] = NOT_GIVEN,
+        fake_timeout: NotGivenOr[float | None] = NOT_GIVEN,
+        fake_exception: NotGivenOr[Exception | None] = NOT_GIVEN,
+    ) -> None:
+        if utils.is_given(fake_response):
+            self._fake_response = fake_response
+
+        if utils.is_given(fake_timeout):
+            self._fake_timeout = fake_timeout
+
+        if utils.is_given(fake_exception):
+            self._fake_exception = fake_exception
+
+    @property
+    def chat_ch(self) -> utils.aio.ChanReceiver[FakeLLMStream]:
+        return self._chat_ch
+
+    @property
+    def streams(self) -> list[FakeLLMStream]:
+        return self._streams
+
+    def chat(
+        self,
+        *,
+        chat_ctx: ChatContext,
+        tools: list[FunctionTool] | None = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        parallel_tool_calls: NotGivenOr[bool] = NOT_GIVEN,
+        tool_choice: NotGivenOr[ToolChoice] = NOT_GIVEN,
+        extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
+    ) -> FakeLLMStream:
+        stream = FakeLLMStream(
+            self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options
+        )
+        self._streams.append(stream)
+        self._chat_ch.send_nowait(stream)
+        return stream
+
+
+class FakeLLMStream(LLMStream):
+    def __init__(
+        self,
+        llm: FakeLLM,
+        *,
+        chat_ctx: ChatContext,
+        tools: list[FunctionTool],
+        conn_options: APIConnectOptions,
+    ) -> None:
+        super().__init__(llm, chat_ctx=chat_ctx, tools=tools, conn_options=conn_options)
+        self._llm: FakeLLM = llm
+
+    @property
+    def user_input(self) -> str | None:
+        for item in reversed(self._chat_ctx.items):
+            if item.type == "message" and item.role == "user":
+                return item.text_content
+        return None
+
+    async def _run(self) -> None:
+        if self._llm._fake_timeout is not None:
+            await asyncio.sleep(self._llm._fake_timeout)
+
+        if self._llm._fake_exception is not None:
+            raise self._llm._fake_exception
+
+        text = self._llm._fake_response + (self.user_input or "")
+        self._event_ch.send_nowait(
+            ChatChunk(id="fake", delta=ChoiceDelta(role="assistant", content=text))
+        )
+        self._event_ch.send_nowait(
+            ChatChunk(
+                id="fake",
+                usage=CompletionUsage(
+                    completion_tokens=len(text.split()), prompt_tokens=10, total_tokens=10
+                ),
+            )
+        )
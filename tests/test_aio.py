@@ -39,3 +39,28 @@ async def test_sleep():
     sleep = aio.sleep(5)
     sleep.reset(0.1)
     await sleep
+
+
+async def test_timer_wheel():
+    loop = asyncio.get_running_loop()
+    wheel = aio.TimerWheel(tick=0.02, slots=4)
+    fired: list[tuple[str, float]] = []
+
+    def _fire(name: str) -> None:
+        fired.append((name, loop.time()))
+
+    start = loop.time()
+    wheel.call_later(0.15, _fire, "c")  # more than a turn of the wheel
+    wheel.call_later(0.01, _fire, "a")
+    wheel.call_later(0.05, _fire, "b")
+    wheel.call_later(0.03, _fire, "cancelled").cancel()
+    assert wheel.active_timers == 3
+
+    await asyncio.sleep(0.3)
+    assert [name for name, _ in fired] == ["a", "b", "c"]
+    for (_, at), delay in zip(fired, [0.01, 0.05, 0.15]):
+        # not early (besides the clock resolution), late by at most a tick plus the jitter
+        assert delay - 0.001 <= at - start < delay + 0.02 + 0.05
+
+    assert wheel.active_timers == 0
+    assert aio.shared_timer_wheel() is aio.shared_timer_wheel()
@@ -0,0 +1,51 @@
+import os
+
+from livekit.agents.utils.audio import AudioByteStream
+
+
+def test_push_chunks_frames():
+    data = os.urandom(48000 * 2)  # 1s of mono 48kHz audio
+    bstream = AudioByteStream(sample_rate=48000, num_channels=1, samples_per_channel=480)
+
+    frames = []
+    for i in range(0, len(data), 1234):  # chunks that don't align with the frames
+        frames.extend(bstream.push(data[i : i + 1234]))
+
+    assert len(frames) == 100
+    assert all(frame.samples_per_channel == 480 for frame in frames)
+    assert b"".join(bytes(frame.data) for frame in frames) == data
+    assert bstream.flush() == []
+
+
+def test_push_stereo_and_flush():
+    bstream = AudioByteStream(sample_rate=16000, num_channels=2, samples_per_channel=160)
+
+    data = os.urandom(160 * 2 * 2 * 3 + 40)
+    frames = bstream.push(data)
+    assert len(frames) == 3
+    assert all(frame.num_channels == 2 and frame.samples_per_channel == 160 for frame in frames)
+
+    rest = bstream.flush()
+    assert len(rest) == 1
+    assert rest[0].samples_per_channel == 10
+    assert bytes(rest[0].data) == data[-40:]
+
+    # the flushed data isn't emitted again
+    assert bstream.flush() == []
+    assert bytes(bstream.push(data)[0].data) == data[: bstream.bytes_per_frame]
+
+
+def test_push_bulk():
+    bstream = AudioByteStream(sample_rate=24000, num_channels=1, samples_per_channel=240)
+
+    data = os.urandom(240 * 2 * 5 + 100)
+    buf, offsets = bstream.push_bulk(data[:1000])
+    assert offsets == [0, 480]
+    assert buf == data[:960]
+
+    buf, offsets = bstream.push_bulk(data[1000:])
+    assert offsets == [0, 480, 960]
+    assert buf == data[960:2400]
+
+    rest = bstream.flush()
+    assert bytes(rest[0].data) == data[2400:]
@@ -1,4 +1,6 @@
+import asyncio
 import os
+import struct
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
@@ -150,3 +152,143 @@ def test_stream_buffer_early_close():
 
     # Reading from closed buffer should return empty bytes
     assert buffer.read() == b""
+
+
+def test_stream_buffer_partial_reads():
+    buffer = StreamBuffer()
+    buffer.write(b"hello")
+    buffer.write(b"world")
+
+    assert buffer.read(3) == b"hel"
+    assert buffer.read(4) == b"lowo"
+    buffer.write(b"!")
+    buffer.end_input()
+    assert buffer.read() == b"rld!"
+    assert buffer.read() == b""
+
+
+def _make_wav(pcm: bytes, sample_rate: int) -> bytes:
+    header = b"RIFF" + struct.pack("<I", 36 + len(pcm)) + b"WAVE"
+    header += b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    header += b"data" + struct.pack("<I", len(pcm))
+    return header + pcm
+
+
+async def test_decode_wav_stream():
+    sample_rate = 16000
+    pcm = os.urandom(sample_rate * 2 * 3)  # 3s of mono audio
+    data = _make_wav(pcm, sample_rate)
+
+    decoder = AudioStreamDecoder(sample_rate=sample_rate, num_channels=1, format="wav")
+    for i in range(0, len(data), 1000):
+        decoder.push(data[i : i + 1000])
+    decoder.end_input()
+
+    frames = [frame async for frame in decoder]
+    assert sum(frame.samples_per_channel for frame in frames) == len(pcm) // 2
+
+
+async def test_decoder_backpressure():
+    sample_rate = 16000
+    data = _make_wav(os.urandom(sample_rate * 2 * 30), sample_rate)  # 30s of mono audio
+
+    decoder = AudioStreamDecoder(
+        sample_rate=sample_rate, num_channels=1, format="wav", max_buffered_duration=5.0
+    )
+    decoder.push(data)
+    decoder.end_input()
+
+    # the decoder stops once 5s of audio are waiting to be consumed
+    await asyncio.sleep(0.5)
+    assert 5.0 <= decoder.stats.queued_duration < 6.0
+    assert decoder.stats.queued_input_bytes > 0
+
+    duration = sum([frame.duration async for frame in decoder])
+    assert duration == pytest.approx(30.0)
+    assert decoder.stats.queued_input_bytes == 0
+    await decoder.aclose()
+
+
+async def test_decoders_waiting_for_input():
+    sample_rate = 16000
+    pcm = os.urandom(sample_rate * 2)
+    data = _make_wav(pcm, sample_rate)
+
+    # more decoders than workers, all of them waiting for the rest of their header
+    waiting = [
+        AudioStreamDecoder(sample_rate=sample_rate, num_channels=1, format="wav")
+        for _ in range(AudioStreamDecoder._max_workers + 2)
+    ]
+    for decoder in waiting:
+        decoder.push(data[:5])
+    await asyncio.sleep(0.1)
+
+    decoder = AudioStreamDecoder(sample_rate=sample_rate, num_channels=1, format="wav")
+    decoder.push(data)
+    decoder.end_input()
+
+    frames = await asyncio.wait_for(_collect(decoder), timeout=5.0)
+    assert sum(frame.samples_per_channel for frame in frames) == len(pcm) // 2
+
+    # the waiting decoders resume once their input arrives
+    for decoder in waiting:
+        decoder.push(data[5:])
+        decoder.end_input()
+
+    for frames in await asyncio.wait_for(
+        asyncio.gather(*[_collect(decoder) for decoder in waiting]), timeout=5.0
+    ):
+        assert sum(frame.samples_per_channel for frame in frames) == len(pcm) // 2
+
+
+def _make_mp3(duration: float, sample_rate: int) -> bytes:
+    import io
+
+    import av
+    import numpy as np
+
+    buf = io.BytesIO()
+    with av.open(buf, "w", format="mp3") as container:
+        stream = container.add_stream("mp3", rate=sample_rate)
+        stream.layout = "mono"
+        samples = np.zeros((1, int(duration * sample_rate)), dtype=np.int16)
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="mono")
+        frame.sample_rate = sample_rate
+        for packet in [*stream.encode(frame), *stream.encode(None)]:
+            container.mux(packet)
+
+    return buf.getvalue()
+
+
+async def test_ffmpeg_decoders_waiting_for_input():
+    sample_rate = 16000
+    data = _make_mp3(1.0, sample_rate)
+
+    # more decoders than workers, ffmpeg is blocked reading the rest of their stream
+    waiting = [
+        AudioStreamDecoder(sample_rate=sample_rate, num_channels=1, format="mp3")
+        for _ in range(AudioStreamDecoder._max_workers + 2)
+    ]
+    for decoder in waiting:
+        decoder.push(data[:300])
+    await asyncio.sleep(0.1)
+
+    decoder = AudioStreamDecoder(sample_rate=sample_rate, num_channels=1, format="mp3")
+    decoder.push(data)
+    decoder.end_input()
+
+    frames = await asyncio.wait_for(_collect(decoder), timeout=5.0)
+    assert sum(frame.duration for frame in frames) == pytest.approx(1.0, abs=0.1)
+
+    for decoder in waiting:
+        decoder.push(data[300:])
+        decoder.end_input()
+
+    for frames in await asyncio.wait_for(
+        asyncio.gather(*[_collect(decoder) for decoder in waiting]), timeout=5.0
+    ):
+        assert sum(frame.duration for frame in frames) == pytest.approx(1.0, abs=0.1)
+
+
+async def _collect(decoder: AudioStreamDecoder) -> list:
+    return [frame async for frame in decoder]
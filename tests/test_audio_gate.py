@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from livekit import rtc
+from livekit.agents.voice.audio_gate import AudioInputGate
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = SAMPLE_RATE // 100  # 10ms
+FRAME_BYTES = FRAME_SAMPLES * 2
+
+
+def _frame(value: int = 1) -> rtc.AudioFrame:
+    return rtc.AudioFrame(
+        data=value.to_bytes(2, "little", signed=True) * FRAME_SAMPLES,
+        sample_rate=SAMPLE_RATE,
+        num_channels=1,
+        samples_per_channel=FRAME_SAMPLES,
+    )
+
+
+def _push(gate: AudioInputGate, n: int, value: int = 1) -> list[rtc.AudioFrame]:
+    out = []
+    for _ in range(n):
+        out.extend(gate.push(_frame(value)))
+    return out
+
+
+def test_gate_suppresses_silence_and_sends_pre_roll() -> None:
+    gate = AudioInputGate(pre_roll=0.1, hangover=0.2, keepalive_interval=None)
+
+    # 1s of silence before the speech is detected
+    assert _push(gate, 100) == []
+    assert not gate.is_open
+    assert gate.bytes_suppressed == 90 * FRAME_BYTES
+
+    gate.on_start_of_speech()
+    frames = _push(gate, 1, value=2)
+    # the 100ms of pre-roll are sent before the first frame of speech
+    assert len(frames) == 11
+    assert bytes(frames[-1].data) == bytes(_frame(2).data)
+
+    assert len(_push(gate, 50)) == 50
+
+    gate.on_end_of_speech()
+    # the hangover is still sent, then the gate closes
+    assert len(_push(gate, 30)) == 20
+    assert not gate.is_open
+
+    assert gate.bytes_forwarded == (11 + 50 + 20) * FRAME_BYTES
+    assert abs(gate.duration_forwarded - 0.81) < 1e-6
+    assert abs(gate.duration_suppressed - 0.9) < 1e-6
+
+
+def test_gate_keepalive() -> None:
+    gate = AudioInputGate(pre_roll=0.1, hangover=0.0, keepalive_interval=1.0)
+
+    frames = _push(gate, 350)
+    assert len(frames) == 3
+    for f in frames:
+        assert f.samples_per_channel == FRAME_SAMPLES
+        assert not any(bytes(f.data))
+
+
+def test_gate_reset() -> None:
+    gate = AudioInputGate(pre_roll=0.1, keepalive_interval=None)
+    gate.on_start_of_speech()
+    assert gate.is_open
+
+    _push(gate, 5)
+    gate.reset()
+    assert not gate.is_open
+    assert _push(gate, 5) == []
+    gate.reset()
+    assert gate.bytes_suppressed == 5 * FRAME_BYTES
@@ -0,0 +1,115 @@
+import asyncio
+import wave
+
+import numpy as np
+
+from livekit.agents.utils.audio import audio_frames_from_file
+from livekit.agents.voice import background_audio
+from livekit.agents.voice.background_audio import _clip_frames, _ClipCache
+
+SAMPLE_RATE = 48000
+
+
+def _write_wav(path: str, pcm: np.ndarray) -> None:
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+
+
+async def test_clip_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "clip.wav")
+    _write_wav(path, (np.sin(np.arange(SAMPLE_RATE) / 10) * 10000).astype(np.int16))
+    decoded = np.concatenate(
+        [np.frombuffer(frame.data, dtype=np.int16) async for frame in audio_frames_from_file(path)]
+    )
+
+    cache = _ClipCache(mmap_dir=str(tmp_path / "cache"))
+    clips = await asyncio.gather(
+        *[cache.get(path, sample_rate=SAMPLE_RATE, num_channels=1) for _ in range(4)]
+    )
+    assert all(clip is clips[0] for clip in clips)  # decoded once
+    assert isinstance(clips[0], np.memmap)
+    assert np.array_equal(clips[0], decoded)
+
+    half = await cache.get(path, sample_rate=SAMPLE_RATE, num_channels=1, volume=0.5)
+    assert np.abs(half.astype(np.int32) - decoded // 2).max() <= 1
+
+    def _decode(*args, **kwargs):
+        raise AssertionError("the clip should be read from the mmap cache")
+
+    # other processes map the cached clips instead of decoding the file again
+    monkeypatch.setattr(background_audio, "audio_frames_from_file", _decode)
+    other = _ClipCache(mmap_dir=str(tmp_path / "cache"))
+    assert np.array_equal(await other.get(path, sample_rate=SAMPLE_RATE, num_channels=1), decoded)
+
+
+async def test_clip_cache_shared_dir(tmp_path):
+    path = str(tmp_path / "clip.wav")
+    _write_wav(path, np.full(SAMPLE_RATE, 1, dtype=np.int16))
+
+    # a directory other users can write to isn't used
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir(mode=0o777)
+    cache_dir.chmod(0o777)
+
+    cache = _ClipCache(mmap_dir=str(cache_dir))
+    clip = await cache.get(path, sample_rate=SAMPLE_RATE, num_channels=1)
+    assert not isinstance(clip, np.memmap)
+    assert clip.size > 0 and (clip == 1).all()
+    assert not list(cache_dir.iterdir())
+
+
+async def test_clip_frames():
+    pcm = np.arange(12000, dtype=np.int16)
+    frames = [
+        frame
+        async for frame in _clip_frames(pcm, sample_rate=SAMPLE_RATE, num_channels=1, loop=False)
+    ]
+    assert [frame.samples_per_channel for frame in frames] == [4800, 4800, 2400]
+    assert np.array_equal(np.concatenate([np.frombuffer(f.data, np.int16) for f in frames]), pcm)
+
+    looped = _clip_frames(pcm, sample_rate=SAMPLE_RATE, num_channels=1, loop=True)
+    samples = [(await looped.__anext__()).samples_per_channel for _ in range(6)]
+    assert samples == [4800, 4800, 2400, 4800, 4800, 2400]
+    await looped.aclose()
+
+
+async def test_clip_cache_cancelled_get(tmp_path):
+    path = str(tmp_path / "clip.wav")
+    _write_wav(path, (np.sin(np.arange(SAMPLE_RATE) / 10) * 10000).astype(np.int16))
+
+    cache = _ClipCache()
+    first = asyncio.create_task(cache.get(path, sample_rate=SAMPLE_RATE, num_channels=1))
+    second = asyncio.create_task(cache.get(path, sample_rate=SAMPLE_RATE, num_channels=1))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    # the other callers still get the clip, and so do the next ones
+    clip = await second
+    assert first.cancelled()
+    assert clip.size > 0
+    assert await cache.get(path, sample_rate=SAMPLE_RATE, num_channels=1) is clip
+
+
+async def test_clip_cache_bounds(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"clip{i}.wav"))
+        _write_wav(paths[-1], np.full(SAMPLE_RATE, i, dtype=np.int16))
+
+    cache_dir = tmp_path / "cache"
+    # room for two clips on disk
+    cache = _ClipCache(mmap_dir=str(cache_dir), max_clips=2, max_disk_size=SAMPLE_RATE * 2 * 2)
+    for path in paths:
+        await cache.get(path, sample_rate=SAMPLE_RATE, num_channels=1)
+
+    assert len(cache._clips) == 2
+    assert len(list(cache_dir.glob("*.pcm"))) == 2
+
+    # a new version of the file replaces the previous one
+    _write_wav(paths[2], np.full(SAMPLE_RATE * 2, 3, dtype=np.int16))
+    clip = await cache.get(paths[2], sample_rate=SAMPLE_RATE, num_channels=1)
+    assert clip.size > SAMPLE_RATE and (clip == 3).all()
+    assert len(list(cache_dir.glob("*.pcm"))) == 1
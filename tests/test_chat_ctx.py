@@ -23,6 +23,38 @@ def test_args_model():
     print(model.model_json_schema())
 
 
+def test_compiled_tool():
+    from livekit.agents import llm
+
+    @llm.function_tool
+    async def get_weather(location: str, days: int = 3) -> str:
+        """
+        Get the weather
+        Args:
+            location: The city
+            days: Number of days
+        """
+        return ""
+
+    schema = utils.build_strict_openai_schema(get_weather)
+    assert schema["function"]["parameters"]["required"] == ["location", "days"]
+
+    # the model and the schemas are only built once
+    model = utils.function_arguments_to_pydantic_model(get_weather)
+    assert utils.function_arguments_to_pydantic_model(get_weather) is model
+
+    # each call returns a new dict
+    schema["function"]["parameters"]["properties"].clear()
+    assert utils.build_strict_openai_schema(get_weather)["function"]["parameters"]["properties"]
+    legacy = utils.build_legacy_openai_schema(get_weather, internally_tagged=True)
+    assert legacy["parameters"] == model.model_json_schema()
+
+    args, kwargs = utils.prepare_function_arguments(
+        fnc=get_weather, json_arguments='{"location": "Paris", "days": null}'
+    )
+    assert (args, kwargs) == (("Paris", 3), {})
+
+
 def test_dict():
     from livekit import rtc
     from livekit.agents.llm import ChatContext, ImageContent
@@ -48,3 +80,170 @@ def test_dict():
     print(chat_ctx.items)
 
     print(ChatContext.from_dict(chat_ctx.to_dict()).items)
+
+
+def _apply_diff(old_ids: list[str], diff: utils.DiffOps) -> list[str]:
+    ids = [id for id in old_ids if id not in diff.to_remove]
+    for previous_id, id in diff.to_create:
+        ids.insert(0 if previous_id is None else ids.index(previous_id) + 1, id)
+    return ids
+
+
+def test_chat_ctx_diff():
+    import random
+
+    from livekit.agents.llm import ChatContext, ChatMessage
+
+    rng = random.Random(42)
+    for _ in range(200):
+        old_ctx = ChatContext.empty()
+        for i in range(rng.randint(0, 30)):
+            old_ctx.add_message(role="user", content=f"message {i}")
+
+        new_ctx = old_ctx.copy()
+        for _ in range(rng.randint(0, 5)):
+            if new_ctx.items and rng.random() < 0.5:
+                new_ctx.items.pop(rng.randrange(len(new_ctx.items)))
+            else:
+                new_ctx.items.insert(
+                    rng.randint(0, len(new_ctx.items)),
+                    ChatMessage(role="assistant", content=["new"]),
+                )
+
+        diff = utils.compute_chat_ctx_diff(old_ctx, new_ctx)
+        assert _apply_diff([item.id for item in old_ctx.items], diff) == [
+            item.id for item in new_ctx.items
+        ]
+        assert diff.to_update == []
+
+
+def test_chat_ctx_diff_update():
+    from livekit.agents.llm import ChatContext, ChatMessage
+
+    old_ctx = ChatContext.empty()
+    first = old_ctx.add_message(role="user", content="hello")
+    second = old_ctx.add_message(role="assistant", content="hi")
+
+    new_ctx = ChatContext(
+        [first, ChatMessage(id=second.id, role="assistant", content=["hi, how can I help?"])]
+    )
+    new_ctx.add_message(role="user", content="bye")
+
+    diff = utils.compute_chat_ctx_diff(old_ctx, new_ctx)
+    assert diff.to_remove == []
+    assert diff.to_create == [(second.id, new_ctx.items[2].id)]
+    assert diff.to_update == [(first.id, second.id)]
+
+
+def _linear_insertion_index(items: list, created_at: float) -> int:
+    for i in reversed(range(len(items))):
+        if items[i].type == "message" and items[i].created_at <= created_at:
+            return i + 1
+    return 0
+
+
+def test_chat_ctx_index():
+    import random
+
+    from livekit.agents.llm import ChatContext, ChatMessage, FunctionCall
+
+    rng = random.Random(42)
+    chat_ctx = ChatContext.empty()
+    for step in range(500):
+        items = chat_ctx.items
+        op = rng.random()
+        if op < 0.4:
+            chat_ctx.add_message(role="user", content=f"{step}", created_at=step)
+        elif op < 0.5:
+            items.append(FunctionCall(call_id=f"{step}", name="fnc", arguments="{}"))
+        elif op < 0.6:
+            created_at = rng.uniform(0, step)
+            items.insert(
+                chat_ctx.find_insertion_index(created_at=created_at),
+                ChatMessage(role="assistant", content=["late"], created_at=created_at),
+            )
+        elif op < 0.7 and items:
+            items.pop(rng.randrange(len(items)))
+        elif op < 0.75 and items:
+            del items[: rng.randrange(len(items))]
+        elif op < 0.8 and items:
+            items[rng.randrange(len(items))] = ChatMessage(
+                role="user", content=["replaced"], created_at=rng.uniform(0, step)
+            )
+        elif op < 0.85:
+            chat_ctx = chat_ctx.copy()
+        elif op < 0.9:
+            items.sort(key=lambda item: getattr(item, "created_at", 0))
+
+        items = chat_ctx.items
+        for i, item in enumerate(items):
+            assert chat_ctx.index_by_id(item.id) == i
+            assert chat_ctx.get_by_id(item.id) is item
+        assert chat_ctx.get_by_id("missing") is None
+
+        for created_at in (-1, rng.uniform(0, step + 1), step + 1):
+            assert chat_ctx.find_insertion_index(created_at=created_at) == (
+                _linear_insertion_index(items, created_at)
+            )
+
+
+def test_chat_ctx_copy():
+    from livekit.agents.llm import ChatContext, FunctionCall
+
+    chat_ctx = ChatContext.empty()
+    msg = chat_ctx.add_message(role="user", content="hello", created_at=1)
+    chat_ctx.items.append(FunctionCall(call_id="1", name="fnc", arguments="{}"))
+    assert chat_ctx.index_by_id(msg.id) == 0
+
+    copy = chat_ctx.copy()
+    later = copy.add_message(role="assistant", content="hi", created_at=2)
+    assert copy.index_by_id(later.id) == 2
+    assert chat_ctx.index_by_id(later.id) is None
+    assert copy.find_insertion_index(created_at=1.5) == 1
+    assert copy.find_insertion_index(created_at=2) == 3
+
+    filtered = copy.copy(exclude_function_call=True)
+    assert [item.id for item in filtered.items] == [msg.id, later.id]
+    assert filtered.index_by_id(later.id) == 1
+
+    # a plain list passed by the caller is still used as-is
+    items = list(copy.items)
+    plain_ctx = ChatContext(items)
+    items.pop(0)
+    assert plain_ctx.index_by_id(msg.id) is None
+    assert plain_ctx.find_insertion_index(created_at=1.5) == 0
+
+
+def test_conversion_cache():
+    import gc
+
+    from livekit.agents.llm import ChatMessage, FunctionCallOutput, ImageContent
+
+    calls = []
+
+    def _convert(item):
+        calls.append(item.id)
+        return {"id": item.id}
+
+    cache = utils.ConversionCache()
+    msg = ChatMessage(role="user", content=["hello", ImageContent(image="https://x/y.jpg")])
+    output = FunctionCallOutput(call_id="1", output="ok", is_error=False)
+
+    converted = cache.get(msg, _convert)
+    assert cache.get(msg, _convert) is converted
+    assert cache.get(output, _convert) is cache.get(output, _convert)
+    assert calls == [msg.id, output.id]
+
+    # modified items are converted again
+    msg.content[1].inference_detail = "low"
+    assert cache.get(msg, _convert) is not converted
+    msg.content.append("bye")
+    cache.get(msg, _convert)
+    output.output = "failed"
+    cache.get(output, _convert)
+    assert calls == [msg.id, output.id, msg.id, msg.id, output.id]
+
+    # the cache doesn't keep the items alive
+    del msg, output
+    gc.collect()
+    assert len(cache) == 0
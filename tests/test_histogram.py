@@ -0,0 +1,23 @@
+import math
+
+from livekit.agents.utils import Histogram
+
+
+def test_histogram():
+    hist = Histogram([0.1, 1.0, 10.0])
+    assert hist.quantile(0.5) == 0
+
+    for sample in (0.05, 0.1, 0.5, 0.7, 2.0, 50.0):
+        hist.add_sample(sample)
+
+    assert hist.buckets() == [(0.1, 2), (1.0, 2), (10.0, 1), (math.inf, 1)]
+    assert hist.size() == 6
+    assert math.isclose(hist.get_avg(), 53.35 / 6)
+    assert hist.quantile(0.0) == 0.1
+    assert hist.quantile(0.5) == 1.0
+    assert hist.quantile(0.8) == 10.0
+    assert hist.quantile(1.0) == math.inf
+
+    hist.reset()
+    assert hist.size() == 0
+    assert hist.buckets()[0] == (0.1, 0)
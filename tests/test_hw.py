@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import math
+
+from livekit.agents.utils.hw import CPULoadSampler, CPUMonitor, CPUStats, cpu as hw_cpu
+
+
+class _FakeCPUMonitor(CPUMonitor):
+    def __init__(self) -> None:
+        self.stats = CPUStats(usage_seconds=0.0)
+
+    def cpu_count(self) -> float:
+        return 2.0
+
+    def cpu_percent(self, interval: float = 0.5) -> float:
+        raise AssertionError("the sampler must not block")
+
+    def cpu_stats(self) -> CPUStats:
+        return self.stats
+
+
+def test_cpu_load_sampler(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(hw_cpu.time, "monotonic", lambda: now)
+
+    monitor = _FakeCPUMonitor()
+    sampler = CPULoadSampler(monitor, smoothing_window=2.5, min_interval=0.25)
+    assert sampler.sample() == 0.0
+
+    # 1 of the 2 CPUs is used
+    now += 0.5
+    monitor.stats = CPUStats(usage_seconds=0.5, nr_periods=5, nr_throttled=0)
+    alpha = 1.0 - math.exp(-0.5 / 2.5)
+    assert math.isclose(sampler.sample(), 0.5 * alpha)
+    assert sampler.throttled_ratio == 0.0
+
+    # calls closer than min_interval don't read the counters
+    monitor.stats = CPUStats(usage_seconds=100.0)
+    now += 0.1
+    assert math.isclose(sampler.sample(), 0.5 * alpha)
+
+    # the load converges to the usage, throttled periods are reported
+    usage = 0.5
+    for _ in range(100):
+        now += 0.5
+        usage += 1.0
+        monitor.stats = CPUStats(usage_seconds=usage, nr_periods=10, nr_throttled=5)
+        sampler.sample()
+
+    assert math.isclose(sampler.load, 1.0, rel_tol=1e-6)
+    assert sampler.throttled_ratio == 0.0  # the counters didn't change
+
+    now += 0.5
+    monitor.stats = CPUStats(usage_seconds=usage, nr_periods=15, nr_throttled=9)
+    sampler.sample()
+    assert math.isclose(sampler.throttled_ratio, 4 / 5)
+    assert sampler.stats.nr_throttled == 9
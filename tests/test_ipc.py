@@ -3,8 +3,11 @@ from __future__ import annotations
 import asyncio
 import ctypes
 import io
+import logging
 import multiprocessing as mp
+import os
 import socket
+import threading
 import time
 import uuid
 from dataclasses import dataclass
@@ -14,6 +17,9 @@ from typing import ClassVar
 import psutil
 
 from livekit.agents import JobContext, JobProcess, ipc, job, utils
+from livekit.agents.debug import tracing
+from livekit.agents.inference_runner import _InferenceRunner
+from livekit.agents.ipc.inference_proc_lazy_main import _InferenceProc
 from livekit.protocol import agent
 
 
@@ -63,6 +69,25 @@ def _echo_main(mp_cch):
     asyncio.run(_pong())
 
 
+def _shm_echo_main(mp_cch, down_ring: str, up_ring: str):
+    async def _pong():
+        dplx = utils.aio.duplex_shm._AsyncShmDuplex(
+            await utils.aio.duplex_unix._AsyncDuplex.open(mp_cch),
+            tx=utils.aio.duplex_shm._ShmRing.attach(up_ring),
+            rx=utils.aio.duplex_shm._ShmRing.attach(down_ring),
+        )
+        while True:
+            try:
+                msg = await ipc.channel.arecv_message(dplx, IPC_MESSAGES)
+                await ipc.channel.asend_message(dplx, msg)
+            except utils.aio.duplex_unix.DuplexClosed:
+                break
+
+        await dplx.aclose()
+
+    asyncio.run(_pong())
+
+
 async def test_async_channel():
     mp_pch, mp_cch = socket.socketpair()
     pch = await utils.aio.duplex_unix._AsyncDuplex.open(mp_pch)
@@ -107,6 +132,65 @@ def test_sync_channel():
     pch.close()
 
 
+class _Unpicklable:
+    def __reduce__(self):
+        raise TypeError("can't pickle")
+
+    def __str__(self) -> str:
+        return "unpicklable"
+
+
+def test_log_queue():
+    from livekit.agents.ipc.log_queue import LogQueueHandler, LogQueueListener
+
+    mp_pch, mp_cch = socket.socketpair()
+    pch = utils.aio.duplex_unix._Duplex.open(mp_pch)
+    cch = utils.aio.duplex_unix._Duplex.open(mp_cch)
+
+    records: list[logging.LogRecord] = []
+
+    class _Collector(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            records.append(record)
+
+    test_logger = logging.getLogger("test_log_queue")
+    test_logger.setLevel(logging.INFO)
+    collector = _Collector()
+    test_logger.addHandler(collector)
+
+    def _prepare(record: logging.LogRecord) -> None:
+        record.pid = 1234
+
+    listener = LogQueueListener(pch, _prepare)
+    listener.start()
+
+    # the levels of the parent process, the debug logs aren't sent
+    handler = LogQueueHandler(cch, levels={"": logging.WARNING, "test_log_queue": logging.INFO})
+    child_logger = logging.Logger("test_log_queue.child")
+    child_logger.addHandler(handler)
+    child_logger.debug("filtered")
+    child_logger.info("hello %s", "world", extra={"job_id": "job", "value": 42})
+    child_logger.warning("not pickleable", extra={"obj": _Unpicklable()})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        child_logger.exception("failed")
+
+    handler.close()
+    listener._thread.join(timeout=5)  # the forwarder closes the channel after the last batch
+    test_logger.removeHandler(collector)
+
+    assert [r.levelno for r in records] == [logging.INFO, logging.WARNING, logging.ERROR]
+    info = records[0]
+    assert info.getMessage() == "hello world"
+    assert info.name == "test_log_queue.child"
+    assert info.funcName == "test_log_queue"
+    assert info.job_id == "job" and info.value == 42 and info.pid == 1234
+    assert records[1].obj == "unpicklable"
+    assert "ValueError: boom" in records[2].getMessage()
+    assert handler.dropped == 0 and listener.dropped == 0
+
+
 def _generate_fake_job() -> job.RunningJobInfo:
     return job.RunningJobInfo(
         job=agent.Job(id="fake_job_" + str(uuid.uuid4().hex), type=agent.JobType.JT_ROOM),
@@ -391,3 +475,245 @@ async def test_job_graceful_shutdown():
     assert proc.exitcode == 0, "process should have exited cleanly"
     assert not proc.killed
     assert start_args.shutdown_counter.value == 1
+
+
+class _FakeProcClient:
+    def __init__(self) -> None:
+        self.sent = utils.aio.Chan[ipc.channel.Message]()
+
+    async def send(self, msg: ipc.channel.Message) -> None:
+        self.sent.send_nowait(msg)
+
+
+class _BarrierRunner(_InferenceRunner):
+    INFERENCE_METHOD = "test_barrier"
+
+    def __init__(self) -> None:
+        self.barrier = threading.Barrier(2, timeout=5.0)
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        # only returns once the two requests are running at the same time
+        self.barrier.wait()
+        return data
+
+
+async def test_inference_proc_concurrent_requests():
+    inf_proc = _InferenceProc({_BarrierRunner.INFERENCE_METHOD: _BarrierRunner}, num_threads=2)
+    client = _FakeProcClient()
+    inf_proc._client = client  # type: ignore
+
+    cch = utils.aio.Chan[ipc.channel.Message]()
+    entrypoint = asyncio.create_task(inf_proc.entrypoint(cch))
+
+    for i in range(2):
+        cch.send_nowait(
+            ipc.proto.InferenceRequest(
+                method=_BarrierRunner.INFERENCE_METHOD, request_id=f"req_{i}", data=b"data"
+            )
+        )
+
+    for _ in range(2):
+        resp = await asyncio.wait_for(client.sent.recv(), timeout=10.0)
+        assert isinstance(resp, ipc.proto.InferenceResponse)
+        assert not resp.error and resp.data == b"data"
+
+    cch.send_nowait(ipc.proto.ShutdownRequest())
+    await entrypoint
+
+
+class _PidRunner(_InferenceRunner):
+    INFERENCE_METHOD = "test_pid"
+
+    def initialize(self) -> None:
+        pass
+
+    def run(self, data: bytes) -> bytes | None:
+        time.sleep(0.1)
+        return str(os.getpid()).encode()
+
+
+def _graph_titles() -> list[str]:
+    return [graph._title for graph in tracing.Tracing._get_current_handle()._graphs]
+
+
+async def test_inference_pool():
+    graphs = len(_graph_titles())
+    pool = ipc.inference_pool.InferencePool(
+        num_processes=2,
+        runners={_PidRunner.INFERENCE_METHOD: _PidRunner},
+        initialize_timeout=20.0,
+        close_timeout=5.0,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        ping_interval=1.0,
+        ping_timeout=10.0,
+        high_ping_threshold=1.0,
+        mp_ctx=mp.get_context("spawn"),
+        loop=asyncio.get_running_loop(),
+        http_proxy=None,
+    )
+    await pool.start()
+    pids = {proc.pid for proc in pool.processes}
+    assert len(pids) == 2
+
+    async def _inference_pids(n: int) -> set[int]:
+        results = await asyncio.gather(
+            *(pool.do_inference(_PidRunner.INFERENCE_METHOD, b"") for _ in range(n))
+        )
+        return {int(r) for r in results if r is not None}
+
+    # concurrent requests are spread across the processes
+    assert await _inference_pids(4) == pids
+
+    killed = pool.processes[0]
+    await killed.kill()
+    await asyncio.sleep(0)
+    assert len(pool.processes) == 1
+
+    # the requests are sent to the remaining process while the other one is respawned
+    assert await _inference_pids(2) == pids - {killed.pid}
+
+    for _ in range(100):
+        if len(pool.processes) == 2:
+            break
+        await asyncio.sleep(0.1)
+
+    new_pids = {proc.pid for proc in pool.processes}
+    assert len(new_pids) == 2 and killed.pid not in new_pids
+    assert await _inference_pids(4) == new_pids
+
+    # the graphs are created once by the pool, not by each (respawned) process
+    titles = _graph_titles()[graphs:]
+    assert sorted(titles) == ["inference_latency", "inference_queue_depth"]
+
+    await pool.aclose()
+    assert not pool.processes
+
+
+def test_shm_ring():
+    min_size = utils.aio.duplex_shm.MIN_RING_PAYLOAD
+    tx = utils.aio.duplex_shm._ShmRing.create(3 * min_size)
+    rx = utils.aio.duplex_shm._ShmRing.attach(tx.name)
+    try:
+        # small payloads aren't written to the ring
+        writer = tx.writer()
+        writer.write(b"small")
+        assert not writer.in_ring and writer.head == b"small"
+
+        for i in range(5):
+            # the ring wraps around in the middle of some of the payloads
+            payload = bytes([i]) * 10 + os.urandom(min_size)
+            writer = tx.writer()
+            writer.write(payload[:10])
+            writer.write(memoryview(payload)[10:])
+            assert writer.in_ring and not writer.overflow
+            tx.commit(writer)
+
+            reader = rx.reader(len(payload))
+            assert reader.read(4) + reader.read(6) + reader.read() == payload
+            rx.release(len(payload))
+
+        # nothing is published until the writer is committed, and a payload larger than the
+        # free space overflows
+        writer = tx.writer()
+        writer.write(os.urandom(2 * min_size))
+        writer.write(os.urandom(2 * min_size))
+        assert writer.overflow
+
+        payload = os.urandom(3 * min_size)
+        writer = tx.writer()
+        writer.write(payload)
+        assert not writer.overflow
+        tx.commit(writer)
+
+        full = tx.writer()
+        full.write(os.urandom(min_size))
+        assert full.overflow
+        assert rx.reader(len(payload)).read() == payload
+    finally:
+        rx.close()
+        tx.close()
+
+
+async def test_shm_channel():
+    down_ring = utils.aio.duplex_shm._ShmRing.create(64 * 1024)
+    up_ring = utils.aio.duplex_shm._ShmRing.create(64 * 1024)
+
+    mp_pch, mp_cch = socket.socketpair()
+    proc = mp.get_context("spawn").Process(
+        target=_shm_echo_main, args=(mp_cch, down_ring.name, up_ring.name)
+    )
+    proc.start()
+    mp_cch.close()
+
+    pch = utils.aio.duplex_shm._AsyncShmDuplex(
+        await utils.aio.duplex_unix._AsyncDuplex.open(mp_pch), tx=down_ring, rx=up_ring
+    )
+
+    # payloads wrap around the ring, the last one doesn't fit and is sent inline
+    for size in (100, 40_000, 40_000, 40_000, 200_000):
+        msg = SomeDataMessage(string="shm", number=size, data=os.urandom(size))
+        await ipc.channel.asend_message(pch, msg)
+        assert await ipc.channel.arecv_message(pch, IPC_MESSAGES) == msg
+
+    await pch.aclose()
+    proc.join()
+
+
+def test_proc_autoscaler():
+    from livekit.agents.ipc.proc_autoscaler import IdleProcessAutoscaling, ProcAutoscaler
+
+    opts = IdleProcessAutoscaling(
+        min_idle_processes=1, memory_headroom_mb=1000, window=10.0, scale_down_delay=5.0
+    )
+    autoscaler = ProcAutoscaler(opts, max_idle_processes=8)
+    assert autoscaler.target == 8  # start warm
+
+    # no job, the target decreases by one process every scale_down_delay
+    assert autoscaler.update(idle_processes=8, now=1.0) == 8
+    assert autoscaler.decision.reason == "scale_down_delay"
+    assert autoscaler.update(idle_processes=8, now=6.0) == 7
+    assert autoscaler.update(idle_processes=7, now=7.0) == 7
+    now = 7.0
+    while autoscaler.target > 1:
+        now += opts.scale_down_delay
+        autoscaler.update(idle_processes=autoscaler.target, now=now)
+    assert autoscaler.update(idle_processes=1, now=now + 100) == 1
+    assert autoscaler.decision.reason == "min"
+
+    # 2 jobs/s with processes taking 1s to warm up, one job had to wait for a process
+    now += 100
+    autoscaler.on_process_ready(1.0)
+    for i in range(20):
+        autoscaler.on_job_launched(0.5 if i == 0 else 0.0, now=now + i * 0.5)
+    now += 10
+    assert autoscaler.update(idle_processes=1, now=now) == 4  # ceil(2 * 1 * 1.5) + 1
+    decision = autoscaler.decision
+    assert decision.reason == "demand"
+    assert decision.cold_starts == 1
+    assert decision.max_wait == 0.5
+
+    # the demand exceeds the maximum
+    for _ in range(100):
+        autoscaler.on_job_launched(0.0, now=now)
+    assert autoscaler.update(idle_processes=4, now=now) == 8
+    assert autoscaler.decision.reason == "max"
+
+    # not enough memory for another process: 1500MB available, 1000MB of headroom, 400MB each
+    assert (
+        autoscaler.update(
+            idle_processes=2, process_memory_mb=400, available_memory_mb=1500, now=now
+        )
+        == 3
+    )
+    assert autoscaler.decision.reason == "memory"
+    assert autoscaler.decision.memory_cap == 3
+
+    # below the headroom, surplus idle processes must be closed
+    assert (
+        autoscaler.update(idle_processes=3, process_memory_mb=400, available_memory_mb=500, now=now)
+        == 1
+    )
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from livekit.agents import Agent, AgentSession, llm
+from livekit.agents.metrics import SpeculativeGenerationMetrics, UsageCollector
+from livekit.agents.vad import VADEvent, VADEventType
+from livekit.agents.voice import io
+from livekit.agents.voice.agent_activity import AgentActivity
+from livekit.agents.voice.audio_recognition import _EndOfTurnInfo
+
+from .fake_llm import FakeLLM
+from .fake_stt import FakeSTT
+
+
+class _TextRecorder(io.TextOutput):
+    def __init__(self) -> None:
+        super().__init__(next_in_chain=None)
+        self.segments: list[str] = []
+        self._current = ""
+
+    async def capture_text(self, text: str) -> None:
+        self._current += text
+
+    def flush(self) -> None:
+        self.segments.append(self._current)
+        self._current = ""
+
+
+class _SpeculativeSession:
+    def __init__(self, agent: Agent) -> None:
+        self.llm = FakeLLM(fake_timeout=0.1)
+        self.session = AgentSession(stt=FakeSTT(), llm=self.llm, speculative_generation=True)
+        self.text = _TextRecorder()
+        self.session.output.transcription = self.text
+        self.agent = agent
+
+        self.replies = asyncio.Queue[llm.ChatMessage]()
+        self.speculative_metrics: list[SpeculativeGenerationMetrics] = []
+
+        @self.session.on("conversation_item_added")
+        def _on_item_added(ev) -> None:
+            if ev.item.role == "assistant":
+                self.replies.put_nowait(ev.item)
+
+        @self.session.on("metrics_collected")
+        def _on_metrics(ev) -> None:
+            if isinstance(ev.metrics, SpeculativeGenerationMetrics):
+                self.speculative_metrics.append(ev.metrics)
+
+    @property
+    def activity(self) -> AgentActivity:
+        assert self.session._activity is not None
+        return self.session._activity
+
+    async def end_of_turn(self, transcript: str) -> llm.ChatMessage:
+        await self.activity.on_end_of_turn(
+            _EndOfTurnInfo(
+                new_transcript=transcript, transcription_delay=0.0, end_of_utterance_delay=0.0
+            )
+        )
+        return await asyncio.wait_for(self.replies.get(), timeout=5.0)
+
+    async def __aenter__(self) -> _SpeculativeSession:
+        await self.session.start(self.agent)
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.session.aclose()
+
+
+def _start_of_speech() -> VADEvent:
+    return VADEvent(
+        type=VADEventType.START_OF_SPEECH,
+        samples_index=0,
+        timestamp=0.0,
+        speech_duration=0.0,
+        silence_duration=0.0,
+    )
+
+
+async def test_speculative_generation_committed():
+    async with _SpeculativeSession(Agent(instructions="be brief")) as s:
+        s.activity.on_speculative_turn("hello")
+        stream = await asyncio.wait_for(s.llm.chat_ch.recv(), timeout=5.0)
+        assert stream.user_input == "hello"
+
+        # the final transcript is received again while waiting for the end of turn
+        s.activity.on_speculative_turn("hello")
+
+        reply = await s.end_of_turn("hello")
+        assert reply.text_content == "reply to: hello"
+        assert len(s.llm.streams) == 1  # the speculative generation is used
+
+        # the reply is played out once
+        await asyncio.sleep(0.2)
+        assert s.replies.empty()
+        assert s.text.segments == ["reply to: hello"]
+        assert [m.committed for m in s.speculative_metrics] == [True]
+
+        user_messages = [
+            item.text_content
+            for item in s.agent.chat_ctx.items
+            if item.type == "message" and item.role == "user"
+        ]
+        assert user_messages == ["hello"]
+
+
+async def test_speculative_generation_discarded_when_user_keeps_talking():
+    async with _SpeculativeSession(Agent(instructions="be brief")) as s:
+        s.activity.on_speculative_turn("hello")
+        await asyncio.wait_for(s.llm.chat_ch.recv(), timeout=5.0)
+
+        s.activity.on_start_of_speech(_start_of_speech())
+        await asyncio.sleep(0.05)
+        # discarded before the end of the turn
+        assert [m.committed for m in s.speculative_metrics] == [False]
+
+        reply = await s.end_of_turn("hello, how are you?")
+
+        assert reply.text_content == "reply to: hello, how are you?"
+        assert [stream.user_input for stream in s.llm.streams] == [
+            "hello",
+            "hello, how are you?",
+        ]
+        await asyncio.sleep(0.2)
+        assert s.text.segments == ["reply to: hello, how are you?"]
+        assert [m.committed for m in s.speculative_metrics] == [False]
+
+
+async def test_speculative_generation_wasted_tokens():
+    async with _SpeculativeSession(Agent(instructions="be brief")) as s:
+        usage = UsageCollector()
+        s.session.on("metrics_collected", lambda ev: usage.collect(ev.metrics))
+
+        # discarded once the LLM streamed its usage
+        s.llm.update_options(fake_timeout=None)
+        s.activity.on_speculative_turn("hello")
+        await asyncio.wait_for(s.llm.chat_ch.recv(), timeout=5.0)
+        await asyncio.sleep(0.05)
+        s.activity.on_start_of_speech(_start_of_speech())
+        await asyncio.sleep(0.05)
+
+        reported = s.speculative_metrics[-1]
+        assert not reported.committed and not reported.tokens_estimated
+        assert (reported.prompt_tokens, reported.completion_tokens) == (10, 3)
+
+        # cancelled before the usage, the tokens are estimated from the text
+        s.llm.update_options(fake_timeout=0.5)
+        s.activity.on_speculative_turn("hello there")
+        await asyncio.wait_for(s.llm.chat_ch.recv(), timeout=5.0)
+        s.activity.on_start_of_speech(_start_of_speech())
+        await asyncio.sleep(0.05)
+
+        estimated = s.speculative_metrics[-1]
+        assert not estimated.committed and estimated.tokens_estimated
+        assert estimated.prompt_tokens == len("be briefhello there") // 4
+        assert estimated.completion_tokens == 0
+
+        summary = usage.get_summary()
+        assert summary.speculative_generations == 2
+        assert summary.llm_wasted_prompt_tokens == 10 + estimated.prompt_tokens
+        assert summary.llm_wasted_completion_tokens == 3
+
+
+async def test_speculative_generation_discarded_on_new_transcript():
+    async with _SpeculativeSession(Agent(instructions="be brief")) as s:
+        s.activity.on_speculative_turn("hello")
+        await asyncio.wait_for(s.llm.chat_ch.recv(), timeout=5.0)
+
+        # the turn ends with another transcript, without a new start of speech
+        reply = await s.end_of_turn("hello there")
+
+        assert reply.text_content == "reply to: hello there"
+        assert len(s.llm.streams) == 2
+        await asyncio.sleep(0.2)
+        assert s.text.segments == ["reply to: hello there"]
+        assert [m.committed for m in s.speculative_metrics] == [False]
+
+
+class _EditMessageAgent(Agent):
+    async def on_user_turn_completed(
+        self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage
+    ) -> None:
+        new_message.content = [f"{new_message.text_content} (edited)"]
+
+
+class _EditChatCtxAgent(Agent):
+    async def on_user_turn_completed(
+        self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage
+    ) -> None:
+        turn_ctx.add_message(role="assistant", content="retrieved context")
+
+
+@pytest.mark.parametrize(
+    "agent_cls, expected_input",
+    [(_EditMessageAgent, "hello (edited)"), (_EditChatCtxAgent, "hello")],
+)
+async def test_speculative_generation_discarded_on_user_turn_completed_change(
+    agent_cls: type[Agent], expected_input: str
+):
+    async with _SpeculativeSession(agent_cls(instructions="be brief")) as s:
+        s.activity.on_speculative_turn("hello")
+        await asyncio.wait_for(s.llm.chat_ch.recv(), timeout=5.0)
+
+        reply = await s.end_of_turn("hello")
+
+        assert reply.text_content == f"reply to: {expected_input}"
+        assert len(s.llm.streams) == 2
+        # the reply is generated from the context modified by on_user_turn_completed
+        assert any(
+            item.type == "message" and item.text_content == "retrieved context"
+            for item in s.llm.streams[1].chat_ctx.items
+        ) == (agent_cls is _EditChatCtxAgent)
+
+        await asyncio.sleep(0.2)
+        assert s.text.segments == [f"reply to: {expected_input}"]
+        assert [m.committed for m in s.speculative_metrics] == [False]
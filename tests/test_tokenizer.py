@@ -1,8 +1,9 @@
 import pytest
 
 from livekit.agents import tokenize
-from livekit.agents.tokenize import basic
+from livekit.agents.tokenize import _basic_hyphenator, _basic_sent, basic
 from livekit.agents.tokenize._basic_paragraph import split_paragraphs
+from livekit.agents.tokenize.token_stream import BOUNDARY_CONTEXT
 from livekit.plugins import nltk
 
 # Download the punkt tokenizer, will only download if not already present
@@ -83,6 +84,69 @@ async def test_streamed_sent_tokenizer(tokenizer: tokenize.SentenceTokenizer, ex
         assert ev.token == expected[i]
 
 
+async def test_streamed_sent_tokenizer_skips_text_without_boundary():
+    calls = 0
+
+    def _split_sentences(text: str) -> list[tuple[str, int, int]]:
+        nonlocal calls
+        calls += 1
+        return _basic_sent.split_sentences(text, min_sentence_len=20)
+
+    stream = tokenize.BufferedSentenceStream(
+        tokenizer=_split_sentences,
+        min_token_len=20,
+        min_ctx_len=10,
+        boundary_pattern=_basic_sent.BOUNDARY_PATTERN,
+    )
+
+    run_on = "and then we keep talking without ever ending the sentence " * 20
+    for i in range(0, len(run_on), 3):
+        stream.push_text(run_on[i : i + 3])
+
+    assert calls == 0
+
+    stream.push_text(". Next")
+    stream.push_text(" sentence")
+    ev = await stream.__anext__()
+    assert ev.token == run_on + "."
+
+    stream.end_input()
+    ev = await stream.__anext__()
+    assert ev.token == "Next sentence"
+
+
+async def test_streamed_sent_tokenizer_settles_boundaries():
+    calls = 0
+
+    def _split_sentences(text: str) -> list[tuple[str, int, int]]:
+        nonlocal calls
+        calls += 1
+        return _basic_sent.split_sentences(text, min_sentence_len=20)
+
+    stream = tokenize.BufferedSentenceStream(
+        tokenizer=_split_sentences,
+        min_token_len=20,
+        min_ctx_len=10,
+        boundary_pattern=_basic_sent.BOUNDARY_PATTERN,
+    )
+
+    # the dots don't end the sentence, each one is only checked until it's followed by enough text
+    sentence = "".join(f"the version {i}.5 of the app costs a bit more, " for i in range(20))
+    for i in range(0, len(sentence), 3):
+        stream.push_text(sentence[i : i + 3])
+
+    assert calls <= 20 * (BOUNDARY_CONTEXT // 3 + 2)
+
+    stream.push_text("I think. Next")
+    stream.push_text(" one")
+    ev = await stream.__anext__()
+    assert ev.token == sentence + "I think."
+
+    stream.end_input()
+    ev = await stream.__anext__()
+    assert ev.token == "Next one"
+
+
 WORDS_TEXT = "This is a test. Blabla another test! multiple consecutive spaces:     done"
 WORDS_EXPECTED = [
     "This",
@@ -212,6 +276,22 @@ def test_hyphenate_word():
         assert hyphenated == HYPHENATOR_EXPECTED[i]
 
 
+def test_hyphenator_cache():
+    hyphenator = _basic_hyphenator.Hyphenator(
+        _basic_hyphenator.PATTERNS, _basic_hyphenator.EXCEPTIONS
+    )
+    assert hyphenator._table is None  # compiled on first use
+
+    for i, word in enumerate(HYPHENATOR_TEXT):
+        assert hyphenator.hyphenate_word(word) == HYPHENATOR_EXPECTED[i]
+
+    # the callers can't modify the cached pieces
+    pieces = hyphenator.hyphenate_word("hyphenation")
+    pieces.append("!")
+    assert hyphenator.hyphenate_word("hyphenation") == ["hy", "phen", "ation"]
+    assert hyphenator._cached_hyphenate.cache_info().hits > 0
+
+
 REPLACE_TEXT = (
     "This is a test. Hello world, I'm creating this agents..     framework. Once again "
     "framework.  A.B.C"
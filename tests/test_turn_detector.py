@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import numpy as np
+
+from livekit.agents import llm
+from livekit.plugins.turn_detector.base import EOUModelBase, _EUORunnerBase
+
+_CHAT_TEMPLATE = (
+    "{% for message in messages %}"
+    "<|im_start|>{{ message['role'] }}\n{{ message['content'] }}<|im_end|>\n"
+    "{% endfor %}"
+)
+
+
+def _tokenizer():
+    from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+    from transformers import PreTrainedTokenizerFast
+
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    trainer = trainers.BpeTrainer(
+        vocab_size=300,
+        special_tokens=["<|im_start|>", "<|im_end|>"],
+        initial_alphabet=pre_tokenizers.ByteLevel.alphabet(),
+    )
+    tokenizer.train_from_iterator(["hello how are you doing today", "user assistant"], trainer)
+    return PreTrainedTokenizerFast(tokenizer_object=tokenizer, chat_template=_CHAT_TEMPLATE)
+
+
+class _FakeInput:
+    name = "input_ids"
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.inputs: list[list[int]] = []
+
+    def get_inputs(self):
+        return [_FakeInput()]
+
+    def run(self, _, inputs):
+        self.inputs.extend(inputs["input_ids"].tolist())
+        return [np.full((len(inputs["input_ids"]), 1), 0.5, dtype=np.float32)]
+
+
+def _runner() -> _EUORunnerBase:
+    runner = _EUORunnerBase("en")
+    runner._tokenizer = _tokenizer()
+    runner._session = _FakeSession()
+    return runner
+
+
+def _input(*contents: str) -> bytes:
+    roles = ["user", "assistant"]
+    return json.dumps(
+        {"chat_ctx": [{"role": roles[i % 2], "content": c} for i, c in enumerate(contents)]}
+    ).encode()
+
+
+def test_result_cache():
+    runner = _runner()
+    data = _input("hello", "how are you", "doing")
+
+    first = json.loads(runner.run(data))
+    second = json.loads(runner.run(data))
+    assert not first["cache_hit"]
+    assert second["cache_hit"]
+    assert second["eou_probability"] == first["eou_probability"]
+    assert second["input"] == first["input"]
+    assert len(runner._session.inputs) == 1
+
+    assert not json.loads(runner.run(_input("hello", "today")))["cache_hit"]
+    assert len(runner._session.inputs) == 2
+
+
+def test_prefix_tokenization():
+    runner = _runner()
+
+    first = json.loads(runner.run(_input("hello", "how are you", "doing")))
+    second = json.loads(runner.run(_input("hello", "how are you", "doing today")))
+    assert not first["prefix_cache_hit"]
+    assert second["prefix_cache_hit"]
+
+    # reusing the tokens of the history gives the same tokens as the whole conversation
+    for text, input_ids in zip((first["input"], second["input"]), runner._session.inputs):
+        assert input_ids == runner._tokenizer(text, add_special_tokens=False)["input_ids"]
+
+
+class _RunnerExecutor:
+    def __init__(self, runner: _EUORunnerBase) -> None:
+        self._runner = runner
+
+    async def do_inference(self, method: str, data: bytes) -> bytes | None:
+        await asyncio.sleep(0)
+        return self._runner.run(data)
+
+
+class _FakeModel(EOUModelBase):
+    def __init__(self, runner: _EUORunnerBase) -> None:
+        self._executor = _RunnerExecutor(runner)
+
+    def _inference_method(self) -> str:
+        return "fake"
+
+
+def _chat_ctx(*contents: str) -> llm.ChatContext:
+    chat_ctx = llm.ChatContext.empty()
+    for i, c in enumerate(contents):
+        chat_ctx.add_message(role="user" if i % 2 == 0 else "assistant", content=c)
+    return chat_ctx
+
+
+async def test_cache_info_per_prediction():
+    # the model is shared by the sessions, each prediction returns its own cache info
+    model = _FakeModel(_runner())
+
+    assert await model.predict_end_of_turn(_chat_ctx("hello", "how are you")) == 0.5
+
+    results = await asyncio.gather(
+        model.predict_end_of_turn_with_cache_info(_chat_ctx("hello", "how are you")),
+        model.predict_end_of_turn_with_cache_info(_chat_ctx("hello", "today")),
+    )
+    assert results == [(0.5, True), (0.5, False)]
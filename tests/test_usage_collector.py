@@ -0,0 +1,27 @@
+from livekit.agents import metrics
+
+
+def _speculative_metrics(*, committed: bool) -> metrics.SpeculativeGenerationMetrics:
+    return metrics.SpeculativeGenerationMetrics(
+        timestamp=0.0,
+        speech_id="speech_id",
+        committed=committed,
+        lead_time=0.5,
+        prompt_tokens=100,
+        completion_tokens=20,
+    )
+
+
+def test_speculative_generation_usage():
+    collector = metrics.UsageCollector()
+    collector.collect(_speculative_metrics(committed=True))
+    collector.collect(_speculative_metrics(committed=False))
+    collector.collect(_speculative_metrics(committed=False))
+
+    summary = collector.get_summary()
+    assert summary.speculative_generations == 3
+    assert summary.speculative_generations_committed == 1
+    assert summary.llm_wasted_prompt_tokens == 200
+    assert summary.llm_wasted_completion_tokens == 40
+    # the committed tokens are already counted by the LLMMetrics of the generation
+    assert summary.llm_prompt_tokens == 0
@@ -1,7 +1,18 @@
+import asyncio
+import threading
+
+import numpy as np
 import pytest
 
 from livekit.agents import vad
 from livekit.plugins import silero
+from livekit.plugins.silero import onnx_model
+from livekit.plugins.silero.vad import (
+    MAX_BATCH_WINDOWS,
+    _inference_batcher,
+    _InferenceBatcher,
+    _SpeechBuffer,
+)
 
 from . import utils
 
@@ -83,3 +94,160 @@ async def test_file_vad(sample_rate):
 
     assert start_of_speech_i > 0, "no start of speech detected"
     assert start_of_speech_i == end_of_speech_i, "start and end of speech mismatch"
+
+
+async def _speech_events(stream: vad.VADStream, frames) -> list[tuple[vad.VADEventType, int]]:
+    for frame in frames:
+        stream.push_frame(frame)
+        await asyncio.sleep(0)
+
+    stream.end_input()
+
+    return [
+        (ev.type, ev.samples_index)
+        async for ev in stream
+        if ev.type != vad.VADEventType.INFERENCE_DONE
+    ]
+
+
+async def test_concurrent_streams_vad():
+    frames, _ = await utils.make_test_speech(chunk_duration_ms=10, sample_rate=16000)
+
+    expected = await _speech_events(VAD.stream(), frames)
+    assert expected, "no speech detected"
+
+    # the windows of the concurrent streams are batched into the same inference calls
+    results = await asyncio.gather(*[_speech_events(VAD.stream(), frames) for _ in range(4)])
+    for events in results:
+        assert events == expected
+
+
+class _FakeSession:
+    """Returns the last sample of each window as its probability, and records the batch sizes.
+    The first run blocks until `release` is set"""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run(self, _, inputs):
+        self.started.set()
+        self.release.wait()
+        x = inputs["input"]
+        self.batch_sizes.append(len(x))
+        return x[:, -1:].copy(), inputs["state"]
+
+
+def _windows(model: onnx_model.OnnxModel, values: list[float]) -> np.ndarray:
+    windows = np.zeros((len(values), model.window_size_samples), dtype=np.float32)
+    windows[:, -1] = values
+    return windows
+
+
+async def test_inference_batcher():
+    session = _FakeSession()
+    batcher = _InferenceBatcher()
+    models = [onnx_model.OnnxModel(onnx_session=session, sample_rate=16000) for _ in range(3)]
+
+    first = batcher.infer(models[0], _windows(models[0], [0.5]))
+    await asyncio.get_running_loop().run_in_executor(None, session.started.wait)
+
+    # submitted while the first batch is running, they share the next onnx call
+    others = [batcher.infer(model, _windows(model, [0.25 * i])) for i, model in enumerate(models)]
+    session.release.set()
+
+    assert await first == [0.5]
+    assert await asyncio.gather(*others) == [[0.0], [0.25], [0.5]]
+    assert session.batch_sizes == [1, 3]
+
+
+async def test_inference_batcher_splits_backlog():
+    session = _FakeSession()
+    batcher = _InferenceBatcher()
+    backlog_model = onnx_model.OnnxModel(onnx_session=session, sample_rate=16000)
+    model = onnx_model.OnnxModel(onnx_session=session, sample_rate=16000)
+
+    n = MAX_BATCH_WINDOWS * 4
+    backlog = batcher.infer(backlog_model, _windows(backlog_model, [i / n for i in range(n)]))
+    await asyncio.get_running_loop().run_in_executor(None, session.started.wait)
+
+    fut = batcher.infer(model, _windows(model, [1.0]))
+    session.release.set()
+
+    assert await fut == [1.0]
+    assert await backlog == [i / n for i in range(n)]
+
+    # the window of the other stream is run in the second batch instead of waiting for the
+    # whole backlog
+    assert session.batch_sizes == [1] * MAX_BATCH_WINDOWS + [2] + [1] * (n - MAX_BATCH_WINDOWS - 1)
+
+
+async def test_inference_batcher_per_session():
+    blocked_session, session = _FakeSession(), _FakeSession()
+    session.release.set()
+    assert _inference_batcher(blocked_session) is not _inference_batcher(session)
+    assert _inference_batcher(session) is _inference_batcher(session)
+
+    blocked_model = onnx_model.OnnxModel(onnx_session=blocked_session, sample_rate=16000)
+    model = onnx_model.OnnxModel(onnx_session=session, sample_rate=16000)
+    blocked = _inference_batcher(blocked_session).infer(
+        blocked_model, _windows(blocked_model, [0.5])
+    )
+    await asyncio.get_running_loop().run_in_executor(None, blocked_session.started.wait)
+
+    # the streams of another session (e.g. another VAD.load()) don't wait for this inference
+    assert await asyncio.wait_for(
+        _inference_batcher(session).infer(model, _windows(model, [1.0])), timeout=5.0
+    ) == [1.0]
+
+    blocked_session.release.set()
+    assert await blocked == [0.5]
+
+
+class _StateSession:
+    """Increments the rnn state of each window"""
+
+    def run(self, _, inputs):
+        return np.zeros((len(inputs["input"]), 1), dtype=np.float32), inputs["state"] + 1
+
+
+def test_rnn_state():
+    session = _StateSession()
+    models = [onnx_model.OnnxModel(onnx_session=session, sample_rate=16000) for _ in range(2)]
+    window = np.zeros(models[0].window_size_samples, dtype=np.float32)
+
+    # the state returned by the model is the input of the next window, alone or batched
+    models[0](window)
+    onnx_model.run_batched(models, [np.stack([window, window]), np.stack([window])])
+    assert (models[0]._rnn_state == 3).all()
+    assert (models[1]._rnn_state == 1).all()
+    assert models[1]._rnn_state.shape == (2, 1, 128)
+
+
+def test_speech_buffer():
+    buf = _SpeechBuffer(8)
+    assert buf.write(np.arange(5, dtype=np.int16)) == 5
+    assert buf.read().tolist() == [0, 1, 2, 3, 4]
+
+    # no speech, only the prefix padding is kept
+    buf.keep_last(2)
+    assert buf.read().tolist() == [3, 4]
+
+    # wraps around the end of the storage
+    assert buf.write(np.arange(5, 10, dtype=np.int16)) == 5
+    assert buf.read().tolist() == [3, 4, 5, 6, 7, 8, 9]
+
+    # full, the caller flags max_buffered_speech when fewer samples are written
+    assert buf.write(np.arange(10, 13, dtype=np.int16)) == 1
+    assert buf.write(np.arange(11, 13, dtype=np.int16)) == 0
+    assert buf.read().tolist() == [3, 4, 5, 6, 7, 8, 9, 10]
+
+    buf.keep_last(2)
+    assert len(buf) == 2
+    assert buf.write(np.arange(11, 14, dtype=np.int16)) == 3
+    assert buf.read().tolist() == [9, 10, 11, 12, 13]
+
+    buf.resize(4)
+    assert buf.read().tolist() == [9, 10, 11, 12]
+    assert buf.write(np.arange(14, 16, dtype=np.int16)) == 0